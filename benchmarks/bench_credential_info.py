@@ -0,0 +1,56 @@
+"""Compare the memory and load time of credential infos as objects and as a `CredentialInfoBatch`.
+
+Usage: python -m benchmarks.bench_credential_info [--rows N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, List
+
+from myid.credential.credential_info import CredentialInfo
+from myid.credential.credential_info_batch import CredentialInfoBatch
+
+
+def _rows(count: int) -> List[dict]:
+    return [
+        {
+            "issuerDid": f"did:icon:02:{index % 16:040x}",
+            "holderDid": f"did:icon:02:{index:040x}",
+            "sig": f"{index:086x}",
+            "issueDate": 1_700_000_000 + index,
+            "expiryDate": 1_800_000_000 + index,
+            "isRevoke": index % 10 == 0,
+            "created": 1_000_000 + index,
+        }
+        for index in range(count)
+    ]
+
+
+def _measure(name: str, load: Callable[[], object]):
+    tracemalloc.start()
+    started: float = time.perf_counter()
+    loaded = load()
+    elapsed: float = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name:>10}: {elapsed * 1_000:8.1f} ms {size / 1_048_576:8.1f} MiB")
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows: List[dict] = _rows(args.rows)
+    _measure("objects", lambda: [CredentialInfo.from_json(data) for data in rows])
+    batch: CredentialInfoBatch = _measure("batch", lambda: CredentialInfoBatch.from_json(rows))
+
+    started: float = time.perf_counter()
+    expired: CredentialInfoBatch = batch.expired_before(1_800_000_000 + args.rows // 2)
+    print(f"{'filter':>10}: {(time.perf_counter() - started) * 1_000:8.1f} ms ({len(expired)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Show how JWT signature verification scales with the workers of `CryptoEngine`.
+
+Usage: python -m benchmarks.bench_crypto_engine [--jwts N] [--processes]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import wait
+from typing import List
+
+from coincurve import PublicKey
+from didsdk.core.did_key_holder import DidKeyHolder
+from didsdk.core.key_store import DidKeyStore
+from didsdk.jwt.elements import Header, Payload
+from didsdk.jwt.jwt import Jwt
+
+from myid.utils.crypto_engine import CryptoEngine
+
+KEY_FILE = os.path.join(os.path.dirname(__file__), "..", "tests", "test_did_key.json")
+
+
+def _signed_jwts(did_key_holder: DidKeyHolder, count: int) -> List[Jwt]:
+    header: Header = Header(alg=did_key_holder.type.name, kid=did_key_holder.kid)
+    issued_at: int = int(time.time())
+    return [
+        Jwt.decode(
+            did_key_holder.sign(
+                Jwt(header, Payload({Payload.ISSUER: did_key_holder.did, Payload.ISSUED_AT: issued_at + index}))
+            )
+        )
+        for index in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jwts", type=int, default=2_000)
+    parser.add_argument("--processes", action="store_true", help="verify in a process pool instead of threads")
+    args = parser.parse_args()
+
+    did_key_holder: DidKeyHolder = DidKeyStore.load_did_key_holder(KEY_FILE, "P@ssw0rd")
+    public_key: PublicKey = did_key_holder.private_key.public_key
+    jwts: List[Jwt] = _signed_jwts(did_key_holder, args.jwts)
+
+    started: float = time.perf_counter()
+    for jwt in jwts:
+        assert jwt.verify(public_key).success
+    inline: float = args.jwts / (time.perf_counter() - started)
+    print(f"{'inline':>8}: {inline:10.1f} verify/s")
+
+    workers: int = 1
+    while workers <= (os.cpu_count() or 1):
+        with CryptoEngine(max_workers=workers, use_processes=args.processes) as engine:
+            started = time.perf_counter()
+            done, _ = wait([engine.verify(jwt, public_key) for jwt in jwts])
+            rate: float = args.jwts / (time.perf_counter() - started)
+        assert all(future.result().success for future in done)
+        print(f"{workers:>8}: {rate:10.1f} verify/s  (x{rate / inline:.2f})")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Compare requests/sec of the pooled `HttpTransport` against the per-call session of `HttpUtil`.
+
+Usage: python -m benchmarks.bench_http_transport [--requests N] [--threads N]
+"""
+
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+
+from myid.core.api_path import APIPath
+from myid.utils import HttpUtil
+from myid.utils.http_transport import HttpTransport
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body: bytes = json.dumps({"result": {"isValid": True}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _measure(get: Callable[[str], object], url: str, count: int, threads: int) -> float:
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        for response in executor.map(get, [url] * count):
+            assert response.status, response
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url: str = f"http://127.0.0.1:{server.server_port}{APIPath.IS_VALID_VC}?nid=2&sig=abc"
+
+    try:
+        per_call: float = _measure(HttpUtil.get, url, args.requests, args.threads)
+        with HttpTransport(pool_maxsize=args.threads) as transport:
+            pooled: float = _measure(transport.get, url, args.requests, args.threads)
+    finally:
+        server.shutdown()
+
+    print(f"per-call session (HttpUtil): {per_call:10.1f} req/s")
+    print(f"pooled (HttpTransport)     : {pooled:10.1f} req/s  (x{pooled / per_call:.2f})")
+
+
+if __name__ == "__main__":
+    main()
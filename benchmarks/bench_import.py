@@ -0,0 +1,165 @@
+"""Measure the cold import time of the public API of myid-sdk against a budget, and the heavy dependencies it loads.
+
+Each statement runs in fresh interpreters; the median time is compared with its budget, and the statement must not
+load its forbidden dependencies. `--check` exits with 1 if any budget is exceeded, so it can gate a release.
+`--output` saves the report as JSON and `--compare` prints the change against a saved report.
+`--detail` prints the slowest modules by `python -X importtime` of each statement.
+
+Usage: python -m benchmarks.bench_import [--runs N] [--check] [--output FILE] [--compare FILE] [--detail]
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+from myid.__about__ import __version__
+
+HEAVY_MODULES: Tuple[str, ...] = ("didsdk", "jwcrypto", "iconsdk", "coincurve", "requests", "httpx", "orjson")
+
+
+@dataclass
+class ImportBudget:
+    statement: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+# The budgets of the cold import on a CI runner. Scale them with `--budget-scale` on a slower machine.
+BUDGETS: List[ImportBudget] = [
+    ImportBudget("import myid", 200, forbidden=HEAVY_MODULES),
+    ImportBudget("import myid.credential.credential_info", 200, forbidden=HEAVY_MODULES),
+    ImportBudget("import myid.simulator", 250, forbidden=("didsdk", "jwcrypto", "iconsdk", "coincurve", "requests")),
+    ImportBudget("from myid import CredentialService", 800, forbidden=("didsdk", "jwcrypto")),
+    ImportBudget("from myid import VerifierService", 1_000),
+    ImportBudget("from myid import IssuerService", 1_200),
+]
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+exec({statement!r})
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "modules": [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+@dataclass
+class ImportMeasurement:
+    statement: str
+    median_ms: float
+    budget_ms: float
+    loaded: List[str]
+    violations: List[str]
+
+
+def _measure(budget: ImportBudget, runs: int, budget_scale: float) -> Optional[ImportMeasurement]:
+    """Import the statement in `runs` fresh interpreters.
+
+    :return: the measurement, or None if the statement fails, e.g. for a missing optional dependency
+    """
+    probes: List[dict] = []
+    for _ in range(runs):
+        probe: Optional[dict] = _probe(budget.statement)
+        if probe is None:
+            return None
+        probes.append(probe)
+
+    median_ms: float = statistics.median(probe["ms"] for probe in probes)
+    loaded: List[str] = sorted({name for probe in probes for name in probe["modules"]})
+    violations: List[str] = [f"loads {name}" for name in loaded if name in budget.forbidden]
+    if median_ms > budget.budget_ms * budget_scale:
+        violations.append(f"over the budget of {budget.budget_ms * budget_scale:.0f} ms")
+    return ImportMeasurement(
+        statement=budget.statement,
+        median_ms=median_ms,
+        budget_ms=budget.budget_ms * budget_scale,
+        loaded=loaded,
+        violations=violations,
+    )
+
+
+def _print_comparison(measurements: List[ImportMeasurement], baseline_path: str):
+    with open(baseline_path) as baseline_file:
+        baseline: dict = json.load(baseline_file)
+    previous: Dict[str, dict] = {result["statement"]: result for result in baseline["results"]}
+    print(f"\ncompared with {baseline_path} (myid-sdk {baseline.get('myid_sdk')})")
+    for measurement in measurements:
+        before: Optional[dict] = previous.get(measurement.statement)
+        if before:
+            print(f"{measurement.statement:>40}: {before['median_ms']:8.1f} -> {measurement.median_ms:8.1f} ms")
+
+
+def _probe(statement: str) -> Optional[dict]:
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(statement=statement, heavy=HEAVY_MODULES)], capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _slowest_modules(statement: str, count: int) -> List[Tuple[int, str]]:
+    """The modules with the longest cumulative time by `python -X importtime`, in microseconds."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], capture_output=True, text=True)
+    modules: List[Tuple[int, str]] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip().count(".") == 0:
+            modules.append((int(cumulative), name.strip()))
+    return sorted(modules, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=7, help="the fresh interpreters per statement")
+    parser.add_argument("--budget-scale", type=float, default=1, help="multiply the budgets, e.g. 2 on a slow machine")
+    parser.add_argument("--check", action="store_true", help="exit with 1 if any budget is exceeded")
+    parser.add_argument("--detail", action="store_true", help="print the slowest top-level modules per statement")
+    parser.add_argument("--output", help="save the report to this JSON file")
+    parser.add_argument("--compare", help="print the change against this saved JSON report")
+    args = parser.parse_args()
+
+    measurements: List[ImportMeasurement] = []
+    for budget in BUDGETS:
+        measurement: Optional[ImportMeasurement] = _measure(budget, args.runs, args.budget_scale)
+        if measurement is None:
+            print(f"{budget.statement:>40}: unavailable (import failed)")
+            continue
+        measurements.append(measurement)
+        status: str = "; ".join(measurement.violations) or "ok"
+        print(
+            f"{measurement.statement:>40}: {measurement.median_ms:8.1f} ms / {measurement.budget_ms:6.0f} ms"
+            f"  loads [{', '.join(measurement.loaded)}]  {status}"
+        )
+        if args.detail:
+            for cumulative_us, name in _slowest_modules(budget.statement, count=8):
+                print(f"{'':>44}{cumulative_us / 1000:8.1f} ms  {name}")
+
+    if args.output:
+        report: dict = {
+            "myid_sdk": __version__,
+            "python": platform.python_version(),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "params": {"runs": args.runs, "budget_scale": args.budget_scale},
+            "results": [asdict(measurement) for measurement in measurements],
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.compare:
+        _print_comparison(measurements, args.compare)
+
+    if args.check and any(measurement.violations for measurement in measurements):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,371 @@
+"""Measure the throughput and latency of the issuer, verifier and chain paths of the SDK, offline.
+
+The IV WAS and the ICON node are played by `myid.simulator`, a fresh one per scenario, and the DID keys are
+generated for the run.
+Each scenario reports ops/sec and the p50/p99 latency; `--output` saves the report as JSON and `--compare` prints
+the change against a saved report, so runs can be compared across versions.
+
+Usage: python -m benchmarks.bench_offline [--ops N] [--concurrency N] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import asyncio
+import base64
+import datetime
+import json
+import platform
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from coincurve import PrivateKey
+from didsdk.core.algorithm_provider import AlgorithmType
+from didsdk.core.did_key_holder import DidKeyHolder
+from didsdk.credential import Credential
+from didsdk.jwe.ecdhkey import EcdhCurveType, ECDHKey
+from didsdk.jwe.ephemeral_publickey import EphemeralPublicKey
+from didsdk.jwt.elements import Header, Payload
+from didsdk.jwt.jwt import Jwt
+from didsdk.presentation import Presentation
+from didsdk.protocol.protocol_message import ProtocolMessage, SignResult
+from didsdk.protocol.protocol_type import ProtocolType
+from iconsdk.icon_service import IconService
+from iconsdk.providers.http_provider import HTTPProvider
+from iconsdk.wallet.wallet import KeyWallet
+
+from myid.__about__ import __version__
+from myid.config import settings
+from myid.core.property_name import PropertyName
+from myid.credential.credential_info import CredentialInfo
+from myid.credential.credential_score_parameter import CredentialInfoScoreParameter
+from myid.credential_service import CredentialService
+from myid.issuer_service import IssuerService
+from myid.simulator import Simulator, SimulatorConfig
+from myid.utils.jwt_util import JwtUtil
+from myid.verifier_service import VerifierService
+
+NETWORK_ID = 2
+SCORE_ADDRESS = "cx" + "0" * 40
+ECDH_KID = "verifier-ecdh-key"
+LIST_SIZE = 10
+
+
+@dataclass
+class Measurement:
+    name: str
+    ops: int
+    errors: int
+    seconds: float
+    ops_per_sec: float
+    p50_ms: float
+    p99_ms: float
+
+
+def _percentile(latencies: Sequence[float], fraction: float) -> float:
+    if not latencies:
+        return 0.0
+    return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+
+def _measurement(name: str, latencies: List[float], errors: int, seconds: float) -> Measurement:
+    latencies = sorted(latencies)
+    return Measurement(
+        name=name,
+        ops=len(latencies),
+        errors=errors,
+        seconds=round(seconds, 4),
+        ops_per_sec=round(len(latencies) / seconds, 1) if seconds else 0.0,
+        p50_ms=round(_percentile(latencies, 0.50) * 1_000, 3),
+        p99_ms=round(_percentile(latencies, 0.99) * 1_000, 3),
+    )
+
+
+def _succeeded(result: Any) -> bool:
+    if isinstance(result, dict):
+        return result.get("status", 1) == 1
+    return getattr(result, "success", True)
+
+
+def _run(name: str, operation: Callable[[Any], Any], inputs: List[Any], concurrency: int) -> Measurement:
+    def timed(item: Any) -> tuple:
+        started: float = time.perf_counter()
+        succeeded: bool = _succeeded(operation(item))
+        return time.perf_counter() - started, succeeded
+
+    started: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes: List[tuple] = list(executor.map(timed, inputs))
+    seconds: float = time.perf_counter() - started
+    return _measurement(name, [latency for latency, _ in outcomes], sum(not ok for _, ok in outcomes), seconds)
+
+
+def _run_async(
+    name: str, operation: Callable[[Any], Awaitable[Any]], inputs: List[Any], concurrency: int
+) -> Measurement:
+    async def run_all() -> List[tuple]:
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(item: Any) -> tuple:
+            async with semaphore:
+                started: float = time.perf_counter()
+                succeeded: bool = _succeeded(await operation(item))
+                return time.perf_counter() - started, succeeded
+
+        return await asyncio.gather(*[timed(item) for item in inputs])
+
+    started: float = time.perf_counter()
+    outcomes: List[tuple] = asyncio.run(run_all())
+    seconds: float = time.perf_counter() - started
+    return _measurement(name, [latency for latency, _ in outcomes], sum(not ok for _, ok in outcomes), seconds)
+
+
+def _key_holder(index: int) -> DidKeyHolder:
+    """Generate a DID key holder. The DID is made up; the stand-in WAS resolves it with `_document`."""
+    did: str = f"did:icon:{NETWORK_ID:02x}:{index:048x}"
+    return DidKeyHolder(did=did, key_id="key1", type_=AlgorithmType.ES256K, private_key=PrivateKey())
+
+
+def _document(key_holder: DidKeyHolder) -> dict:
+    public_key: bytes = key_holder.private_key.public_key.format(compressed=False)
+    return {
+        "id": key_holder.did,
+        "created": 1,
+        "updated": 1,
+        "publicKey": {
+            key_holder.key_id: {
+                "id": key_holder.key_id,
+                "type": ["Secp256k1VerificationKey"],
+                "publicKey": base64.b64encode(public_key).decode(),
+                "encodeType": 1,
+                "created": 1,
+            }
+        },
+        "authentication": [{"publicKey": key_holder.kid}],
+    }
+
+
+def _credential_jwt(issuer: DidKeyHolder, holder_did: str, index: int) -> str:
+    issued_at: int = int(time.time())
+    payload: Payload = Payload(
+        {
+            Payload.ISSUER: issuer.did,
+            Payload.SUBJECT: holder_did,
+            Payload.ISSUED_AT: issued_at,
+            Payload.EXPIRATION: issued_at + 86_400,
+            Payload.NONCE: f"{index:016x}",
+            "type": ["CREDENTIAL", "IdentityCredential"],
+            "version": "2.0",
+            "vc": {
+                "@context": ["https://www.w3.org/2018/credentials/v1"],
+                "type": ["VerifiableCredential", "IdentityCredential"],
+                "credentialSubject": {"id": holder_did, "name": f"holder-{index}"},
+            },
+        }
+    )
+    return issuer.sign(Jwt(Header(alg=issuer.type.name, kid=issuer.kid), payload))
+
+
+def _credential_info_jwt(issuer: DidKeyHolder, credential_jwt: str) -> str:
+    issued_at: int = int(time.time())
+    credential_info: CredentialInfo = CredentialInfo(
+        type_=PropertyName.CREDENTIAL_INFO_TYPE_REGIST,
+        issuer_did=issuer.did,
+        signature=credential_jwt.split(".")[2],
+        issue_date=issued_at,
+        expiry_date=issued_at + 86_400,
+    )
+    return issuer.sign(CredentialInfoScoreParameter.credential_info_param(issuer, credential_info))
+
+
+def _presentation_token(holder: DidKeyHolder, credential_jwts: List[str], verifier_key: ECDHKey) -> str:
+    presentation: Presentation = Presentation(
+        algorithm=holder.type.name, key_id=holder.key_id, did=holder.did, version="2.0"
+    )
+    for credential_jwt in credential_jwts:
+        presentation.add_credential(credential_jwt)
+
+    protocol_message: ProtocolMessage = ProtocolMessage.for_presentation(
+        protocol_type=ProtocolType.RESPONSE_PROTECTED_PRESENTATION,
+        presentation=presentation,
+        request_public_key=EphemeralPublicKey(kid=ECDH_KID, epk=verifier_key),
+    )
+    sign_result: SignResult = protocol_message.sign_encrypt(
+        did_key_holder=holder, ecdh_key=ECDHKey.generate_key(EcdhCurveType.P256K.value.curve_name)
+    )
+    return sign_result.result["message"]
+
+
+def _scenarios(args) -> Dict[str, Callable[[Simulator], Measurement]]:
+    """The scenarios, each run against its own `Simulator` with the DID documents of the issuer and the holder."""
+    issuer: DidKeyHolder = _key_holder(1)
+    holder: DidKeyHolder = _key_holder(2)
+    credential_jwts: List[str] = [_credential_jwt(issuer, holder.did, index) for index in range(args.ops)]
+    credential_info_jwts: List[str] = [_credential_info_jwt(issuer, jwt) for jwt in credential_jwts]
+    signatures: List[str] = [credential_jwt.split(".")[2] for credential_jwt in credential_jwts]
+
+    def prepare(simulator: Simulator, registered: bool):
+        simulator.add_document(issuer.did, _document(issuer))
+        simulator.add_document(holder.did, _document(holder))
+        if registered:
+            for jwt in credential_info_jwts:
+                simulator.ledger.register(JwtUtil.decode_payload(jwt), simulator.chain.height)
+
+    def issuer_service(simulator: Simulator) -> IssuerService:
+        return IssuerService.create(simulator.url)
+
+    def credential_service(simulator: Simulator) -> CredentialService:
+        icon_service: IconService = IconService(HTTPProvider(simulator.url, 3))
+        return CredentialService(icon_service, network_id=NETWORK_ID, score_address=SCORE_ADDRESS)
+
+    def register_vc(simulator: Simulator) -> Measurement:
+        prepare(simulator, registered=False)
+        credentials: List[Credential] = [Credential.from_encoded_jwt(jwt) for jwt in credential_jwts]
+        service: IssuerService = issuer_service(simulator)
+        try:
+            return _run(
+                "register_vc", lambda credential: service.register_vc(credential, issuer), credentials, args.concurrency
+            )
+        finally:
+            service.close()
+
+    def revoke_vc_with_signature(simulator: Simulator) -> Measurement:
+        prepare(simulator, registered=True)
+        service: IssuerService = issuer_service(simulator)
+        try:
+            return _run(
+                "revoke_vc_with_signature",
+                lambda signature: service.revoke_vc_with_signature(signature, issuer.did, issuer),
+                signatures,
+                args.concurrency,
+            )
+        finally:
+            service.close()
+
+    def verify_presentation(simulator: Simulator) -> Measurement:
+        prepare(simulator, registered=True)
+        verifier_key: ECDHKey = ECDHKey.generate_key(EcdhCurveType.P256K.value.curve_name)
+        tokens: List[str] = [_presentation_token(holder, [jwt], verifier_key) for jwt in credential_jwts]
+        service: VerifierService = VerifierService.create(simulator.url)
+        service.add_ecdh_key(ECDH_KID, verifier_key)
+        try:
+            return _run("verify_presentation", service.verify_presentation, tokens, args.concurrency)
+        finally:
+            service.close()
+
+    def register(simulator: Simulator) -> Measurement:
+        prepare(simulator, registered=False)
+        wallet: KeyWallet = KeyWallet.create()
+        service: CredentialService = credential_service(simulator)
+        try:
+            return _run_async(
+                "register", lambda jwt: service.register(wallet, jwt), credential_info_jwts, args.concurrency
+            )
+        finally:
+            service.close()
+
+    def register_credential_list(simulator: Simulator) -> Measurement:
+        prepare(simulator, registered=False)
+        wallet: KeyWallet = KeyWallet.create()
+        chunks: List[List[str]] = [
+            credential_info_jwts[start : start + LIST_SIZE] for start in range(0, len(credential_info_jwts), LIST_SIZE)
+        ]
+        service: CredentialService = credential_service(simulator)
+        try:
+            return _run_async(
+                f"register_credential_list[{LIST_SIZE}]",
+                lambda chunk: service.register_credential_list(wallet, chunk),
+                chunks,
+                args.concurrency,
+            )
+        finally:
+            service.close()
+
+    def is_valid(simulator: Simulator) -> Measurement:
+        prepare(simulator, registered=True)
+        service: CredentialService = credential_service(simulator)
+        try:
+            return _run("is_valid", service.is_valid, signatures, args.concurrency)
+        finally:
+            service.close()
+
+    return {
+        "register_vc": register_vc,
+        "revoke_vc_with_signature": revoke_vc_with_signature,
+        "verify_presentation": verify_presentation,
+        "register": register,
+        "register_credential_list": register_credential_list,
+        "is_valid": is_valid,
+    }
+
+
+def _print_comparison(measurements: List[Measurement], baseline_path: str):
+    with open(baseline_path) as baseline_file:
+        baseline: dict = json.load(baseline_file)
+    previous: Dict[str, dict] = {result["name"]: result for result in baseline["results"]}
+    print(f"\ncompared with {baseline_path} (myid-sdk {baseline.get('myid_sdk')})")
+    for measurement in measurements:
+        before: Optional[dict] = previous.get(measurement.name)
+        if not before or not before["ops_per_sec"]:
+            continue
+        print(
+            f"{measurement.name:>30}: ops/s x{measurement.ops_per_sec / before['ops_per_sec']:.2f}"
+            f"  p99 {before['p99_ms']:.2f} -> {measurement.p99_ms:.2f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=500, help="the operations per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--scenarios", nargs="*", help="the scenarios to run, all if omitted")
+    parser.add_argument("--tx-sleep", type=float, default=0.01, help="MYIDSDK_TX_SLEEP_TIME for the run")
+    parser.add_argument("--block-time", type=float, default=0, help="the block interval of the simulator, in seconds")
+    parser.add_argument("--latency", type=float, default=0, help="the response delay of the simulator, in seconds")
+    parser.add_argument("--output", help="save the report to this JSON file")
+    parser.add_argument("--compare", help="print the change against this saved JSON report")
+    args = parser.parse_args()
+
+    settings.MYIDSDK_TX_SLEEP_TIME = args.tx_sleep
+    settings.MYIDSDK_TX_MAX_SLEEP_TIME = max(args.tx_sleep, settings.MYIDSDK_TX_MAX_SLEEP_TIME / 100)
+
+    measurements: List[Measurement] = []
+    config: SimulatorConfig = SimulatorConfig(block_time=args.block_time, latency=args.latency)
+    scenarios: Dict[str, Callable[[Simulator], Measurement]] = _scenarios(args)
+    for name in args.scenarios or scenarios:
+        try:
+            with Simulator(config) as simulator:
+                measurement: Measurement = scenarios[name](simulator)
+        except Exception:
+            print(f"{name:>30}: failed\n{traceback.format_exc()}")
+            continue
+        measurements.append(measurement)
+        print(
+            f"{measurement.name:>30}: {measurement.ops_per_sec:10.1f} ops/s"
+            f"  p50 {measurement.p50_ms:8.2f} ms  p99 {measurement.p99_ms:8.2f} ms  errors {measurement.errors}"
+        )
+
+    if args.output:
+        report: dict = {
+            "myid_sdk": __version__,
+            "python": platform.python_version(),
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "params": {
+                "ops": args.ops,
+                "concurrency": args.concurrency,
+                "tx_sleep": args.tx_sleep,
+                "block_time": args.block_time,
+                "latency": args.latency,
+            },
+            "results": [asdict(measurement) for measurement in measurements],
+        }
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.compare:
+        _print_comparison(measurements, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Compare the encode/decode time of every VO in `myid.vo` with `VOCodec` against `dataclasses.asdict` + `json`.
+
+Usage: python -m benchmarks.bench_vo_codec [--loops N]
+"""
+
+import argparse
+import dataclasses
+import json
+import timeit
+from typing import Any, Callable, List, Tuple
+
+from myid.vo.codec import VOCodec
+from myid.vo.did_request import DIDRequest
+from myid.vo.issued_register_request import IssuedRegRequest
+from myid.vo.presentation_log_request import PresentationLogRequest
+from myid.vo.result_response import ResultResponse
+from myid.vo.vc_request import VCRequest
+
+_JWT: str = "eyJhbGciOiJFUzI1NksiLCJraWQiOiJkaWQ6aWNvbjowMjp4I2tleTEifQ." + "a" * 600 + "." + "s" * 86
+_DID: str = "did:icon:02:" + "0" * 48
+
+_VOS: List[Any] = [
+    DIDRequest(keyId="key1", nid="2", publicKey="A" * 44),
+    IssuedRegRequest(
+        vcSig="s" * 86, issuerDid=_DID, holderDid=_DID, issueDate=1_700_000_000, vcType=["IdentityCredential"]
+    ),
+    PresentationLogRequest(holderDid=_DID, vcSigs=["s" * 86] * 3, logDate=1_700_000_000),
+    ResultResponse(status=True, result={"isValid": True}),
+    VCRequest(jwt=_JWT, nid="2"),
+]
+
+
+def _legacy_decode(vo_type: type, data: bytes) -> Any:
+    return vo_type(**json.loads(data))
+
+
+def _cases(vo: Any) -> List[Tuple[str, Callable[[], Any], Callable[[], Any]]]:
+    encoded: bytes = VOCodec.encode(vo)
+    return [
+        ("encode", lambda: json.dumps(dataclasses.asdict(vo)).encode(), lambda: VOCodec.encode(vo)),
+        ("decode", lambda: _legacy_decode(type(vo), encoded), lambda: VOCodec.decode(type(vo), encoded)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--loops", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"{'VO':>24} {'path':>6} {'legacy':>10} {'VOCodec':>10}")
+    for vo in _VOS:
+        for path, legacy, fast in _cases(vo):
+            legacy_us: float = timeit.timeit(legacy, number=args.loops) / args.loops * 1_000_000
+            fast_us: float = timeit.timeit(fast, number=args.loops) / args.loops * 1_000_000
+            print(
+                f"{type(vo).__name__:>24} {path:>6} {legacy_us:8.2f}us {fast_us:8.2f}us  (x{legacy_us / fast_us:.2f})"
+            )
+
+
+if __name__ == "__main__":
+    main()
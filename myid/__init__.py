@@ -1,11 +1,49 @@
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
 from loguru import logger
 
 from myid.config import settings
 
+if TYPE_CHECKING:
+    from myid.async_issuer_service import AsyncIssuerService
+    from myid.async_verifier_service import AsyncVerifierService
+    from myid.credential_service import CredentialService
+    from myid.issuer_service import IssuerService
+    from myid.service_result import ServiceResult
+    from myid.verifier_service import VerifierService
+
 if settings.MYIDSDK_LOG_ENABLE_LOGGER:
     logger.enable(__name__)
 else:
     logger.disable(__name__)
 
 logger.debug(f"{settings.MYIDSDK_LOG_ENABLE_LOGGER=}")
-logger.debug(f"{settings.__repr_name__()}: {settings.dict()}")
+logger.opt(lazy=True).debug("{}: {}", settings.__repr_name__, settings.dict)
+
+# the public API, imported on first access (PEP 562), so that `import myid` does not load didsdk, jwcrypto, iconsdk
+# or requests, and a service only loads the dependencies of its own module.
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "AsyncIssuerService": "myid.async_issuer_service",
+    "AsyncVerifierService": "myid.async_verifier_service",
+    "CredentialService": "myid.credential_service",
+    "IssuerService": "myid.issuer_service",
+    "ServiceResult": "myid.service_result",
+    "VerifierService": "myid.verifier_service",
+}
+
+__all__ = ["settings", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str) -> Any:
+    module_name: Optional[str] = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value: Any = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,110 @@
+import asyncio
+from typing import Callable, List, Optional, Sequence, TypeVar, Union
+
+from didsdk.document.document import Document
+from loguru import logger
+
+from myid.base_service import _NOT_CACHED, BaseService
+from myid.core.api_path import APIPath
+from myid.utils.async_http_transport import AsyncHttpTransport, PooledAsyncHttpTransport
+from myid.utils.crypto_engine import CryptoEngine
+from myid.utils.ecdh_key_store import EcdhKeyStore
+from myid.utils.log_shipper import LogShipper
+from myid.utils.metrics import metrics
+from myid.vo.codec import VOCodec
+from myid.vo.did_request import DIDRequest
+from myid.vo.result_response import ResultResponse
+from myid.vo.vc_request import VCRequest
+
+T = TypeVar("T")
+
+
+class AsyncBaseService(BaseService):
+    """The asyncio counterpart of `BaseService`.
+
+    The methods that call the IV WAS are coroutines and use a non-blocking `AsyncHttpTransport`.
+    They return the same types as the blocking ones.
+    """
+
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: AsyncHttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ):
+        super().__init__(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+
+    def _create_log_shipper(self) -> LogShipper:
+        # the shipper posts from its own thread, so it keeps a blocking transport of its own.
+        return LogShipper(self._url)
+
+    @staticmethod
+    def _create_transport(urls: List[str]) -> AsyncHttpTransport:
+        return PooledAsyncHttpTransport(urls) if len(urls) > 1 else AsyncHttpTransport()
+
+    async def _fetch_did(self, did: str) -> Optional[Document]:
+        generation: int = self._did_generation(did)
+        request_url: str = self._url + APIPath.R_DID + did
+        logger.debug(f"get_did: {request_url}")
+        result_response: ResultResponse = await self._transport.get(request_url)
+        logger.debug(f"response: {result_response}")
+
+        document: Optional[Document] = self._to_document(result_response)
+        self._cache_did_document(did, document, generation)
+        return document
+
+    async def _offload(self, func: Callable[..., T], *args) -> T:
+        """Call the CPU-bound function on the `CryptoEngine` when one is set, or inline otherwise.
+
+        The engine future is awaited without holding a thread of the loop's executor, and the crypto the function
+        asks from the engine runs inline on the engine worker.
+        """
+        if not self._crypto_engine:
+            return func(*args)
+
+        return await asyncio.wrap_future(self._crypto_engine.submit(func, *args))
+
+    async def add_public_key(self, signed_jwt: str) -> Optional[Document]:
+        request_url: str = self._url + APIPath.U_DID
+        request: VCRequest = self._update_did_request(signed_jwt, status=1)
+        result_response: ResultResponse = await self._transport.post(request_url, content=VOCodec.encode(request))
+        self._invalidate_did_of_jwt(signed_jwt)
+
+        return self._to_document(result_response)
+
+    async def close(self):
+        """Ship the queued logs and close the connections kept alive by the HTTP transport and the key store."""
+        await asyncio.get_running_loop().run_in_executor(None, self._log_shipper.close)
+        await self._transport.close()
+        self._ecdh_key_store.close()
+
+    async def create_did(self, kid: str, publickey_base64: str, decimal_nid: str) -> Optional[Document]:
+        request_url: str = self._url + APIPath.C_DID
+        request: DIDRequest = DIDRequest(keyId=kid, nid=decimal_nid, publicKey=publickey_base64)
+        result_response: ResultResponse = await self._transport.post(url=request_url, content=VOCodec.encode(request))
+
+        return self._to_document(result_response)
+
+    @metrics.timed("myid_did_resolution_seconds")
+    async def get_did(self, did: str) -> Optional[Document]:
+        document: Optional[Document] = self._did_cache.get(did, _NOT_CACHED)
+        if document is not _NOT_CACHED:
+            return document
+
+        return await self._did_flight.do_async(did, self._fetch_did, did)
+
+    async def revoke_key(self, signed_jwt: str) -> Optional[Document]:
+        request_url: str = self._url + APIPath.U_DID
+        request: VCRequest = self._update_did_request(signed_jwt, status=0)
+        result_response: ResultResponse = await self._transport.post(request_url, content=VOCodec.encode(request))
+        self._invalidate_did_of_jwt(signed_jwt)
+
+        return self._to_document(result_response)
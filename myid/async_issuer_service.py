@@ -0,0 +1,203 @@
+import asyncio
+import json
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union
+
+from didsdk.core.did_key_holder import DidKeyHolder
+from didsdk.credential import Credential
+from didsdk.protocol.protocol_message import ProtocolMessage, SignResult
+from iconsdk.exception import JSONRPCException
+from loguru import logger
+
+from myid.async_base_service import AsyncBaseService
+from myid.bulk_revocation import RevocationOutcome
+from myid.config import settings
+from myid.core.api_path import APIPath
+from myid.credential.credential_info import CredentialInfo
+from myid.issuer_service import IssuerService
+from myid.service_result import ServiceResult
+from myid.utils.async_http_transport import AsyncHttpTransport
+from myid.utils.crypto_engine import CryptoEngine
+from myid.utils.ecdh_key_store import EcdhKeyStore
+from myid.utils.log_shipper import LogShipper
+from myid.vo.codec import VOCodec
+from myid.vo.result_response import ResultResponse
+from myid.vo.vc_request import VCRequest
+
+
+class AsyncIssuerService(AsyncBaseService, IssuerService):
+    """The asyncio counterpart of `IssuerService`."""
+
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: AsyncHttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ):
+        super().__init__(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+
+    async def _fetch_vc(self, issuer_did: str, signature: str) -> Optional[CredentialInfo]:
+        request: VCRequest = VCRequest(nid=self.get_decimal_nid_from_did(issuer_did), sig=signature)
+        request_url: str = self._url + APIPath.GET_VC + request.to_query_param()
+        result_response: ResultResponse = await self._transport.get(request_url)
+
+        logger.debug(f"get_vc request: {request_url}")
+        logger.debug(f"get_vc result: {result_response}")
+        if result_response.status:
+            return CredentialInfo.from_json(result_response.result)
+        else:
+            raise JSONRPCException(result_response.result)
+
+    async def _issue_credential_isolated(
+        self, protocol_message: ProtocolMessage, issuer_key_holder: DidKeyHolder, kid: str
+    ) -> ServiceResult:
+        try:
+            sign_result: SignResult = await self._offload(
+                self._sign_encrypt, protocol_message, issuer_key_holder, self._required_ecdh_key(kid)
+            )
+            if not sign_result.success:
+                return ServiceResult.from_signed_object(sign_result)
+
+            credential: Credential = Credential.from_jwt(json.loads(protocol_message.message))
+            return self._issued_result(sign_result, await self.register_vc(credential, issuer_key_holder))
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    async def _revoke_isolated(
+        self, signature: str, issuer_did: str, issuer_key_holder: DidKeyHolder
+    ) -> RevocationOutcome:
+        try:
+            service_result: ServiceResult = await self.revoke_vc_with_signature(
+                signature, issuer_did, issuer_key_holder
+            )
+        except Exception as e:
+            return RevocationOutcome(signature, success=False, error=str(e))
+
+        return RevocationOutcome(signature, success=service_result.success, error=service_result.fail_message)
+
+    @staticmethod
+    def create(
+        url: Union[str, Sequence[str]],
+        transport: AsyncHttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ) -> "AsyncIssuerService":
+        """Create a `AsyncIssuerService` instance that can use methods for Issuer.
+
+        :param url: A Issuer WAS endpoint, or the endpoints of its replicas to balance the calls over
+        :param transport: the HTTP transport to share with other services. A new one, pooled if several endpoints are
+            given, is created if omitted.
+        :param crypto_engine: the engine to run the crypto off the calling thread. It runs inline if omitted.
+        :param log_shipper: the shipper of the IV WAS logs. A new one is created if omitted.
+        :param ecdh_key_store: the store of the ECDH keys to share with other services. A new one is created if omitted.
+        :return: AsyncIssuerService instance
+        """
+        return AsyncIssuerService(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+
+    async def get_vc(self, issuer_did: str, signature: str) -> Optional[CredentialInfo]:
+        return await self._vc_flight.do_async((issuer_did, signature), self._fetch_vc, issuer_did, signature)
+
+    async def register_vc(self, credential: Credential, issuer_key_holder: DidKeyHolder) -> ServiceResult:
+        """Register a VC via myid Server.
+
+        :param credential:
+        :param issuer_key_holder:
+        :return:
+        """
+        request_url: str = self._url + APIPath.REG_VC
+        vc_request: VCRequest = self._register_vc_request(credential=credential, issuer_key_holder=issuer_key_holder)
+        result_response: ResultResponse = await self._transport.post(
+            url=request_url, content=VOCodec.encode(vc_request)
+        )
+        if result_response.status:
+            self.ship_log(APIPath.ISS_VC_LOG, self._issued_register_request(credential))
+
+        return ServiceResult.from_result(result_response)
+
+    async def revoke_vc(self, credential: Credential, issuer_key_holder: DidKeyHolder) -> ServiceResult:
+        return await self.revoke_vc_with_signature(
+            signature=credential.jwt.signature, issuer_did=credential.did, issuer_key_holder=issuer_key_holder
+        )
+
+    async def revoke_vc_with_signature(
+        self, signature: str, issuer_did: str, issuer_key_holder: DidKeyHolder
+    ) -> ServiceResult:
+        request_url: str = self._url + APIPath.REV_VC
+        vc_request: VCRequest = await self._offload(self._revoke_vc_request, signature, issuer_did, issuer_key_holder)
+        result_response: ResultResponse = await self._transport.post(
+            url=request_url, content=VOCodec.encode(vc_request)
+        )
+        return ServiceResult.from_result(result_response)
+
+    async def revoke_vcs_with_signatures(
+        self,
+        signatures: Iterable[str],
+        issuer_did: str,
+        issuer_key_holder: DidKeyHolder,
+        max_concurrency: int = None,
+        progress: Callable[[RevocationOutcome], None] = None,
+    ) -> List[RevocationOutcome]:
+        """Revoke many credentials of the issuer at once. See `IssuerService.revoke_vcs_with_signatures`."""
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency or settings.MYIDSDK_REVOKE_CONCURRENCY)
+
+        async def revoked(signature: str) -> RevocationOutcome:
+            async with semaphore:
+                outcome: RevocationOutcome = await self._revoke_isolated(signature, issuer_did, issuer_key_holder)
+            if progress:
+                progress(outcome)
+            return outcome
+
+        return list(await asyncio.gather(*[revoked(signature) for signature in signatures]))
+
+    async def sign_encrypt_credential(
+        self, protocol_message: ProtocolMessage, issuer_key_holder: DidKeyHolder, kid: str
+    ) -> ServiceResult:
+        sign_result: SignResult = await self._offload(
+            self._sign_encrypt, protocol_message, issuer_key_holder, self._ecdh_key_store.get(kid)
+        )
+        if sign_result.success:
+            credential: Credential = Credential.from_jwt(json.loads(protocol_message.message))
+            await self.register_vc(credential, issuer_key_holder)
+
+        return ServiceResult.from_signed_object(sign_result)
+
+    async def sign_encrypt_credentials(
+        self,
+        protocol_messages: List[Tuple[ProtocolMessage, str]],
+        issuer_key_holder: DidKeyHolder,
+        max_concurrency: int = None,
+    ) -> List[ServiceResult]:
+        """Issue many credentials at once. See `IssuerService.sign_encrypt_credentials`."""
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency or settings.MYIDSDK_ISSUE_CONCURRENCY)
+
+        async def issued(protocol_message: ProtocolMessage, kid: str) -> ServiceResult:
+            async with semaphore:
+                return await self._issue_credential_isolated(protocol_message, issuer_key_holder, kid)
+
+        return list(await asyncio.gather(*[issued(message, kid) for message, kid in protocol_messages]))
+
+    async def sign_revoke_jwts(
+        self, signatures: Iterable[str], issuer_did: str, issuer_key_holder: DidKeyHolder, max_concurrency: int = None
+    ) -> List[str]:
+        """Sign the revocation JWTs of many credentials. See `IssuerService.sign_revoke_jwts`."""
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency or settings.MYIDSDK_REVOKE_CONCURRENCY)
+
+        async def signed(signature: str) -> str:
+            async with semaphore:
+                return await self._offload(self._revoke_jwt, signature, issuer_did, issuer_key_holder)
+
+        return list(await asyncio.gather(*[signed(signature) for signature in signatures]))
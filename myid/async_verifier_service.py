@@ -0,0 +1,184 @@
+import asyncio
+from concurrent.futures import Future
+from typing import Awaitable, Dict, List, Optional, Sequence, Tuple, TypeVar, Union
+
+from didsdk.core.did_key_holder import DidKeyHolder
+from didsdk.credential import Credential
+from didsdk.document.document import Document
+from didsdk.presentation import Presentation
+from didsdk.protocol.protocol_message import ProtocolMessage, SignResult
+
+from myid.async_base_service import AsyncBaseService
+from myid.config import settings
+from myid.service_result import ServiceResult
+from myid.utils.async_http_transport import AsyncHttpTransport
+from myid.utils.crypto_engine import CryptoEngine
+from myid.utils.ecdh_key_store import EcdhKeyStore
+from myid.utils.log_shipper import LogShipper
+from myid.verifier_service import VerifierService
+from myid.vo.result_response import ResultResponse
+
+T = TypeVar("T")
+
+
+class AsyncVerifierService(AsyncBaseService, VerifierService):
+    """The asyncio counterpart of `VerifierService`."""
+
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: AsyncHttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ):
+        super().__init__(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+
+    async def _get_did_isolated(self, did: str) -> Union[ServiceResult, Optional[Document]]:
+        """Same as `get_did`, but an error is returned as the failed result of the issuer's credentials."""
+        try:
+            return await self.get_did(did)
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    async def _verified_credential_result(self, credential: Credential, holder_did: str) -> ServiceResult:
+        issuer_document: Optional[Document] = await self.get_did(credential.did)
+        fail_result: Optional[ServiceResult] = await self._verify_credential(credential, holder_did, issuer_document)
+        if fail_result:
+            return fail_result
+
+        result_response: ResultResponse = await self._transport.get(self._is_valid_vc_url(credential))
+
+        return self._is_valid_vc_result(result_response)
+
+    async def _verify_credential(
+        self, credential: Credential, holder_did: str, issuer_document: Document
+    ) -> Optional[ServiceResult]:
+        """Check the credential against the issuer's DID document.
+
+        The signature verification of the `CryptoEngine` is awaited without holding a thread.
+
+        :return: the failed result, or None if the credential passes the local checks
+        """
+        verification: Union[ServiceResult, Future] = self._start_credential_verify(credential, issuer_document)
+        if isinstance(verification, ServiceResult):
+            return verification
+
+        return self._finish_credential_verify(credential, holder_did, await asyncio.wrap_future(verification))
+
+    async def _verify_credential_isolated(
+        self, credential: Credential, holder_did: str, issuer_document: Union[ServiceResult, Optional[Document]]
+    ) -> Optional[ServiceResult]:
+        """Same as `_verify_credential`, but an error is returned as the failed result so it stays in its batch.
+
+        :param issuer_document: the issuer's DID document, or the failed result of its resolution
+        """
+        if isinstance(issuer_document, ServiceResult):
+            return issuer_document
+
+        try:
+            return await self._verify_credential(credential, holder_did, issuer_document)
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    @staticmethod
+    def create(
+        url: Union[str, Sequence[str]],
+        transport: AsyncHttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ) -> "AsyncVerifierService":
+        """Create a `AsyncVerifierService` instance that can use methods for Verifier.
+
+        :param url: A Verifier WAS endpoint, or the endpoints of its replicas to balance the calls over
+        :param transport: the HTTP transport to share with other services. A new one, pooled if several endpoints are
+            given, is created if omitted.
+        :param crypto_engine: the engine to run the crypto off the calling thread. It runs inline if omitted.
+        :param log_shipper: the shipper of the IV WAS logs. A new one is created if omitted.
+        :param ecdh_key_store: the store of the ECDH keys to share with other services. A new one is created if omitted.
+        :return: AsyncVerifierService instance
+        """
+        return AsyncVerifierService(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+
+    async def decrypt_presentation(self, jwe_token: str) -> Presentation:
+        return await self._offload(self._decrypt_presentation, jwe_token)
+
+    async def sign_encrypt_request_presentation(
+        self, protocol_message: ProtocolMessage, verifier_key_holder: DidKeyHolder
+    ) -> ServiceResult:
+        result: SignResult = await self._offload(self._sign_encrypt, protocol_message, verifier_key_holder)
+        return ServiceResult.from_signed_object(result)
+
+    async def verify_presentation(self, jwe_token: str) -> ServiceResult:
+        """Decrypt the presentation and verify every credential in it.
+
+        :param jwe_token: the encrypted presentation
+        :return: the result holding the `Presentation` on success, or the first failure
+        """
+        return (await self.verify_presentations([jwe_token]))[0]
+
+    async def verify_presentations(self, jwe_tokens: List[str], max_concurrency: int = None) -> List[ServiceResult]:
+        """Verify many presentations at once.
+
+        Each issuer DID is resolved once for the whole batch. The decryption, the DID resolutions and the
+        `IS_VALID_VC` checks run concurrently; the crypto is dispatched to the `CryptoEngine` if one is set.
+
+        :param jwe_tokens: the encrypted presentations
+        :param max_concurrency: the maximum number of concurrent WAS calls. `MYIDSDK_VERIFY_CONCURRENCY` if omitted.
+        :return: a result per token, in the order of `jwe_tokens`. See `verify_presentation`.
+        """
+        semaphore: asyncio.Semaphore = asyncio.Semaphore(max_concurrency or settings.MYIDSDK_VERIFY_CONCURRENCY)
+
+        async def bounded(awaitable: Awaitable[T]) -> T:
+            async with semaphore:
+                return await awaitable
+
+        async def verified_credential(credential: Credential, holder_did: str) -> ServiceResult:
+            fail_result: Optional[ServiceResult] = await self._verify_credential_isolated(
+                credential, holder_did, issuer_documents[credential.did]
+            )
+            if fail_result:
+                return fail_result
+
+            return self._is_valid_vc_result(await bounded(self._transport.get(self._is_valid_vc_url(credential))))
+
+        async def verified_presentation(
+            entry: Union[ServiceResult, Tuple[Presentation, List[Credential]]],
+        ) -> ServiceResult:
+            if isinstance(entry, ServiceResult):
+                return entry
+
+            presentation, credentials = entry
+            credential_results: List[ServiceResult] = await asyncio.gather(
+                *[verified_credential(credential, presentation.did) for credential in credentials]
+            )
+            return self._presentation_result(presentation, credential_results)
+
+        decrypted: List[Union[ServiceResult, Tuple[Presentation, List[Credential]]]] = await asyncio.gather(
+            *[self._offload(self._decrypt_credentials_isolated, jwe_token) for jwe_token in jwe_tokens]
+        )
+        issuer_dids: List[str] = list(
+            {credential.did for entry in decrypted if isinstance(entry, tuple) for credential in entry[1]}
+        )
+        issuer_documents: Dict[str, Union[ServiceResult, Optional[Document]]] = dict(
+            zip(issuer_dids, await asyncio.gather(*[bounded(self._get_did_isolated(did)) for did in issuer_dids]))
+        )
+
+        results: List[ServiceResult] = list(
+            await asyncio.gather(*[verified_presentation(entry) for entry in decrypted])
+        )
+        self._ship_verification_logs(results)
+        return results
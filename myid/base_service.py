@@ -1,111 +1,251 @@
-import dataclasses
-from typing import Any, Dict, Optional
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Sequence, Union
 
+from coincurve import PublicKey
+from didsdk.core.did_key_holder import DidKeyHolder
 from didsdk.document.document import Document
 from didsdk.jwe.ecdhkey import ECDHKey
 from didsdk.jwt.jwt import Jwt, VerifyResult
-from didsdk.protocol.protocol_message import SignResult
+from didsdk.protocol.protocol_message import ProtocolMessage, SignResult
 from loguru import logger
 
+from myid.config import settings
 from myid.core.api_path import APIPath
-from myid.utils import HttpUtil
+from myid.service_result import ServiceResult  # importable from here as before
+from myid.utils.cache import CacheStats, TTLCache
+from myid.utils.crypto_engine import CryptoEngine, _run_inline
+from myid.utils.ecdh_key_store import (
+    EcdhKeyStore,
+    MemoryEcdhKeyStore,
+    SqliteEcdhKeyStore,
+)
+from myid.utils.endpoint_pool import EndpointStats
+from myid.utils.http_transport import HttpTransport, PooledHttpTransport
+from myid.utils.log_shipper import LogShipper, LogShipperStats
+from myid.utils.metrics import metrics
+from myid.utils.single_flight import SingleFlight, SingleFlightStats
+from myid.vo.codec import VOCodec
 from myid.vo.did_request import DIDRequest
 from myid.vo.result_response import ResultResponse
 from myid.vo.vc_request import VCRequest
 
+_NOT_CACHED = object()
+
 
 class BaseService:
-    def __init__(self, url: str):
-        self._url: str = url
-        self._ecdh_keys: Dict[str, ECDHKey] = {}
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: HttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ):
+        # the URLs are built on the first endpoint of a pool, and the pooled transport sends them to the chosen one
+        urls: List[str] = [url] if isinstance(url, str) else list(url)
+        self._url: str = urls[0]
+        self._transport: HttpTransport = transport if transport else self._create_transport(urls)
+        self._crypto_engine: Optional[CryptoEngine] = crypto_engine
+        self._log_shipper: LogShipper = log_shipper if log_shipper else self._create_log_shipper()
+        self._ecdh_key_store: EcdhKeyStore = ecdh_key_store if ecdh_key_store else self._create_ecdh_key_store()
+        self._did_cache: TTLCache = TTLCache(
+            max_size=settings.MYIDSDK_DID_CACHE_SIZE, ttl=settings.MYIDSDK_DID_CACHE_TTL, name="did"
+        )
+        self._did_flight: SingleFlight = SingleFlight(name="did")
+        # bumped per DID on every invalidation, so a document resolved before it is not cached after it
+        self._did_generations: Dict[str, int] = {}
+        self._did_lock: threading.Lock = threading.Lock()
+
+    @property
+    def did_cache_stats(self) -> CacheStats:
+        """The hit/miss counters of the DID document cache."""
+        return self._did_cache.stats
+
+    @property
+    def did_flight_stats(self) -> SingleFlightStats:
+        """The calls and backend executions of `get_did`, coalesced when the same DID is resolved concurrently."""
+        return self._did_flight.stats
+
+    @property
+    def endpoint_stats(self) -> Dict[str, EndpointStats]:
+        """The health, load and latency of each WAS endpoint, when the service calls a pool of them."""
+        pool = getattr(self._transport, "pool", None)
+        return pool.stats if pool is not None else {}
+
+    @property
+    def log_shipper_stats(self) -> LogShipperStats:
+        """The counters of the shipped, failed and dropped IV WAS logs."""
+        return self._log_shipper.stats
+
+    def _cache_did_document(self, did: str, document: Optional[Document], generation: int):
+        """Cache the resolved document, unless the DID was invalidated since the resolution started.
+
+        A missing document is cached for the shorter negative TTL.
+
+        :param did: the DID
+        :param document: the resolved document
+        :param generation: `_did_generation` of the DID when the resolution started
+        """
+        with self._did_lock:
+            if generation == self._did_generations.get(did, 0):
+                self._did_cache.put(did, document, ttl=None if document else settings.MYIDSDK_DID_CACHE_NEGATIVE_TTL)
+
+    @staticmethod
+    def _create_ecdh_key_store() -> EcdhKeyStore:
+        if settings.MYIDSDK_ECDH_KEY_STORE_PATH:
+            return SqliteEcdhKeyStore(
+                settings.MYIDSDK_ECDH_KEY_STORE_PATH,
+                max_size=settings.MYIDSDK_ECDH_KEY_STORE_SIZE,
+                ttl=settings.MYIDSDK_ECDH_KEY_TTL,
+            )
+
+        return MemoryEcdhKeyStore(max_size=settings.MYIDSDK_ECDH_KEY_STORE_SIZE, ttl=settings.MYIDSDK_ECDH_KEY_TTL)
+
+    def _create_log_shipper(self) -> LogShipper:
+        return LogShipper(self._url, transport=self._transport)
+
+    @staticmethod
+    def _create_transport(urls: List[str]) -> HttpTransport:
+        return PooledHttpTransport(urls) if len(urls) > 1 else HttpTransport()
+
+    def _did_generation(self, did: str) -> int:
+        with self._did_lock:
+            return self._did_generations.get(did, 0)
+
+    def _fetch_did(self, did: str) -> Optional[Document]:
+        generation: int = self._did_generation(did)
+        request_url: str = self._url + APIPath.R_DID + did
+        logger.debug(f"get_did: {request_url}")
+        result_response: ResultResponse = self._transport.get(request_url)
+        logger.debug(f"response: {result_response}")
+
+        document: Optional[Document] = self._to_document(result_response)
+        self._cache_did_document(did, document, generation)
+        return document
+
+    def _invalidate_did_of_jwt(self, signed_jwt: str):
+        kid: str = Jwt.decode(signed_jwt).header.kid
+        self.invalidate_did(kid.split("#")[0])
+
+    @metrics.timed("myid_crypto_seconds", operation="sign_encrypt")
+    def _sign_encrypt(
+        self, protocol_message: ProtocolMessage, did_key_holder: DidKeyHolder, ecdh_key: ECDHKey = None
+    ) -> SignResult:
+        if self._crypto_engine:
+            return self._crypto_engine.sign_encrypt(protocol_message, did_key_holder, ecdh_key).result()
+
+        return protocol_message.sign_encrypt(did_key_holder=did_key_holder, ecdh_key=ecdh_key)
+
+    @metrics.timed("myid_crypto_seconds", operation="sign")
+    def _sign_jwt(self, jwt: Jwt, did_key_holder: DidKeyHolder) -> str:
+        if self._crypto_engine:
+            return self._crypto_engine.sign(jwt, did_key_holder).result()
+
+        return did_key_holder.sign(jwt)
+
+    @staticmethod
+    def _to_document(result_response: ResultResponse) -> Optional[Document]:
+        return Document.deserialize(result_response.result) if result_response.status else None
+
+    def _update_did_request(self, signed_jwt: str, status: int) -> VCRequest:
+        jwt: Jwt = Jwt.decode(signed_jwt)
+        return VCRequest(jwt=signed_jwt, nid=self.get_decimal_nid_from_did(jwt.header.kid), status=status)
+
+    def _submit_verify_jwt(
+        self, jwt: Jwt, public_key: PublicKey, public_key_bytes: bytes = None
+    ) -> "Future[VerifyResult]":
+        """Start verifying the JWT on the `CryptoEngine`, so many verifications can run at once.
+
+        It is verified inline into a done future if there is no engine.
+
+        :return: the future of the verify result
+        """
+        started: float = time.perf_counter()
+        if self._crypto_engine:
+            future: Future = self._crypto_engine.verify(jwt, public_key, public_key_bytes)
+        else:
+            future = _run_inline(jwt.verify, public_key)
+
+        if metrics.enabled:
+            future.add_done_callback(
+                lambda _: metrics.observe("myid_crypto_seconds", time.perf_counter() - started, operation="jwt_verify")
+            )
+        return future
+
+    def _verify_jwt(self, jwt: Jwt, public_key: PublicKey, public_key_bytes: bytes = None) -> VerifyResult:
+        return self._submit_verify_jwt(jwt, public_key, public_key_bytes).result()
 
     def add_ecdh_key(self, kid: str, key: ECDHKey):
-        self._ecdh_keys[kid] = key
+        self._ecdh_key_store.put(kid, key)
 
     def add_public_key(self, signed_jwt: str) -> Optional[Document]:
-        jwt: Jwt = Jwt.decode(signed_jwt)
         request_url: str = self._url + APIPath.U_DID
-        request: VCRequest = VCRequest(jwt=signed_jwt, nid=self.get_decimal_nid_from_did(jwt.header.kid), status=1)
-        result_response: ResultResponse = HttpUtil.post(request_url, json=dataclasses.asdict(request))
+        request: VCRequest = self._update_did_request(signed_jwt, status=1)
+        result_response: ResultResponse = self._transport.post(request_url, content=VOCodec.encode(request))
+        self._invalidate_did_of_jwt(signed_jwt)
 
-        return Document.deserialize(result_response.result) if result_response.status else None
+        return self._to_document(result_response)
+
+    def close(self):
+        """Ship the queued logs and close the connections kept alive by the HTTP transport and the key store."""
+        self._log_shipper.close()
+        self._transport.close()
+        self._ecdh_key_store.close()
 
     def create_did(self, kid: str, publickey_base64: str, decimal_nid: str) -> Optional[Document]:
         request_url: str = self._url + APIPath.C_DID
         request: DIDRequest = DIDRequest(keyId=kid, nid=decimal_nid, publicKey=publickey_base64)
-        result_response: ResultResponse = HttpUtil.post(url=request_url, json=dataclasses.asdict(request))
+        result_response: ResultResponse = self._transport.post(url=request_url, content=VOCodec.encode(request))
 
-        return Document.deserialize(result_response.result) if result_response.status else None
+        return self._to_document(result_response)
 
     def delete_all_ecdh_key(self):
-        self._ecdh_keys = {}
+        self._ecdh_key_store.clear()
 
     def delete_ecdh_key(self, kid: str):
-        del self._ecdh_keys[kid]
+        self._ecdh_key_store.delete(kid)
 
     def get_decimal_nid_from_did(self, did: str) -> str:
         hex_nid: str = did.split(":")[2]
         return str(int(hex_nid, 10))
 
+    @metrics.timed("myid_did_resolution_seconds")
     def get_did(self, did: str) -> Optional[Document]:
-        request_url: str = self._url + APIPath.R_DID + did
-        logger.debug(f"get_did: {request_url}")
-        result_response: ResultResponse = HttpUtil.get(request_url)
-        logger.debug(f"response: {result_response}")
+        document: Optional[Document] = self._did_cache.get(did, _NOT_CACHED)
+        if document is not _NOT_CACHED:
+            return document
 
-        return Document.deserialize(result_response.result) if result_response.status else None
+        return self._did_flight.do(did, self._fetch_did, did)
 
     def get_ecdh_key(self, kid: str) -> ECDHKey:
-        return self._ecdh_keys.get(kid)
+        return self._ecdh_key_store.get(kid)
 
-    def revoke_key(self, signed_jwt: str) -> Optional[Document]:
-        jwt: Jwt = Jwt.decode(signed_jwt)
-        request_url: str = self._url + APIPath.U_DID
-        request: VCRequest = VCRequest(jwt=signed_jwt, nid=self.get_decimal_nid_from_did(jwt.header.kid), status=0)
-        result_response: ResultResponse = HttpUtil.post(request_url, json=dataclasses.asdict(request))
-
-        return Document.deserialize(result_response.result) if result_response.status else None
+    def invalidate_did(self, did: str):
+        """Drop the cached document of the DID so that the next `get_did` resolves it again.
 
+        A document resolved while it is dropped is returned to its callers, but not cached.
+        """
+        with self._did_lock:
+            self._did_generations[did] = self._did_generations.get(did, 0) + 1
+            self._did_cache.invalidate(did)
+        # a resolution in flight may have started before the change
+        self._did_flight.forget(did)
 
-class ServiceResult:
-    def __init__(self, success: bool, result: Any, signed_object: dict = None):
-        self._success: bool = success
-        self._signed_object: dict = signed_object
-        self._result: Any = result
-        self._fail_message: str = str(result) if not success and result else None
-
-    @property
-    def success(self) -> bool:
-        return self._success
-
-    @property
-    def signed_object(self) -> dict:
-        return self._signed_object
-
-    @property
-    def result(self):
-        return self._result
-
-    @property
-    def fail_message(self) -> str:
-        return self._fail_message
-
-    @staticmethod
-    def from_fail_message(message: str) -> "ServiceResult":
-        return ServiceResult(success=False, result=message)
+    def revoke_key(self, signed_jwt: str) -> Optional[Document]:
+        request_url: str = self._url + APIPath.U_DID
+        request: VCRequest = self._update_did_request(signed_jwt, status=0)
+        result_response: ResultResponse = self._transport.post(request_url, content=VOCodec.encode(request))
+        self._invalidate_did_of_jwt(signed_jwt)
 
-    @staticmethod
-    def from_result(result: ResultResponse) -> "ServiceResult":
-        return ServiceResult(success=result.status, result=result.result)
+        return self._to_document(result_response)
 
-    @staticmethod
-    def from_signed_object(signed_object: SignResult) -> "ServiceResult":
-        return ServiceResult(
-            success=signed_object.success, signed_object=signed_object.result, result=signed_object.fail_message
-        )
+    def ship_log(self, path: str, record: Any) -> bool:
+        """Queue the log record for the IV WAS. It is posted by the `LogShipper` in the background.
 
-    @staticmethod
-    def from_verify_result(verify_result: VerifyResult) -> "ServiceResult":
-        return ServiceResult(
-            success=verify_result.success, result=None if verify_result.success else verify_result.fail_message
-        )
+        :param path: the log API path, e.g. `APIPath.ISS_VP_LOG`
+        :param record: the log record, a dataclass or a dict
+        :return: False if the record is dropped
+        """
+        return self._log_shipper.ship(path, record)
@@ -0,0 +1,180 @@
+import asyncio
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.wallet.wallet import KeyWallet
+from loguru import logger
+
+from myid.config import settings
+from myid.utils.bounded_pipeline import aiter_items, run_bounded
+from myid.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from myid.credential_service import CredentialService
+
+
+@dataclass
+class RegistrationOutcome:
+    """The outcome of registering one signed JWT."""
+
+    signed_jwt: str
+    success: bool
+    tx_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkRegistration:
+    """Registers a stream of signed credential info JWTs with chunked `registerList` transactions.
+
+    The JWTs are packed into chunks bounded by count and by size, and a chunk whose step limit is over
+    `max_chunk_step` is split in halves before it is sent, so it does not fail as a whole. Up to `max_in_flight`
+    chunks are submitted and awaited concurrently, and the input is only consumed as fast as chunks complete.
+    A chunk that fails to be sent or confirmed is retried, unless a transaction sent for it before has landed since.
+    A chunk rejected by the score is split in halves until the offending JWTs are isolated, so one bad JWT does not
+    fail the others.
+    """
+
+    def __init__(
+        self,
+        credential_service: "CredentialService",
+        wallet: KeyWallet,
+        max_chunk_size: int = None,
+        max_chunk_bytes: int = None,
+        max_chunk_step: int = None,
+        max_in_flight: int = None,
+        max_retries: int = None,
+    ):
+        """Create the pipeline. Omitted arguments fall back to `MyIdSettings`.
+
+        :param credential_service: the service that sends the transactions
+        :param wallet: the wallet for transaction
+        :param max_chunk_size: the maximum number of JWTs in a transaction
+        :param max_chunk_bytes: the maximum total length of the JWTs in a transaction
+        :param max_chunk_step: the maximum step limit of a transaction, as estimated by the service
+        :param max_in_flight: the maximum number of transactions being sent or confirmed at the same time
+        :param max_retries: the number of retries for a chunk that could not be sent or confirmed
+        """
+        self._credential_service: "CredentialService" = credential_service
+        self._wallet: KeyWallet = wallet
+        self._max_chunk_size: int = max_chunk_size or settings.MYIDSDK_BULK_CHUNK_SIZE
+        self._max_chunk_bytes: int = max_chunk_bytes or settings.MYIDSDK_BULK_CHUNK_BYTES
+        self._max_chunk_step: int = max_chunk_step or settings.MYIDSDK_BULK_CHUNK_STEP_LIMIT
+        self._max_in_flight: int = max_in_flight or settings.MYIDSDK_BULK_MAX_IN_FLIGHT
+        self._max_retries: int = settings.MYIDSDK_BULK_MAX_RETRIES if max_retries is None else max_retries
+
+    async def _chunks(
+        self, signed_jwts: Union[Iterable[str], AsyncIterable[str]], outcomes: List[Optional[RegistrationOutcome]]
+    ) -> AsyncIterator[List[Tuple[int, str]]]:
+        """Pack the JWTs into chunks of (input index, JWT). A JWT without signature gets its failed outcome here."""
+        chunk: List[Tuple[int, str]] = []
+        chunk_bytes: int = 0
+        async for signed_jwt in aiter_items(signed_jwts):
+            index: int = len(outcomes)
+            outcomes.append(None)
+            parts: List[str] = signed_jwt.split(".")
+            if len(parts) != 3 or not parts[2]:
+                outcomes[index] = RegistrationOutcome(
+                    signed_jwt, success=False, error="JWT string must contain signature to send a transaction."
+                )
+                continue
+
+            if chunk and (len(chunk) >= self._max_chunk_size or chunk_bytes + len(signed_jwt) > self._max_chunk_bytes):
+                async for capped in self._step_capped(chunk):
+                    yield capped
+                chunk, chunk_bytes = [], 0
+            chunk.append((index, signed_jwt))
+            chunk_bytes += len(signed_jwt) + 1
+
+        if chunk:
+            async for capped in self._step_capped(chunk):
+                yield capped
+
+    async def _landed_result(self, tx_hashes: List[str]) -> Optional[dict]:
+        """Look up the transactions already sent for a chunk, e.g. one that was not confirmed within the timeout.
+
+        :return: the result of the first one that landed, or None if none did
+        """
+        for tx_hash in tx_hashes:
+            tx_result: Optional[dict] = await self._credential_service.lookup_transaction_result(tx_hash)
+            if tx_result is not None:
+                return tx_result
+        return None
+
+    async def _register_chunk(self, chunk: List[Tuple[int, str]], outcomes: List[Optional[RegistrationOutcome]]):
+        error: Optional[str] = None
+        # the transactions sent for the chunk. One that landed after its timeout is used instead of sending it again.
+        tx_hashes: List[str] = []
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                metrics.inc("myid_retries_total", operation="register_credential_list")
+            try:
+                tx_result: Optional[dict] = await self._landed_result(tx_hashes)
+                if tx_result is None:
+                    tx_result = await self._credential_service.register_credential_list(
+                        self._wallet, [signed_jwt for _, signed_jwt in chunk], sent=tx_hashes.append
+                    )
+            except (Exception, IconServiceBaseException) as e:
+                error = str(e)
+                logger.debug(f"registerList of {len(chunk)} JWTs failed (attempt {attempt + 1}): {error}")
+                continue
+
+            if tx_result.get("status") == 1:
+                for index, signed_jwt in chunk:
+                    outcomes[index] = RegistrationOutcome(signed_jwt, success=True, tx_hash=tx_result.get("txHash"))
+                return
+
+            error = str(tx_result.get("failure", tx_result))
+            if len(chunk) > 1:
+                middle: int = len(chunk) // 2
+                await asyncio.gather(
+                    self._register_chunk(chunk[:middle], outcomes), self._register_chunk(chunk[middle:], outcomes)
+                )
+                return
+            break
+
+        for index, signed_jwt in chunk:
+            outcomes[index] = RegistrationOutcome(signed_jwt, success=False, error=error)
+
+    async def _step_capped(self, chunk: List[Tuple[int, str]]) -> AsyncIterator[List[Tuple[int, str]]]:
+        """Split the chunk in halves until the step limit of each part is within `max_chunk_step`.
+
+        A single JWT over the limit is yielded alone, so only its own transaction fails.
+        """
+        if len(chunk) > 1:
+            step_limit: int = await self._credential_service.get_step_limit(
+                self._wallet, [signed_jwt for _, signed_jwt in chunk]
+            )
+            if step_limit > self._max_chunk_step:
+                middle: int = len(chunk) // 2
+                async for capped in self._step_capped(chunk[:middle]):
+                    yield capped
+                async for capped in self._step_capped(chunk[middle:]):
+                    yield capped
+                return
+
+        yield chunk
+
+    async def run(self, signed_jwts: Union[Iterable[str], AsyncIterable[str]]) -> List[RegistrationOutcome]:
+        """Register the JWTs.
+
+        :param signed_jwts: the signed JWTs returned by `CredentialInfoScoreParameter`, as an iterable or async iterable
+        :return: an outcome per JWT, in input order
+        """
+        outcomes: List[Optional[RegistrationOutcome]] = []
+
+        async def register(chunk: List[Tuple[int, str]]):
+            await self._register_chunk(chunk, outcomes)
+
+        await run_bounded(self._chunks(signed_jwts, outcomes), register, self._max_in_flight)
+
+        return outcomes
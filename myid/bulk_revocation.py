@@ -0,0 +1,125 @@
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.wallet.wallet import KeyWallet
+from loguru import logger
+
+from myid.config import settings
+from myid.core.property_name import PropertyName
+from myid.utils.bounded_pipeline import aiter_items, run_bounded
+from myid.utils.jwt_util import JwtUtil
+from myid.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from myid.credential_service import CredentialService
+
+
+@dataclass
+class RevocationOutcome:
+    """The outcome of revoking one credential."""
+
+    signature: Optional[str]
+    success: bool
+    tx_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkRevocation:
+    """Revokes a stream of signed revocation JWTs with pipelined `revoke` transactions.
+
+    The score revokes one credential per transaction, so the JWTs are not chunked: up to `max_in_flight` transactions
+    are sent and awaited concurrently, their results are polled together by the poller of the service, and the input
+    is only consumed as fast as transactions complete. A transaction that fails to be sent or confirmed is retried;
+    one rejected by the score is not.
+    """
+
+    def __init__(
+        self,
+        credential_service: "CredentialService",
+        wallet: KeyWallet,
+        max_in_flight: int = None,
+        max_retries: int = None,
+    ):
+        """Create the pipeline. Omitted arguments fall back to `MyIdSettings`.
+
+        :param credential_service: the service that sends the transactions
+        :param wallet: the wallet for transaction
+        :param max_in_flight: the maximum number of transactions being sent or confirmed at the same time
+        :param max_retries: the number of retries for a transaction that could not be sent or confirmed
+        """
+        self._credential_service: "CredentialService" = credential_service
+        self._wallet: KeyWallet = wallet
+        self._max_in_flight: int = max_in_flight or settings.MYIDSDK_BULK_REVOKE_MAX_IN_FLIGHT
+        self._max_retries: int = settings.MYIDSDK_BULK_MAX_RETRIES if max_retries is None else max_retries
+
+    async def _revoke(self, signed_jwt: str) -> RevocationOutcome:
+        try:
+            signature: Optional[str] = JwtUtil.decode_payload(signed_jwt).get(PropertyName.CREDENTIAL_INFO_SIGNATURE)
+        except Exception:
+            signature = None
+        if not JwtUtil.get_signature(signed_jwt):
+            return RevocationOutcome(
+                signature, success=False, error="JWT string must contain signature to send a transaction."
+            )
+
+        error: Optional[str] = None
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                metrics.inc("myid_retries_total", operation="revoke")
+            try:
+                tx_result: dict = await self._credential_service.revoke(self._wallet, signed_jwt)
+            except (Exception, IconServiceBaseException) as e:
+                error = str(e)
+                logger.debug(f"revoke of {signature} failed (attempt {attempt + 1}): {error}")
+                continue
+
+            if tx_result.get("status") == 1:
+                return RevocationOutcome(signature, success=True, tx_hash=tx_result.get("txHash"))
+            return RevocationOutcome(
+                signature,
+                success=False,
+                tx_hash=tx_result.get("txHash"),
+                error=str(tx_result.get("failure", tx_result)),
+            )
+
+        return RevocationOutcome(signature, success=False, error=error)
+
+    async def run(
+        self,
+        signed_jwts: Union[Iterable[str], AsyncIterable[str]],
+        progress: Callable[[RevocationOutcome], None] = None,
+    ) -> List[RevocationOutcome]:
+        """Revoke the credentials.
+
+        :param signed_jwts: the signed JWTs returned by `RevokeCredentialInfoScoreParameter`, as an iterable or
+            async iterable
+        :param progress: called with each outcome as soon as it is known, e.g. to report the progress
+        :return: an outcome per JWT, in input order
+        """
+        outcomes: List[Optional[RevocationOutcome]] = []
+
+        async def indexed() -> AsyncIterator[Tuple[int, str]]:
+            async for signed_jwt in aiter_items(signed_jwts):
+                outcomes.append(None)
+                yield len(outcomes) - 1, signed_jwt
+
+        async def revoke(item: Tuple[int, str]):
+            index, signed_jwt = item
+            outcomes[index] = await self._revoke(signed_jwt)
+            if progress:
+                progress(outcomes[index])
+
+        await run_bounded(indexed(), revoke, self._max_in_flight)
+
+        return outcomes
@@ -1,14 +1,104 @@
-from typing import Union
+from typing import Optional, Union
 
 from pydantic import BaseSettings
 
 
 class MyIdSettings(BaseSettings):
     MYIDSDK_PROJECT_NAME: str = "myid-sdk"
-    MYIDSDK_TX_RETRY_COUNT: int = 5
     MYIDSDK_TX_SLEEP_TIME: Union[int, float] = 1
+    MYIDSDK_TX_MAX_SLEEP_TIME: Union[int, float] = 8
+    MYIDSDK_TX_BACKOFF_FACTOR: float = 1.5
+    MYIDSDK_TX_EXECUTOR_WORKERS: int = 8
+
+    # JSON-RPC batch requests of `get_many`/`is_valid_many`
+    MYIDSDK_RPC_BATCH_SIZE: int = 100
+    MYIDSDK_RPC_BATCH_CONCURRENCY: int = 4
+
+    # `metrics` registry of the latencies, retries and cache hits. It records nothing when disabled.
+    MYIDSDK_METRICS_ENABLED: bool = False
+
+    # coalescing of the concurrent identical lookups (`get_did`, `get_vc`, `get`/`is_valid`) into one backend call
+    MYIDSDK_SINGLE_FLIGHT: bool = True
+
+    # JSON encoding of the request VOs. orjson is used if it is installed and this is on.
+    MYIDSDK_USE_ORJSON: bool = True
+
+    # step limit estimation of transactions
+    MYIDSDK_STEP_ESTIMATION: bool = True
+    MYIDSDK_STEP_MARGIN: float = 1.2
+    MYIDSDK_STEP_CACHE_TTL: int = 3_600
+    MYIDSDK_STEP_CACHE_NEGATIVE_TTL: int = 60
+
+    # `BulkRegistration` chunking and pipelining
+    MYIDSDK_BULK_CHUNK_SIZE: int = 100
+    MYIDSDK_BULK_CHUNK_BYTES: int = 200_000
+    # the maximum estimated step of a chunk. Keep it below the maximum step limit of a transaction on the network.
+    MYIDSDK_BULK_CHUNK_STEP_LIMIT: int = 1_000_000_000
+    MYIDSDK_BULK_MAX_IN_FLIGHT: int = 4
+    MYIDSDK_BULK_MAX_RETRIES: int = 2
+    # `BulkRevocation` sends one `revoke` transaction per credential, so more of them are in flight
+    MYIDSDK_BULK_REVOKE_MAX_IN_FLIGHT: int = 64
     MYIDSDK_LOG_ENABLE_LOGGER: bool = False
 
+    # credential status cache of `CredentialService`. The size of 0 disables it.
+    # The TTL bounds how long a status changed by another process can be read stale.
+    MYIDSDK_STATUS_CACHE_SIZE: int = 0
+    MYIDSDK_STATUS_CACHE_TTL: Union[int, float] = 5
+    MYIDSDK_STATUS_WATCH_INTERVAL: Union[int, float] = 2
+
+    # `CredentialMirror`, the local copy of the credentialInfo score. `CredentialService` answers from it while it lags
+    # at most `MYIDSDK_MIRROR_MAX_LAG` blocks.
+    MYIDSDK_MIRROR_MAX_LAG: int = 2
+    MYIDSDK_MIRROR_BLOCK_TIME: Union[int, float] = 2
+    MYIDSDK_MIRROR_SYNC_BLOCKS: int = 500
+    MYIDSDK_MIRROR_SYNC_INTERVAL: Union[int, float] = 1
+
+    # HTTP transport for the IV WAS
+    MYIDSDK_HTTP_POOL_CONNECTIONS: int = 10
+    MYIDSDK_HTTP_POOL_MAXSIZE: int = 10
+    MYIDSDK_HTTP_CONNECT_TIMEOUT: Union[int, float] = 3.05
+    MYIDSDK_HTTP_READ_TIMEOUT: Union[int, float] = 10
+    MYIDSDK_HTTP_RETRY_COUNT: int = 3
+    MYIDSDK_HTTP_RETRY_BACKOFF_FACTOR: float = 0.1
+    # pool of IV WAS endpoints, when a service is created with several of them
+    MYIDSDK_WAS_BREAKER_FAILURES: int = 5
+    MYIDSDK_WAS_BREAKER_OPEN_SECONDS: Union[int, float] = 10
+    MYIDSDK_WAS_HEDGE: bool = False
+    MYIDSDK_WAS_HEDGE_PERCENTILE: float = 95
+
+    # DID document cache. The size of 0 disables it.
+    MYIDSDK_DID_CACHE_SIZE: int = 1024
+    MYIDSDK_DID_CACHE_TTL: Union[int, float] = 60
+    MYIDSDK_DID_CACHE_NEGATIVE_TTL: Union[int, float] = 5
+    # verification contexts (parsed public key and revocation) per issuer DID and key id
+    MYIDSDK_VERIFICATION_CONTEXT_CACHE_SIZE: int = 1024
+
+    # ECDH keys of the sessions. They are shared through a SQLite file if the path is set. The private keys are stored
+    # unencrypted, so the path must be private to the service.
+    MYIDSDK_ECDH_KEY_STORE_SIZE: int = 10_000
+    MYIDSDK_ECDH_KEY_TTL: Union[int, float] = 3_600
+    MYIDSDK_ECDH_KEY_STORE_PATH: Optional[str] = None
+
+    # the maximum number of concurrent WAS calls made by `verify_presentations`, `sign_encrypt_credentials` and
+    # `revoke_vcs_with_signatures`
+    MYIDSDK_VERIFY_CONCURRENCY: int = 16
+    MYIDSDK_ISSUE_CONCURRENCY: int = 16
+    MYIDSDK_REVOKE_CONCURRENCY: int = 16
+
+    # `LogShipper` of the IV WAS logs
+    MYIDSDK_LOG_SHIP_QUEUE_SIZE: int = 10_000
+    MYIDSDK_LOG_SHIP_BATCH_SIZE: int = 50
+    MYIDSDK_LOG_SHIP_FLUSH_INTERVAL: Union[int, float] = 1
+    MYIDSDK_LOG_SHIP_BLOCK_WHEN_FULL: bool = False
+    MYIDSDK_LOG_SHIP_BLOCK_TIMEOUT: Union[int, float] = 1
+    # the thread stops after this idle time, so a shipper that is not closed does not keep it
+    MYIDSDK_LOG_SHIP_IDLE_TIMEOUT: Union[int, float] = 10
+    MYIDSDK_LOG_SHIP_VERIFIED_PRESENTATION: bool = False
+
+    # `CryptoEngine` workers. The executor's default is used if the workers are not set.
+    MYIDSDK_CRYPTO_WORKERS: Optional[int] = None
+    MYIDSDK_CRYPTO_USE_PROCESSES: bool = False
+
     class Config:
         case_sensitive = True
 
@@ -4,6 +4,19 @@ from myid.core.property_name import PropertyName
 class CredentialInfo:
     """Represents a credential info"""
 
+    __slots__ = (
+        "_type",
+        "_issuer_did",
+        "_holder_did",
+        "_signature",
+        "_is_revoke",
+        "_creation_block",
+        "_revocation_block",
+        "_issue_date",
+        "_revoke_date",
+        "_expiry_date",
+    )
+
     def __init__(
         self,
         type_: str,
@@ -91,28 +104,19 @@ class CredentialInfo:
 
     @staticmethod
     def from_json(data: dict) -> "CredentialInfo":
-        parameters = {
-            "type_": PropertyName.CREDENTIAL_INFO_TYPE_COMMON,
-            "issuer_did": data["issuerDid"],
-            "signature": data["sig"],
-        }
-
-        if data.get("holderDid"):
-            parameters["holder_did"] = data["holderDid"]
-        if data.get("issueDate"):
-            parameters["issue_date"] = data["issueDate"]
-        if data.get("isRevoke"):
-            parameters["is_revoke"] = data["isRevoke"]
-        if data.get("revokeDate"):
-            parameters["revoke_date"] = data["revokeDate"]
-        if data.get("expiryDate"):
-            parameters["expiry_date"] = data["expiryDate"]
-        if data.get("created"):
-            parameters["creation_block"] = data["created"]
-        if data.get("revoked"):
-            parameters["revocation_block"] = data["revoked"]
-
-        return CredentialInfo(**parameters)
+        # the validation of `__init__` does not apply to the COMMON type, so the slots are filled directly.
+        credential_info: CredentialInfo = CredentialInfo.__new__(CredentialInfo)
+        credential_info._type = PropertyName.CREDENTIAL_INFO_TYPE_COMMON
+        credential_info._issuer_did = data["issuerDid"]
+        credential_info._signature = data["sig"]
+        credential_info._holder_did = data.get("holderDid") or None
+        credential_info._is_revoke = data.get("isRevoke") or False
+        credential_info._issue_date = data.get("issueDate") or None
+        credential_info._revoke_date = data.get("revokeDate") or None
+        credential_info._expiry_date = data.get("expiryDate") or None
+        credential_info._creation_block = data.get("created") or None
+        credential_info._revocation_block = data.get("revoked") or None
+        return credential_info
 
     def to_json(self) -> dict:
         return {
@@ -0,0 +1,118 @@
+import sys
+from array import array
+from typing import Iterable, Iterator, List, Optional
+
+from myid.core.property_name import PropertyName
+from myid.credential.credential_info import CredentialInfo
+
+
+def _intern(did: Optional[str]) -> Optional[str]:
+    return sys.intern(did) if did else None
+
+
+class CredentialInfoBatch:
+    """A columnar container of many credential infos.
+
+    The dates and block heights are kept in `array`s (0 for none) and the DIDs are interned, so a snapshot of millions
+    of credentials does not need a Python object per row. The filters scan the columns and return a new batch;
+    a `CredentialInfo` is only materialized when a row is read.
+    """
+
+    def __init__(self):
+        self._issuer_dids: List[str] = []
+        self._holder_dids: List[Optional[str]] = []
+        self._signatures: List[str] = []
+        self._is_revokes: array = array("b")
+        self._issue_dates: array = array("q")
+        self._revoke_dates: array = array("q")
+        self._expiry_dates: array = array("q")
+        self._creation_blocks: array = array("q")
+        self._revocation_blocks: array = array("q")
+
+    def __getitem__(self, index: int) -> CredentialInfo:
+        return CredentialInfo(
+            type_=PropertyName.CREDENTIAL_INFO_TYPE_COMMON,
+            issuer_did=self._issuer_dids[index],
+            holder_did=self._holder_dids[index],
+            signature=self._signatures[index],
+            is_revoke=bool(self._is_revokes[index]),
+            issue_date=self._issue_dates[index] or None,
+            revoke_date=self._revoke_dates[index] or None,
+            expiry_date=self._expiry_dates[index] or None,
+            creation_block=self._creation_blocks[index] or None,
+            revocation_block=self._revocation_blocks[index] or None,
+        )
+
+    def __iter__(self) -> Iterator[CredentialInfo]:
+        return (self[index] for index in range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def _take(self, indices: Iterable[int]) -> "CredentialInfoBatch":
+        indices = list(indices)
+        batch: CredentialInfoBatch = CredentialInfoBatch()
+        batch._issuer_dids = [self._issuer_dids[index] for index in indices]
+        batch._holder_dids = [self._holder_dids[index] for index in indices]
+        batch._signatures = [self._signatures[index] for index in indices]
+        batch._is_revokes = array("b", [self._is_revokes[index] for index in indices])
+        batch._issue_dates = array("q", [self._issue_dates[index] for index in indices])
+        batch._revoke_dates = array("q", [self._revoke_dates[index] for index in indices])
+        batch._expiry_dates = array("q", [self._expiry_dates[index] for index in indices])
+        batch._creation_blocks = array("q", [self._creation_blocks[index] for index in indices])
+        batch._revocation_blocks = array("q", [self._revocation_blocks[index] for index in indices])
+        return batch
+
+    @property
+    def signatures(self) -> List[str]:
+        return self._signatures
+
+    def append_json(self, data: dict):
+        """Append a credential info in the json format of the credentialInfo score.
+
+        :param data: the json of a credential info, see `CredentialInfo.from_json`
+        """
+        self._issuer_dids.append(_intern(data["issuerDid"]))
+        self._holder_dids.append(_intern(data.get("holderDid")))
+        self._signatures.append(data["sig"])
+        self._is_revokes.append(1 if data.get("isRevoke") else 0)
+        self._issue_dates.append(data.get("issueDate") or 0)
+        self._revoke_dates.append(data.get("revokeDate") or 0)
+        self._expiry_dates.append(data.get("expiryDate") or 0)
+        self._creation_blocks.append(data.get("created") or 0)
+        self._revocation_blocks.append(data.get("revoked") or 0)
+
+    def expired_before(self, timestamp: int) -> "CredentialInfoBatch":
+        """The credential infos whose expiry date is before the timestamp.
+
+        :param timestamp: the time in seconds since the epoch
+        """
+        return self._take(index for index, expiry_date in enumerate(self._expiry_dates) if 0 < expiry_date < timestamp)
+
+    @staticmethod
+    def from_json(rows: Iterable[dict]) -> "CredentialInfoBatch":
+        """Load the credential infos column by column.
+
+        :param rows: the jsons of credential infos, see `CredentialInfo.from_json`
+        """
+        rows = rows if isinstance(rows, list) else list(rows)
+        batch: CredentialInfoBatch = CredentialInfoBatch()
+        batch._issuer_dids = [_intern(data["issuerDid"]) for data in rows]
+        batch._holder_dids = [_intern(data.get("holderDid")) for data in rows]
+        batch._signatures = [data["sig"] for data in rows]
+        batch._is_revokes = array("b", [1 if data.get("isRevoke") else 0 for data in rows])
+        batch._issue_dates = array("q", [data.get("issueDate") or 0 for data in rows])
+        batch._revoke_dates = array("q", [data.get("revokeDate") or 0 for data in rows])
+        batch._expiry_dates = array("q", [data.get("expiryDate") or 0 for data in rows])
+        batch._creation_blocks = array("q", [data.get("created") or 0 for data in rows])
+        batch._revocation_blocks = array("q", [data.get("revoked") or 0 for data in rows])
+        return batch
+
+    def issued_by(self, issuer_did: str) -> "CredentialInfoBatch":
+        return self._take(index for index, did in enumerate(self._issuer_dids) if did == issuer_did)
+
+    def revoked(self) -> "CredentialInfoBatch":
+        return self._take(index for index, is_revoke in enumerate(self._is_revokes) if is_revoke)
+
+    def to_json(self) -> List[dict]:
+        return [credential_info.to_json() for credential_info in self]
@@ -0,0 +1,21 @@
+from myid.core.property_name import PropertyName
+
+
+def credential_validity(
+    signature: str, is_revoked: bool, is_issuer_revoked: bool, expiry_date: int, timestamp: int
+) -> dict:
+    """The status json of the `isValid` of the credentialInfo score.
+
+    A credential is valid unless it is revoked, its issuer DID is revoked, or it is expired.
+
+    :param signature: the credential signature
+    :param is_revoked: whether the credential is revoked
+    :param is_issuer_revoked: whether the DID of the issuer is revoked
+    :param expiry_date: the expiry date of the credential, in seconds since the epoch. 0 or None if it does not expire.
+    :param timestamp: the time to check the expiry at, in seconds since the epoch
+    """
+    is_expired: bool = 0 < (expiry_date or 0) < timestamp
+    return {
+        PropertyName.CREDENTIAL_INFO_SIGNATURE: signature,
+        "isValid": not is_revoked and not is_issuer_revoked and not is_expired,
+    }
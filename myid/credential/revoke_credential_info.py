@@ -1,6 +1,8 @@
 class RevokeCredentialInfo:
     """Represents a credential info when revoke the vc"""
 
+    __slots__ = ("_type", "_issuer_did", "_signature", "_revoke_date")
+
     def __init__(self, type_: str, issuer_did: str, signature: str, revoke_date: int):
         """create revoke credential info object
 
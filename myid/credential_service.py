@@ -1,64 +1,258 @@
 import asyncio
+import functools
 import json
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    AsyncIterable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-from didsdk.exceptions import TransactionException
-from didsdk.jwt.jwt import Jwt
 from iconsdk.builder.transaction_builder import Transaction
-from iconsdk.exception import JSONRPCException
 from iconsdk.icon_service import IconService
 from iconsdk.signed_transaction import SignedTransaction
 from iconsdk.wallet.wallet import KeyWallet, Wallet
 from loguru import logger
 
-from myid import settings
+from myid.bulk_registration import BulkRegistration, RegistrationOutcome
+from myid.bulk_revocation import BulkRevocation, RevocationOutcome
+from myid.config import settings
+from myid.core.property_name import PropertyName
+from myid.score.block_follower import BlockFollower, ScoreCall
 from myid.score.credential_info_score import CredentialInfoScore
+from myid.score.credential_mirror import CredentialMirror
+from myid.score.json_rpc_batch import CallResult, JsonRpcBatchClient
+from myid.score.transaction_poller import TransactionPoller
+from myid.service_result import ServiceResult
+from myid.utils.cache import CacheStats, TTLCache
+from myid.utils.jwt_util import JwtUtil
+from myid.utils.metrics import metrics
+from myid.utils.single_flight import SingleFlight, SingleFlightStats
+
+T = TypeVar("T")
+
+# the score methods that change the status returned by `get` and `isValid`
+_STATUS_METHODS = ("register", "registerList", "revoke", "revokeDid", "revokeVCAndDid")
 
 
 class CredentialService:
     """This is the class for credential service that provides management (query, regist, revoke, etc.)."""
 
-    def __init__(self, icon_service: IconService, network_id: int, score_address: str, timeout: int = 15_000):
+    def __init__(
+        self,
+        icon_service: IconService,
+        network_id: int,
+        score_address: str,
+        timeout: int = 15_000,
+        executor: ThreadPoolExecutor = None,
+        status_cache: TTLCache = None,
+        mirror: CredentialMirror = None,
+        mirror_max_lag: int = None,
+    ):
         """Create the instance for using the blockchain.
 
         :param icon_service: the IconService object
         :param network_id: the network ID of the blockchain
         :param score_address: the credentialInfo score address deployed to the blockchain
-        :param timeout: the specified timeout, in milliseconds.
+        :param timeout: the maximum time to wait for a transaction result, in milliseconds.
+        :param executor: the executor running the blocking JSON-RPC calls. A dedicated one is created if omitted,
+            and shut down by `close`; a given one is left to its owner.
+        :param status_cache: the cache of `get` and `is_valid`. If omitted, one is created from
+            `MYIDSDK_STATUS_CACHE_SIZE` and `MYIDSDK_STATUS_CACHE_TTL`, which is disabled by default.
+        :param mirror: the local copy of the score to answer `get` and `is_valid` from. Keep it synced with
+            `sync_mirror`, or by another process sharing its file. The score is called if omitted.
+        :param mirror_max_lag: the maximum blocks the mirror may lag to be used. `MYIDSDK_MIRROR_MAX_LAG` if omitted.
         """
         self._icon_service: IconService = icon_service
-        self._credential_score: CredentialInfoScore = CredentialInfoScore(self._icon_service, network_id, score_address)
+        self._score_address: str = score_address
+        # shared by the bulk reads and the transaction poller, and closed by the score
+        batch_client: Optional[JsonRpcBatchClient] = JsonRpcBatchClient.from_icon_service(self._icon_service)
+        self._credential_score: CredentialInfoScore = CredentialInfoScore(
+            self._icon_service, network_id, score_address, batch_client=batch_client
+        )
         self._timeout: int = timeout
+        self._owns_executor: bool = executor is None
+        self._executor: ThreadPoolExecutor = (
+            executor
+            if executor
+            else ThreadPoolExecutor(max_workers=settings.MYIDSDK_TX_EXECUTOR_WORKERS, thread_name_prefix="myid-tx")
+        )
+        self._transaction_poller: TransactionPoller = TransactionPoller(
+            self._icon_service, executor=self._executor, batch_client=batch_client
+        )
+        self._status_cache: TTLCache = (
+            status_cache
+            if status_cache is not None
+            else TTLCache(
+                max_size=settings.MYIDSDK_STATUS_CACHE_SIZE,
+                ttl=settings.MYIDSDK_STATUS_CACHE_TTL,
+                name="credential_status",
+            )
+        )
+        self._status_flight: SingleFlight = SingleFlight(name="credential_status")
+        # bumped on every invalidation, so a status read before it is not cached after it
+        self._status_generation: int = 0
+        self._status_lock: threading.Lock = threading.Lock()
+        self._mirror: Optional[CredentialMirror] = mirror
+        self._mirror_max_lag: int = settings.MYIDSDK_MIRROR_MAX_LAG if mirror_max_lag is None else mirror_max_lag
+
+    @property
+    def status_cache_stats(self) -> CacheStats:
+        """The hit/miss counters of the credential status cache."""
+        return self._status_cache.stats
+
+    @property
+    def status_flight_stats(self) -> SingleFlightStats:
+        """The calls and score calls of `get` and `is_valid`, coalesced when a status is asked concurrently."""
+        return self._status_flight.stats
+
+    def _cached_status(self, method: str, signature: str, call: Callable[[str], str]) -> dict:
+        """Get the status of the credential from the mirror or the status cache, or from the score on a miss.
+
+        :param method: the score method, which is a part of the cache key
+        :param signature: the credential signature
+        :param call: the score call returning the status json string
+        :return: a shallow copy of the status, so callers can not alter the cached one
+        """
+        key: Tuple[str, str] = (method, signature)
+        status: Optional[dict] = self._mirrored_status(method, signature)
+        if status is None:
+            status = self._status_cache.get(key)
+        if status is None:
+            status = self._status_flight.do(key, self._fetch_status, key, call)
+
+        return dict(status)
+
+    def _cached_status_many(
+        self, method: str, signatures: List[str], call_many: Callable[[List[str]], List[CallResult]]
+    ) -> List[ServiceResult]:
+        """Get the status of many credentials, from the mirror or the status cache, or from the score in batch calls.
+
+        :param method: the score method, which is a part of the cache key
+        :param signatures: the credential signatures
+        :param call_many: the bulk score call returning a status json string per signature
+        :return: a result per signature, in input order. A failed one has the error in `fail_message`.
+        """
+        results: List[Optional[ServiceResult]] = []
+        missed: List[int] = []
+        for index, signature in enumerate(signatures):
+            if not signature:
+                results.append(ServiceResult.from_fail_message("signature cannot be None."))
+                continue
+
+            status: Optional[dict] = self._mirrored_status(method, signature)
+            if status is None:
+                status = self._status_cache.get((method, signature))
+            results.append(None if status is None else ServiceResult(success=True, result=dict(status)))
+            if status is None:
+                missed.append(index)
+
+        generation: int = self._status_generation
+        call_results: List[CallResult] = call_many([signatures[index] for index in missed]) if missed else []
+        for index, call_result in zip(missed, call_results):
+            if not call_result.success:
+                results[index] = ServiceResult.from_fail_message(call_result.error)
+                continue
 
+            try:
+                status = json.loads(call_result.result)
+            except (TypeError, ValueError) as e:
+                results[index] = ServiceResult.from_fail_message(f"Invalid status: {e}")
+                continue
+
+            self._put_status((method, signatures[index]), status, generation)
+            results[index] = ServiceResult(success=True, result=dict(status))
+
+        return results
+
+    @metrics.timed("myid_status_read_seconds")
+    def _fetch_status(self, key: Tuple[str, str], call: Callable[[str], str]) -> dict:
+        generation: int = self._status_generation
+        status: dict = json.loads(call(key[1]))
+        self._put_status(key, status, generation)
+        return status
+
+    @metrics.timed("myid_transaction_seconds", stage="confirm")
     async def _get_transaction_result(self, tx_hash: str) -> dict:
         """Get the transaction result that matches the hash of transaction.
 
-        This method calls `iconsdk.icon_service.IconService.get_transaction_result` every 1 second
-        until the transaction is confirmed.
+        The hash is handed to the `TransactionPoller` of this service, which polls every outstanding transaction
+        together until its result is confirmed.
 
-        :param tx_hash:
-        :return:
+        :param tx_hash: the hash of transaction
+        :return: the result of transaction
+        :raise TransactionException: if the result is not confirmed within the timeout of this service
         """
-        response = None
-        retry_times = settings.MYIDSDK_TX_RETRY_COUNT
-        while response is None and retry_times > 0:
-            try:
-                tx_result = self._icon_service.get_transaction_result(tx_hash)
-                if not tx_result:
-                    raise JSONRPCException("transaction result is None.")
-            except JSONRPCException as e:
-                logger.debug(f"{e}")
-
-                if retry_times == 0:
-                    raise TransactionException(e)
+        return await self._transaction_poller.wait(tx_hash, timeout=self._timeout / 1_000)
 
-                retry_times -= 1
-                logger.debug(f"Remain to retry request for getting transaction result: {retry_times}")
-
-                await asyncio.sleep(settings.MYIDSDK_TX_SLEEP_TIME)
-                continue
+    def _invalidate_status(self, method: str, signed_jwt_list: List[str]):
+        """Invalidate the cached status of the credentials that a score call changes.
 
-            return tx_result
+        :param method: the name of score function
+        :param signed_jwt_list: the JWTs passed to the score function
+        """
+        if method not in _STATUS_METHODS:
+            return
+
+        if method == "revokeDid":
+            # every credential of the issuer is affected, which is not known from the JWT.
+            with self._status_lock:
+                self._status_generation += 1
+                self._status_cache.clear()
+            self._status_flight.forget_all()
+            return
+
+        for signed_jwt in signed_jwt_list:
+            self.invalidate_status(JwtUtil.decode_payload(signed_jwt).get(PropertyName.CREDENTIAL_INFO_SIGNATURE))
+
+    def _invalidate_status_of_calls(self, calls: List[ScoreCall]):
+        """Invalidate the cached status of the credentials changed by the calls read from the blocks."""
+        for call in calls:
+            jwts: str = call.params.get("credentialJwt") or call.params.get("credentialJwtList") or ""
+            self._invalidate_status(call.method, jwts.split(","))
+
+    def _mirrored_status(self, method: str, signature: str) -> Optional[dict]:
+        """Get the status of the credential from the mirror.
+
+        :return: the status, or None if there is no mirror, it lags more than `mirror_max_lag` blocks,
+            or it does not have the credential, which may be registered in the blocks it has not replayed yet
+        """
+        if self._mirror is None:
+            return None
+
+        lag: Optional[int] = self._mirror.lag
+        status: Optional[dict] = None
+        if lag is not None and lag <= self._mirror_max_lag:
+            status = self._mirror.get(signature) if method == "get" else self._mirror.is_valid(signature)
+            result: str = "miss" if status is None else "hit"
+        else:
+            result = "stale"
+        if metrics.enabled:
+            metrics.inc("myid_mirror_reads_total", result=result)
+        return status
+
+    def _put_status(self, key: Tuple[str, str], status: dict, generation: int):
+        """Cache the status read from the score, unless a status was invalidated since the read started.
+
+        :param key: the cache key of the status
+        :param status: the status read from the score
+        :param generation: `_status_generation` when the read started
+        """
+        with self._status_lock:
+            if generation == self._status_generation:
+                self._status_cache.put(key, status)
+
+    async def _run_blocking(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call the blocking function (signing, JSON-RPC) on the executor of this service."""
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
 
     async def _send_jwt(self, wallet: KeyWallet, signed_jwt: str, method: str) -> dict:
         """Sends a transaction with a json web token string.
@@ -68,34 +262,36 @@ class CredentialService:
         :param method: the name of score function
         :return: the TransactionResult object
         """
-        if not Jwt.decode(signed_jwt).signature:
+        if not JwtUtil.get_signature(signed_jwt):
             raise Exception("JWT string must contain signature to send a transaction.")
 
-        transaction = self._credential_score.jwt_method(
-            from_address=wallet.get_address(), jwt=signed_jwt, method=method
+        transaction = await self._run_blocking(
+            self._credential_score.jwt_method, from_address=wallet.get_address(), jwt=signed_jwt, method=method
         )
-        tx_hash: str = self._send_transaction(transaction, wallet)
+        return await self._send_status_transaction(transaction, wallet, method, [signed_jwt])
 
-        return await self._get_transaction_result(tx_hash)
-
-    async def _send_jwt_list(self, wallet: KeyWallet, signed_jwt_list: List[str], method: str) -> dict:
+    async def _send_jwt_list(
+        self, wallet: KeyWallet, signed_jwt_list: List[str], method: str, sent: Callable[[str], None] = None
+    ) -> dict:
         """Sends a transaction with a json web token list.
 
         :param wallet: the wallet for transaction
         :param signed_jwt_list: the string list that signed the object returned from `CredentialInfoScoreParameter`.
         :param method: the name of score function
+        :param sent: called with the hash of transaction as soon as it is sent
         :return: the result of transaction
         """
         for jwt in signed_jwt_list:
-            if not Jwt.decode(jwt).signature:
+            if not JwtUtil.get_signature(jwt):
                 raise Exception("JWT string must contain signature to send a transaction.")
 
-        transaction = self._credential_score.jwt_method(
-            from_address=wallet.get_address(), jwt=",".join(signed_jwt_list), method=method
+        transaction = await self._run_blocking(
+            self._credential_score.jwt_method,
+            from_address=wallet.get_address(),
+            jwt=",".join(signed_jwt_list),
+            method=method,
         )
-        tx_hash: str = self._send_transaction(transaction, wallet)
-
-        return await self._get_transaction_result(tx_hash)
+        return await self._send_status_transaction(transaction, wallet, method, signed_jwt_list, sent=sent)
 
     async def _send_reject_history_jwt(self, wallet: KeyWallet, signed_jwt: str, method: str):
         """Sends a transaction with a json web token string about rejection history.
@@ -105,26 +301,74 @@ class CredentialService:
         :param method: the name of score function
         :return: the TransactionResult object
         """
-        if not Jwt.decode(signed_jwt).signature:
+        if not JwtUtil.get_signature(signed_jwt):
             raise Exception("JWT string must contain signature to send a transaction.")
 
-        transaction = self._credential_score.reject_history_jwt_method(
-            from_address=wallet.get_address(), jwt=signed_jwt, method=method
+        transaction = await self._run_blocking(
+            self._credential_score.reject_history_jwt_method,
+            from_address=wallet.get_address(),
+            jwt=signed_jwt,
+            method=method,
         )
-        tx_hash: str = self._send_transaction(transaction, wallet)
+        tx_hash: str = await self._send_transaction(transaction, wallet)
 
         return await self._get_transaction_result(tx_hash)
 
-    def _send_transaction(self, transaction: Transaction, wallet: Wallet) -> str:
+    async def _send_status_transaction(
+        self,
+        transaction: Transaction,
+        wallet: Wallet,
+        method: str,
+        signed_jwt_list: List[str],
+        sent: Callable[[str], None] = None,
+    ) -> dict:
+        """Sends a transaction that may change the status of credentials, and waits for its result.
+
+        The cached status of the credentials is invalidated when the transaction is sent, and once more when it is
+        confirmed, so a status read in between is not kept.
+
+        :param transaction: the Transaction object.
+        :param wallet: the wallet for transaction.
+        :param method: the name of score function
+        :param signed_jwt_list: the JWTs of the transaction
+        :param sent: called with the hash of transaction as soon as it is sent
+        :return: the result of transaction
+        """
+        self._invalidate_status(method, signed_jwt_list)
+        try:
+            tx_hash: str = await self._send_transaction(transaction, wallet)
+            if sent:
+                sent(tx_hash)
+            return await self._get_transaction_result(tx_hash)
+        finally:
+            self._invalidate_status(method, signed_jwt_list)
+
+    async def _send_transaction(self, transaction: Transaction, wallet: Wallet) -> str:
         """Sends a transaction.
 
+        The signing and the JSON-RPC round-trip run on the executor of this service, so the event loop is not blocked.
+
         :param transaction: the Transaction object.
         :param wallet: the wallet for transaction.
         :return: the hash of transaction.
         """
+        return await self._run_blocking(self._sign_and_send_transaction, transaction, wallet)
+
+    @metrics.timed("myid_transaction_seconds", stage="submit")
+    def _sign_and_send_transaction(self, transaction: Transaction, wallet: Wallet) -> str:
         signed_tx = SignedTransaction(transaction, wallet)
         return self._icon_service.send_transaction(signed_tx)
 
+    def close(self):
+        """Stop polling the transactions, and shut down the executor that runs the blocking JSON-RPC calls.
+
+        An executor given to the constructor is not shut down; its owner does it.
+        """
+        self._transaction_poller.close()
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+        self._credential_score.close()
+
     def get(self, signature: str) -> dict:
         """get the Credential info that matches the issuer DID and credential signature.
 
@@ -134,7 +378,47 @@ class CredentialService:
         if not signature:
             raise ValueError("signature cannot be None.")
 
-        return json.loads(self._credential_score.get(signature))
+        return self._cached_status("get", signature, self._credential_score.get)
+
+    def get_many(self, signatures: List[str]) -> List[ServiceResult]:
+        """get the Credential infos that match the credential signatures, with JSON-RPC batch requests.
+
+        :param signatures: the strings that credential signature
+        :return: a result per signature, in input order. The Credential info is the `result` of a successful one.
+        """
+        return self._cached_status_many("get", signatures, self._credential_score.get_many)
+
+    async def get_step_limit(self, wallet: KeyWallet, signed_jwt: List[str], method: str = "registerList") -> int:
+        """Get the step limit of the transaction with a json web token list, without sending it.
+
+        :param wallet: the wallet for transaction
+        :param signed_jwt: the string that signed the object returned by calling `CredentialInfoParam`
+        :param method: the name of score function
+        :return: the step limit, estimated as the transaction would be sent. See `StepEstimator`.
+        """
+        transaction: Transaction = await self._run_blocking(
+            self._credential_score.jwt_method,
+            from_address=wallet.get_address(),
+            jwt=",".join(signed_jwt),
+            method=method,
+        )
+        return transaction.step_limit
+
+    def invalidate_status(self, signature: str):
+        """Drop the cached status of the credential.
+
+        A status read from the score while it is dropped is returned to its callers, but not cached.
+
+        :param signature: the string that credential signature
+        """
+        if signature:
+            with self._status_lock:
+                self._status_generation += 1
+                self._status_cache.invalidate(("get", signature))
+                self._status_cache.invalidate(("isValid", signature))
+            # a lookup in flight may have started before the change
+            self._status_flight.forget(("get", signature))
+            self._status_flight.forget(("isValid", signature))
 
     def is_valid(self, signature: str) -> dict:
         """check validation of the Credential info that matches the issuer DID and credential signature.
@@ -145,7 +429,23 @@ class CredentialService:
         if not signature:
             raise ValueError("signature cannot be None.")
 
-        return json.loads(self._credential_score.is_valid(signature))
+        return self._cached_status("isValid", signature, self._credential_score.is_valid)
+
+    def is_valid_many(self, signatures: List[str]) -> List[ServiceResult]:
+        """check validation of the Credential infos that match the credential signatures, with JSON-RPC batch requests.
+
+        :param signatures: the strings that credential signature
+        :return: a result per signature, in input order. The status json is the `result` of a successful one.
+        """
+        return self._cached_status_many("isValid", signatures, self._credential_score.is_valid_many)
+
+    async def lookup_transaction_result(self, tx_hash: str) -> Optional[dict]:
+        """look up the result of the transaction once, without waiting for it to be confirmed.
+
+        :param tx_hash: the hash of transaction
+        :return: the result of transaction, or None if it is not confirmed yet
+        """
+        return await self._transaction_poller.lookup(tx_hash)
 
     async def register(self, wallet: KeyWallet, signed_jwt: str) -> dict:
         """register the Credential info.
@@ -156,14 +456,38 @@ class CredentialService:
         """
         return await self._send_jwt(wallet, signed_jwt, "register")
 
-    async def register_credential_list(self, wallet: KeyWallet, signed_jwt: List[str]) -> dict:
+    async def register_credential_list(
+        self, wallet: KeyWallet, signed_jwt: List[str], sent: Callable[[str], None] = None
+    ) -> dict:
         """register the Credential info list.
 
         :param wallet: the wallet for transaction
         :param signed_jwt: the string that signed the object returned by calling `CredentialInfoParam`
+        :param sent: called with the hash of transaction as soon as it is sent, e.g. to look up its result with
+            `lookup_transaction_result` if it is not confirmed within the timeout
         :return: the result of transaction
         """
-        return await self._send_jwt_list(wallet, signed_jwt, "registerList")
+        return await self._send_jwt_list(wallet, signed_jwt, "registerList", sent=sent)
+
+    async def register_credential_stream(
+        self,
+        wallet: KeyWallet,
+        signed_jwts: Union[Iterable[str], AsyncIterable[str]],
+        max_chunk_size: int = None,
+        max_in_flight: int = None,
+    ) -> List[RegistrationOutcome]:
+        """register any number of Credential infos with chunked and pipelined `registerList` transactions.
+
+        :param wallet: the wallet for transaction
+        :param signed_jwts: the strings that signed the objects returned by calling `CredentialInfoParam`
+        :param max_chunk_size: the maximum number of JWTs in a transaction. `MYIDSDK_BULK_CHUNK_SIZE` if omitted.
+        :param max_in_flight: the maximum number of unconfirmed transactions. `MYIDSDK_BULK_MAX_IN_FLIGHT` if omitted.
+        :return: an outcome per JWT, in input order. See `BulkRegistration`.
+        """
+        bulk_registration: BulkRegistration = BulkRegistration(
+            self, wallet, max_chunk_size=max_chunk_size, max_in_flight=max_in_flight
+        )
+        return await bulk_registration.run(signed_jwts)
 
     async def revoke(self, wallet: KeyWallet, signed_jwt: str) -> dict:
         """revoke the Credential info.
@@ -174,6 +498,26 @@ class CredentialService:
         """
         return await self._send_jwt(wallet, signed_jwt, "revoke")
 
+    async def revoke_credential_stream(
+        self,
+        wallet: KeyWallet,
+        signed_jwts: Union[Iterable[str], AsyncIterable[str]],
+        max_in_flight: int = None,
+        progress: Callable[[RevocationOutcome], None] = None,
+    ) -> List[RevocationOutcome]:
+        """revoke any number of Credential infos with pipelined `revoke` transactions.
+
+        :param wallet: the wallet for transaction
+        :param signed_jwts: the strings that signed the objects returned by calling `RevokeCredentialInfoParam`,
+            e.g. by `IssuerService.sign_revoke_jwts`
+        :param max_in_flight: the maximum number of unconfirmed transactions. `MYIDSDK_BULK_REVOKE_MAX_IN_FLIGHT`
+            if omitted.
+        :param progress: called with each outcome as soon as it is known, e.g. to report the progress
+        :return: an outcome per JWT, in input order. See `BulkRevocation`.
+        """
+        bulk_revocation: BulkRevocation = BulkRevocation(self, wallet, max_in_flight=max_in_flight)
+        return await bulk_revocation.run(signed_jwts, progress=progress)
+
     async def revoke_did(self, wallet: KeyWallet, signed_jwt: str) -> dict:
         """revoke the DID by Credential info.
 
@@ -192,6 +536,51 @@ class CredentialService:
         """
         return await self._send_jwt(wallet, signed_jwt, "revokeVCAndDid")
 
+    async def sync_mirror(self, interval: Union[int, float] = None):
+        """Keep the mirror synced with the chain, until cancelled.
+
+        New blocks are replayed every `interval` seconds, or at once while the mirror is catching up, and the status
+        of each credential changed in them is dropped from the status cache.
+
+        :param interval: the interval of reading new blocks, in seconds. `MYIDSDK_MIRROR_SYNC_INTERVAL` if omitted.
+        """
+        if self._mirror is None:
+            raise ValueError("This service has no mirror.")
+
+        interval = interval or settings.MYIDSDK_MIRROR_SYNC_INTERVAL
+        while True:
+            catching_up: bool = False
+            try:
+                calls: List[ScoreCall] = await self._run_blocking(self._mirror.sync)
+                catching_up = bool(self._mirror.lag)
+            except Exception as e:
+                logger.warning(f"Failed to sync the mirror after {self._mirror.height}: {e}")
+                calls = []
+
+            self._invalidate_status_of_calls(calls)
+            await asyncio.sleep(0 if catching_up else interval)
+
+    async def watch_credential_status(self, interval: Union[int, float] = None, start_height: int = None):
+        """Invalidate the cached status of the credentials changed by any process, until cancelled.
+
+        New blocks are read every `interval` seconds, and the status of each credential registered or revoked in them
+        is dropped from the status cache. Run it as a task along with a status cache of a longer TTL.
+
+        :param interval: the interval of reading new blocks, in seconds. `MYIDSDK_STATUS_WATCH_INTERVAL` if omitted.
+        :param start_height: the height of the first block to read. The latest block if omitted.
+        """
+        interval = interval or settings.MYIDSDK_STATUS_WATCH_INTERVAL
+        block_follower: BlockFollower = BlockFollower(self._icon_service, self._score_address, start_height)
+        while True:
+            try:
+                calls: List[ScoreCall] = await self._run_blocking(block_follower.poll)
+            except Exception as e:
+                logger.warning(f"Failed to read new blocks after {block_follower.height}: {e}")
+                calls = []
+
+            self._invalidate_status_of_calls(calls)
+            await asyncio.sleep(interval)
+
     async def register_reject_history(self, wallet: KeyWallet, signed_jwt: str) -> dict:
         """register reject by Credential info.
 
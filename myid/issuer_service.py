@@ -1,11 +1,13 @@
-import dataclasses
 import json
 import time
-from typing import List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from didsdk.core.did_key_holder import DidKeyHolder
 from didsdk.core.property_name import PropertyName as DIDPropertyName
 from didsdk.credential import Credential
+from didsdk.exceptions import JweException
+from didsdk.jwe.ecdhkey import ECDHKey
 from didsdk.jwt.elements import Payload
 from didsdk.jwt.jwt import Jwt
 from didsdk.protocol.claim_request import ClaimRequest
@@ -15,14 +17,22 @@ from iconsdk.exception import JSONRPCException
 from jwcrypto.jwe import JWE
 from loguru import logger
 
-from myid.base_service import BaseService, ServiceResult
+from myid.base_service import BaseService
+from myid.bulk_revocation import RevocationOutcome
+from myid.config import settings
 from myid.core.api_path import APIPath
 from myid.core.property_name import PropertyName
 from myid.credential.credential_info import CredentialInfo
 from myid.credential.credential_score_parameter import CredentialInfoScoreParameter
 from myid.credential.revoke_credential_info import RevokeCredentialInfo
 from myid.credential.revoke_score_parameter import RevokeCredentialInfoScoreParameter
-from myid.utils import HttpUtil
+from myid.service_result import ServiceResult
+from myid.utils.crypto_engine import CryptoEngine
+from myid.utils.ecdh_key_store import EcdhKeyStore
+from myid.utils.http_transport import HttpTransport
+from myid.utils.log_shipper import LogShipper
+from myid.utils.single_flight import SingleFlight, SingleFlightStats
+from myid.vo.codec import VOCodec
 from myid.vo.issued_register_request import IssuedRegRequest
 from myid.vo.result_response import ResultResponse
 from myid.vo.vc_request import VCRequest
@@ -31,17 +41,151 @@ from myid.vo.vc_request import VCRequest
 class IssuerService(BaseService):
     """This class is implemented some methods for Issuer."""
 
-    def __init__(self, url: str):
-        super().__init__(url=url)
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: HttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ):
+        super().__init__(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+        self._vc_flight: SingleFlight = SingleFlight(name="vc")
+
+    @property
+    def vc_flight_stats(self) -> SingleFlightStats:
+        """The calls and backend executions of `get_vc`, coalesced when the same VC is looked up concurrently."""
+        return self._vc_flight.stats
+
+    def _fetch_vc(self, issuer_did: str, signature: str) -> Optional[CredentialInfo]:
+        request: VCRequest = VCRequest(nid=self.get_decimal_nid_from_did(issuer_did), sig=signature)
+        request_url: str = self._url + APIPath.GET_VC + request.to_query_param()
+        result_response: ResultResponse = self._transport.get(request_url)
+
+        logger.debug(f"get_vc request: {request_url}")
+        logger.debug(f"get_vc result: {result_response}")
+        if result_response.status:
+            return CredentialInfo.from_json(result_response.result)
+        else:
+            raise JSONRPCException(result_response.result)
+
+    def _issue_credential_isolated(
+        self, protocol_message: ProtocolMessage, issuer_key_holder: DidKeyHolder, kid: str
+    ) -> ServiceResult:
+        """Sign, encrypt and register a credential. An error is returned as the failed result of the message."""
+        try:
+            sign_result: SignResult = self._sign_encrypt(
+                protocol_message, issuer_key_holder, self._required_ecdh_key(kid)
+            )
+            if not sign_result.success:
+                return ServiceResult.from_signed_object(sign_result)
+
+            credential: Credential = Credential.from_jwt(json.loads(protocol_message.message))
+            return self._issued_result(sign_result, self.register_vc(credential, issuer_key_holder))
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    def _issued_register_request(self, credential: Credential) -> IssuedRegRequest:
+        payload: Payload = credential.jwt.payload
+        types: List[str] = credential.vc.type
+        types.remove(DIDPropertyName.JL_TYPE_VERIFIABLE_CREDENTIAL)
+        return IssuedRegRequest(
+            vcSig=credential.jwt.signature,
+            vcType=[types[0]] if len(types) > 0 else None,
+            issuerDid=payload.iss,
+            holderDid=payload.sub,
+            issueDate=payload.iat,
+            expiryDate=payload.exp,
+        )
+
+    @staticmethod
+    def _issued_result(sign_result: SignResult, register_result: ServiceResult) -> ServiceResult:
+        """The result of an issuance. A failed registration keeps the signed object, so it can be registered later."""
+        if not register_result.success:
+            return ServiceResult(success=False, result=register_result.result, signed_object=sign_result.result)
+
+        return ServiceResult.from_signed_object(sign_result)
+
+    def _register_vc_request(self, credential: Credential, issuer_key_holder: DidKeyHolder) -> VCRequest:
+        credential_info: CredentialInfo = CredentialInfo(
+            type_=PropertyName.CREDENTIAL_INFO_TYPE_REGIST,
+            issuer_did=credential.did,
+            holder_did=credential.target_did,
+            signature=credential.jwt.signature,
+            issue_date=int(time.time()),
+            expiry_date=credential.jwt.payload.exp,
+        )
+        return self.get_request(credential_info=credential_info, key_holder=issuer_key_holder)
+
+    def _required_ecdh_key(self, kid: str) -> ECDHKey:
+        """Get the ECDH key of the kid, which a credential is encrypted with.
+
+        :raise JweException: if there is no key of the kid, e.g. it has expired from the key store
+        """
+        ecdh_key: Optional[ECDHKey] = self._ecdh_key_store.get(kid)
+        if not ecdh_key:
+            raise JweException(f"Not exist ECDHKey kid({kid})")
+
+        return ecdh_key
+
+    def _revoke_isolated(self, signature: str, issuer_did: str, issuer_key_holder: DidKeyHolder) -> RevocationOutcome:
+        """Revoke a credential with the WAS. An error is returned as the failed outcome of the signature."""
+        try:
+            service_result: ServiceResult = self.revoke_vc_with_signature(signature, issuer_did, issuer_key_holder)
+        except Exception as e:
+            return RevocationOutcome(signature, success=False, error=str(e))
+
+        return RevocationOutcome(signature, success=service_result.success, error=service_result.fail_message)
+
+    def _revoke_jwt(self, signature: str, issuer_did: str, issuer_key_holder: DidKeyHolder) -> str:
+        revoke_credential_info: RevokeCredentialInfo = RevokeCredentialInfo(
+            type_=PropertyName.CREDENTIAL_INFO_TYPE_REVOKE,
+            issuer_did=issuer_did,
+            signature=signature,
+            revoke_date=int(time.time()),
+        )
+        jwt: Jwt = RevokeCredentialInfoScoreParameter.revoke_credential_info_param(
+            did_key_holder=issuer_key_holder, revoke_credential_info=revoke_credential_info
+        )
+        return self._sign_jwt(jwt, issuer_key_holder)
+
+    def _revoke_vc_request(self, signature: str, issuer_did: str, issuer_key_holder: DidKeyHolder) -> VCRequest:
+        return VCRequest(
+            jwt=self._revoke_jwt(signature, issuer_did, issuer_key_holder),
+            nid=self.get_decimal_nid_from_did(issuer_key_holder.did),
+        )
 
     @staticmethod
-    def create(url: str) -> "IssuerService":
+    def create(
+        url: Union[str, Sequence[str]],
+        transport: HttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ) -> "IssuerService":
         """Create a `IssuerService` instance that can use methods for Issuer.
 
-        :param url: A Issuer WAS endpoint
+        :param url: A Issuer WAS endpoint, or the endpoints of its replicas to balance the calls over
+        :param transport: the HTTP transport to share with other services. A new one, pooled if several endpoints are
+            given, is created if omitted.
+        :param crypto_engine: the engine to run the crypto off the calling thread. It runs inline if omitted.
+        :param log_shipper: the shipper of the IV WAS logs. A new one is created if omitted.
+        :param ecdh_key_store: the store of the ECDH keys to share with other services. A new one is created if omitted.
         :return: IssuerService instance
         """
-        return IssuerService(url=url)
+        return IssuerService(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
 
     def decode_protocol_message(self, message: str) -> ClaimRequest:
         protocol_message: ProtocolMessage = ProtocolMessage.from_json(json.loads(message))
@@ -60,16 +204,7 @@ class IssuerService(BaseService):
         return VCRequest(jwt=key_holder.sign(revoke_jwt), nid=self.get_decimal_nid_from_did(key_holder.did))
 
     def get_vc(self, issuer_did: str, signature: str) -> Optional[CredentialInfo]:
-        request: VCRequest = VCRequest(nid=self.get_decimal_nid_from_did(issuer_did), sig=signature)
-        request_url: str = self._url + APIPath.GET_VC + request.to_query_param()
-        result_response: ResultResponse = HttpUtil.get(request_url)
-
-        logger.debug(f"get_vc request: {request_url}")
-        logger.debug(f"get_vc result: {result_response}")
-        if result_response.status:
-            return CredentialInfo.from_json(result_response.result)
-        else:
-            raise JSONRPCException(result_response.result)
+        return self._vc_flight.do((issuer_did, signature), self._fetch_vc, issuer_did, signature)
 
     def register_vc(self, credential: Credential, issuer_key_holder: DidKeyHolder) -> ServiceResult:
         """Register a VC via myid Server.
@@ -79,30 +214,10 @@ class IssuerService(BaseService):
         :return:
         """
         request_url: str = self._url + APIPath.REG_VC
-        payload: Payload = credential.jwt.payload
-        credential_info: CredentialInfo = CredentialInfo(
-            type_=PropertyName.CREDENTIAL_INFO_TYPE_REGIST,
-            issuer_did=credential.did,
-            holder_did=credential.target_did,
-            signature=credential.jwt.signature,
-            issue_date=int(time.time()),
-            expiry_date=payload.exp,
-        )
-        vc_request: VCRequest = self.get_request(credential_info=credential_info, key_holder=issuer_key_holder)
-        result_response: ResultResponse = HttpUtil.post(url=request_url, json=dataclasses.asdict(vc_request))
+        vc_request: VCRequest = self._register_vc_request(credential=credential, issuer_key_holder=issuer_key_holder)
+        result_response: ResultResponse = self._transport.post(url=request_url, content=VOCodec.encode(vc_request))
         if result_response.status:
-            types: List[str] = credential.vc.type
-            types.remove(DIDPropertyName.JL_TYPE_VERIFIABLE_CREDENTIAL)
-            issued_register_request: IssuedRegRequest = IssuedRegRequest(
-                vcSig=credential.jwt.signature,
-                vcType=[types[0]] if len(types) > 0 else None,
-                issuerDid=payload.iss,
-                holderDid=payload.sub,
-                issueDate=payload.iat,
-                expiryDate=payload.exp,
-            )
-            request_url = self._url + APIPath.ISS_VC_LOG
-            HttpUtil.post(url=request_url, json=dataclasses.asdict(issued_register_request))
+            self.ship_log(APIPath.ISS_VC_LOG, self._issued_register_request(credential))
 
         return ServiceResult.from_result(result_response)
 
@@ -115,29 +230,95 @@ class IssuerService(BaseService):
         self, signature: str, issuer_did: str, issuer_key_holder: DidKeyHolder
     ) -> ServiceResult:
         request_url: str = self._url + APIPath.REV_VC
-        revoke_credential_info: RevokeCredentialInfo = RevokeCredentialInfo(
-            type_=PropertyName.CREDENTIAL_INFO_TYPE_REVOKE,
-            issuer_did=issuer_did,
-            signature=signature,
-            revoke_date=int(time.time()),
-        )
-        jwt: Jwt = RevokeCredentialInfoScoreParameter.revoke_credential_info_param(
-            did_key_holder=issuer_key_holder, revoke_credential_info=revoke_credential_info
-        )
-        vc_request: VCRequest = VCRequest(
-            jwt=issuer_key_holder.sign(jwt), nid=self.get_decimal_nid_from_did(issuer_key_holder.did)
+        vc_request: VCRequest = self._revoke_vc_request(
+            signature=signature, issuer_did=issuer_did, issuer_key_holder=issuer_key_holder
         )
-        result_response: ResultResponse = HttpUtil.post(url=request_url, json=dataclasses.asdict(vc_request))
+        result_response: ResultResponse = self._transport.post(url=request_url, content=VOCodec.encode(vc_request))
         return ServiceResult.from_result(result_response)
 
+    def revoke_vcs_with_signatures(
+        self,
+        signatures: Iterable[str],
+        issuer_did: str,
+        issuer_key_holder: DidKeyHolder,
+        max_concurrency: int = None,
+        progress: Callable[[RevocationOutcome], None] = None,
+    ) -> List[RevocationOutcome]:
+        """Revoke many credentials of the issuer at once, e.g. when its key is compromised.
+
+        The WAS revokes one credential per `REV_VC` call, so the revocation JWTs are signed in parallel, on the
+        `CryptoEngine` if one is set, and the calls share the keep-alive transport. A failure only affects the outcome
+        of its own signature. To revoke with the score instead, pass the JWTs of `sign_revoke_jwts`
+        to `CredentialService.revoke_credential_stream`.
+
+        :param signatures: the signatures of the credentials
+        :param issuer_did: the DID of the issuer
+        :param issuer_key_holder: the key holder of the issuer
+        :param max_concurrency: the maximum number of revocations at once. `MYIDSDK_REVOKE_CONCURRENCY` if omitted.
+        :param progress: called with each outcome as soon as it is known, e.g. to report the progress
+        :return: an outcome per signature, in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency or settings.MYIDSDK_REVOKE_CONCURRENCY) as executor:
+            futures: Dict[Future, int] = {
+                executor.submit(self._revoke_isolated, signature, issuer_did, issuer_key_holder): index
+                for index, signature in enumerate(signatures)
+            }
+            outcomes: List[Optional[RevocationOutcome]] = [None] * len(futures)
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+                if progress:
+                    progress(outcomes[futures[future]])
+
+        return outcomes
+
     def sign_encrypt_credential(
         self, protocol_message: ProtocolMessage, issuer_key_holder: DidKeyHolder, kid: str
     ) -> ServiceResult:
-        sign_result: SignResult = protocol_message.sign_encrypt(
-            did_key_holder=issuer_key_holder, ecdh_key=self._ecdh_keys.get(kid)
-        )
+        sign_result: SignResult = self._sign_encrypt(protocol_message, issuer_key_holder, self._ecdh_key_store.get(kid))
         if sign_result.success:
             credential: Credential = Credential.from_jwt(json.loads(protocol_message.message))
             self.register_vc(credential, issuer_key_holder)
 
         return ServiceResult.from_signed_object(sign_result)
+
+    def sign_encrypt_credentials(
+        self,
+        protocol_messages: List[Tuple[ProtocolMessage, str]],
+        issuer_key_holder: DidKeyHolder,
+        max_concurrency: int = None,
+    ) -> List[ServiceResult]:
+        """Issue many credentials at once.
+
+        Each protocol message is signed, encrypted with the ECDH key of its kid and registered with the WAS.
+        The messages are handled concurrently; the crypto is dispatched to the `CryptoEngine` if one is set and the
+        `REG_VC` calls share the keep-alive transport. A failure only affects the result of its own message.
+
+        :param protocol_messages: the protocol messages of the credentials, each with the kid of its ECDH key
+        :param issuer_key_holder: the key holder of the issuer
+        :param max_concurrency: the maximum number of messages handled at once. `MYIDSDK_ISSUE_CONCURRENCY` if omitted.
+        :return: a result per message, in input order. A credential signed but not registered is a failed result
+            holding the signed object.
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency or settings.MYIDSDK_ISSUE_CONCURRENCY) as executor:
+            return list(
+                executor.map(
+                    lambda item: self._issue_credential_isolated(item[0], issuer_key_holder, item[1]),
+                    protocol_messages,
+                )
+            )
+
+    def sign_revoke_jwts(
+        self, signatures: Iterable[str], issuer_did: str, issuer_key_holder: DidKeyHolder, max_concurrency: int = None
+    ) -> List[str]:
+        """Sign the revocation JWTs of many credentials in parallel, for `CredentialService.revoke_credential_stream`.
+
+        :param signatures: the signatures of the credentials
+        :param issuer_did: the DID of the issuer
+        :param issuer_key_holder: the key holder of the issuer
+        :param max_concurrency: the maximum number of JWTs signed at once. `MYIDSDK_REVOKE_CONCURRENCY` if omitted.
+        :return: the signed JWTs of `RevokeCredentialInfoScoreParameter`, in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency or settings.MYIDSDK_REVOKE_CONCURRENCY) as executor:
+            return list(
+                executor.map(lambda signature: self._revoke_jwt(signature, issuer_did, issuer_key_holder), signatures)
+            )
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from iconsdk.icon_service import IconService
+
+from myid.score.json_rpc_batch import CallResult, JsonRpcBatchClient
+
+
+@dataclass(frozen=True)
+class ScoreCall:
+    height: int
+    tx_hash: str
+    method: str
+    params: dict
+
+
+class BlockFollower:
+    """Follows the new blocks of the chain and picks the transactions calling a score.
+
+    Every `poll` reads the blocks confirmed since the previous one, so a follower sees each block exactly once.
+    The calls are picked from the confirmed transaction list; their results are not checked.
+    """
+
+    def __init__(
+        self,
+        icon_service: IconService,
+        score_address: str,
+        start_height: int = None,
+        batch_client: JsonRpcBatchClient = None,
+    ):
+        """Create the follower.
+
+        :param icon_service: the IconService object
+        :param score_address: the address of the score to follow
+        :param start_height: the height of the first block to read. The latest block is the first one if omitted.
+        :param batch_client: the client to read the blocks behind the latest one in JSON-RPC batch requests.
+            They are read one by one if omitted.
+        """
+        self._icon_service: IconService = icon_service
+        self._score_address: str = score_address
+        self._next_height: Optional[int] = start_height
+        self._batch_client: Optional[JsonRpcBatchClient] = batch_client
+        self._latest_height: Optional[int] = None
+
+    def _get_blocks(self, heights: List[int]) -> List[dict]:
+        if not self._batch_client or len(heights) < 2:
+            return [self._icon_service.get_block(height) for height in heights]
+
+        results: List[CallResult] = self._batch_client.call_many(
+            "icx_getBlockByHeight", [{"height": hex(height)} for height in heights]
+        )
+        for height, result in zip(heights, results):
+            if not result.success:
+                raise RuntimeError(f"Failed to read the block {height}: {result.error}")
+        return [result.result for result in results]
+
+    def _score_calls(self, block: dict) -> List[ScoreCall]:
+        calls: List[ScoreCall] = []
+        for transaction in block.get("confirmed_transaction_list", []):
+            if transaction.get("to") != self._score_address or transaction.get("dataType") != "call":
+                continue
+
+            data: dict = transaction.get("data") or {}
+            calls.append(
+                ScoreCall(
+                    height=block["height"],
+                    tx_hash=transaction.get("txHash"),
+                    method=data.get("method"),
+                    params=data.get("params") or {},
+                )
+            )
+        return calls
+
+    @property
+    def height(self) -> Optional[int]:
+        """The height of the last block read, or None before the first `poll`."""
+        return None if self._next_height is None else self._next_height - 1
+
+    @property
+    def latest_height(self) -> Optional[int]:
+        """The height of the latest block of the chain at the last `poll`, or None before the first one."""
+        return self._latest_height
+
+    def poll(self, max_blocks: int = 100) -> List[ScoreCall]:
+        """Read the blocks confirmed since the last poll.
+
+        :param max_blocks: the maximum number of blocks to read. The rest is read by the next poll.
+        :return: the calls to the score in those blocks, in chain order
+        """
+        latest_block: dict = self._icon_service.get_block("latest")
+        latest_height: int = latest_block["height"]
+        if self._next_height is None:
+            self._next_height = latest_height
+
+        self._latest_height = latest_height
+
+        last_height: int = min(latest_height, self._next_height + max_blocks - 1)
+        heights: List[int] = list(range(self._next_height, min(last_height, latest_height - 1) + 1))
+        blocks: List[dict] = self._get_blocks(heights)
+        if last_height == latest_height and self._next_height <= latest_height:
+            blocks.append(latest_block)
+
+        calls: List[ScoreCall] = []
+        for block in blocks:
+            calls.extend(self._score_calls(block))
+
+        self._next_height = max(self._next_height, last_height + 1)
+        return calls
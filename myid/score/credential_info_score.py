@@ -1,23 +1,45 @@
 import time
+from typing import List, Optional
 
 from iconsdk.builder.call_builder import Call, CallBuilder
 from iconsdk.builder.transaction_builder import CallTransaction, CallTransactionBuilder
 from iconsdk.icon_service import IconService
 
+from myid.config import settings
+from myid.score.json_rpc_batch import CallResult, JsonRpcBatchClient
+from myid.score.step_estimator import StepEstimator
+
 
 class CredentialInfoScore:
     """access Credential info Score"""
 
-    def __init__(self, icon_service: IconService, network_id: int, score_address: str):
+    def __init__(
+        self,
+        icon_service: IconService,
+        network_id: int,
+        score_address: str,
+        step_estimator: StepEstimator = None,
+        batch_client: JsonRpcBatchClient = None,
+    ):
         """Create CredentialInfoScore object.
 
         :param icon_service: the IconService object
         :param network_id: networkId the network ID of the blockchain
         :param score_address: the credentialInfo score address deployed to the blockchain
+        :param step_estimator: the estimator of the step limit. If omitted, one is created when
+            `MYIDSDK_STEP_ESTIMATION` is enabled, otherwise `StepEstimator.DEFAULT_STEP_LIMIT` is used.
+        :param batch_client: the client of the bulk calls. If omitted, one is created for the node of the
+            IconService, or the bulk calls fall back to one `icx_call` per item if the node is not known.
         """
         self._icon_service: IconService = icon_service
         self._network_id: int = network_id
         self._score_address: str = score_address
+        if not step_estimator and settings.MYIDSDK_STEP_ESTIMATION:
+            step_estimator = StepEstimator(icon_service)
+        self._step_estimator: Optional[StepEstimator] = step_estimator
+        self._batch_client: Optional[JsonRpcBatchClient] = (
+            batch_client if batch_client else JsonRpcBatchClient.from_icon_service(icon_service)
+        )
 
     def _build_transaction(self, from_address: str, method: str, params: dict) -> CallTransaction:
         timestamp = int(time.time() * 1_000_000)
@@ -25,27 +47,66 @@ class CredentialInfoScore:
             nid=self._network_id,
             from_=from_address,
             to=self._score_address,
-            step_limit=5_000_000,
+            step_limit=StepEstimator.DEFAULT_STEP_LIMIT,
             timestamp=timestamp,
             method=method,
             params=params,
         )
+        if self._step_estimator:
+            payload_size: int = sum(len(value) for value in params.values())
+            builder.step_limit(self._step_estimator.step_limit(method, payload_size, builder.build))
+
         return builder.build()
 
     def _build_call(self, method: str, params: dict = None) -> Call:
         builder = CallBuilder(to=self._score_address, method=method, params=params)
         return builder.build()
 
+    def _call(self, method: str, params: dict) -> CallResult:
+        try:
+            return CallResult(result=self._icon_service.call(self._build_call(method=method, params=params)))
+        except Exception as e:
+            return CallResult(error=str(e))
+
+    def _call_many(self, method: str, params_list: List[dict]) -> List[CallResult]:
+        """Call the read-only score method once per params, packed into JSON-RPC batch requests.
+
+        :param method: the score method
+        :param params_list: the params of each call
+        :return: a result per params, in input order
+        """
+        if not self._batch_client:
+            return [self._call(method, params) for params in params_list]
+
+        return self._batch_client.call_many(
+            "icx_call",
+            [
+                {"to": self._score_address, "dataType": "call", "data": {"method": method, "params": params}}
+                for params in params_list
+            ],
+        )
+
+    def close(self):
+        """Close the client of the bulk calls."""
+        if self._batch_client:
+            self._batch_client.close()
+
     def get(self, signature: str) -> str:
         params = {"sig": signature}
         call: Call = self._build_call(method="get", params=params)
         return self._icon_service.call(call)
 
+    def get_many(self, signatures: List[str]) -> List[CallResult]:
+        return self._call_many("get", [{"sig": signature} for signature in signatures])
+
     def get_reject_history(self, vc_id: str):
         params = {"vcId": vc_id}
         call: Call = self._build_call(method="getRejectHistory", params=params)
         return self._icon_service.call(call)
 
+    def get_reject_history_many(self, vc_ids: List[str]) -> List[CallResult]:
+        return self._call_many("getRejectHistory", [{"vcId": vc_id} for vc_id in vc_ids])
+
     def get_under_taker_list(self):
         call: Call = self._build_call(method="getUndertakerList")
         return self._icon_service.call(call)
@@ -55,6 +116,9 @@ class CredentialInfoScore:
         call: Call = self._build_call(method="isValid", params=params)
         return self._icon_service.call(call)
 
+    def is_valid_many(self, signatures: List[str]) -> List[CallResult]:
+        return self._call_many("isValid", [{"sig": signature} for signature in signatures])
+
     def jwt_method(self, from_address: str, jwt: str, method: str) -> CallTransaction:
         """send transaction for several purpose(add, revoke, revoke did, revoke vc and did) about the credential info
 
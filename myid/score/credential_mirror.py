@@ -0,0 +1,328 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from iconsdk.icon_service import IconService
+from loguru import logger
+
+from myid.config import settings
+from myid.core.property_name import PropertyName
+from myid.credential.credential_validity import credential_validity
+from myid.score.block_follower import BlockFollower, ScoreCall
+from myid.score.json_rpc_batch import CallResult, JsonRpcBatchClient
+from myid.utils.jwt_util import JwtUtil
+
+_SCHEMA: List[str] = [
+    "CREATE TABLE IF NOT EXISTS credential ("
+    "signature TEXT PRIMARY KEY, issuer_did TEXT NOT NULL, holder_did TEXT, issue_date INTEGER, "
+    "expiry_date INTEGER, revoke_date INTEGER, is_revoked INTEGER NOT NULL, created INTEGER, revoked INTEGER)",
+    "CREATE INDEX IF NOT EXISTS credential_issuer_did ON credential (issuer_did)",
+    "CREATE TABLE IF NOT EXISTS revoked_did (did TEXT PRIMARY KEY, height INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS checkpoint ("
+    "id INTEGER PRIMARY KEY CHECK (id = 0), score_address TEXT NOT NULL, height INTEGER NOT NULL, "
+    "head_height INTEGER NOT NULL, head_time REAL NOT NULL)",
+]
+
+
+class CredentialMirror:
+    """A local copy of the credentialInfo score, built by replaying its transactions from the blocks.
+
+    `sync` reads the blocks since the checkpoint, and the `register`, `registerList`, `revoke`, `revokeDid` and
+    `revokeVCAndDid` calls that succeeded are applied to a SQLite file in WAL mode, along with the new checkpoint in
+    the same transaction. A mirror opened on an existing file resumes from its checkpoint, and the processes that open
+    the same path without an IconService answer from it while another process syncs it.
+
+    `lag` bounds the staleness in blocks: the blocks behind the chain at the last sync, plus the blocks produced since,
+    estimated by `block_time`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        icon_service: IconService = None,
+        score_address: str = None,
+        start_height: int = None,
+        block_time: Union[int, float] = None,
+        batch_client: JsonRpcBatchClient = None,
+    ):
+        """Create the mirror. Omitted arguments fall back to `MyIdSettings`.
+
+        :param path: the path of the SQLite file
+        :param icon_service: the IconService object to read the blocks. The mirror can not `sync` if omitted.
+        :param score_address: the credentialInfo score address. It must match the one the file was built for.
+        :param start_height: the height of the first block to replay, e.g. the deployment of the score.
+            It is required to build an empty mirror, and ignored when resuming from a checkpoint.
+        :param block_time: the interval of the blocks, in seconds, to estimate the blocks produced since the last sync
+        :param batch_client: the client to read the blocks in JSON-RPC batch requests. If omitted, one is created for
+            the node of the IconService, or the blocks are read one by one if the node is not known.
+        """
+        self._path: str = path
+        self._icon_service: Optional[IconService] = icon_service
+        self._score_address: Optional[str] = score_address
+        self._start_height: Optional[int] = start_height
+        self._block_time: Union[int, float] = block_time or settings.MYIDSDK_MIRROR_BLOCK_TIME
+        self._batch_client: Optional[JsonRpcBatchClient] = (
+            batch_client if batch_client or not icon_service else JsonRpcBatchClient.from_icon_service(icon_service)
+        )
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._replays: Dict[str, Callable[[sqlite3.Connection, dict, int], None]] = {
+            "register": self._replay_register,
+            "registerList": self._replay_register_list,
+            "revoke": self._replay_revoke,
+            "revokeDid": self._replay_revoke_did,
+            "revokeVCAndDid": self._replay_revoke_vc_and_did,
+        }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM credential").fetchone()[0]
+
+    @property
+    def height(self) -> Optional[int]:
+        """The height of the last block replayed, or None before the first `sync`."""
+        checkpoint: Optional[Tuple[int, int, float]] = self._checkpoint()
+        return checkpoint[0] if checkpoint else None
+
+    @property
+    def lag(self) -> Optional[int]:
+        """The number of blocks the mirror may be missing, or None before the first `sync`."""
+        checkpoint: Optional[Tuple[int, int, float]] = self._checkpoint()
+        if checkpoint is None:
+            return None
+
+        height, head_height, head_time = checkpoint
+        return head_height - height + max(0, int((time.time() - head_time) / self._block_time))
+
+    def _checkpoint(self) -> Optional[Tuple[int, int, float]]:
+        """The height replayed, and the height and the time of the latest block at the last sync."""
+        with self._lock:
+            return self._connect().execute("SELECT height, head_height, head_time FROM checkpoint").fetchone()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection of this process. A connection inherited by a fork is not reused."""
+        if self._connection is None or self._pid != os.getpid():
+            connection: sqlite3.Connection = sqlite3.connect(
+                self._path, timeout=10, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            row = connection.execute("SELECT score_address FROM checkpoint").fetchone()
+            if row and self._score_address and row[0] != self._score_address:
+                connection.close()
+                raise ValueError(f"{self._path} is the mirror of {row[0]}, not {self._score_address}.")
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    @staticmethod
+    def _insert_credential(connection: sqlite3.Connection, payload: dict, height: int):
+        connection.execute(
+            "INSERT OR IGNORE INTO credential (signature, issuer_did, holder_did, issue_date, expiry_date, "
+            "revoke_date, is_revoked, created, revoked) VALUES (?, ?, ?, ?, ?, 0, 0, ?, 0)",
+            (
+                payload.get(PropertyName.CREDENTIAL_INFO_SIGNATURE),
+                payload.get(PropertyName.CREDENTIAL_INFO_ISSUER_DID),
+                payload.get(PropertyName.CREDENTIAL_INFO_HOLDER_DID),
+                payload.get(PropertyName.CREDENTIAL_INFO_ISSUE_DATE) or 0,
+                payload.get(PropertyName.CREDENTIAL_INFO_EXPIRY_DATE) or 0,
+                height,
+            ),
+        )
+
+    @staticmethod
+    def _payload(params: dict) -> dict:
+        jwt: Optional[str] = params.get("credentialJwt")
+        return JwtUtil.decode_payload(jwt) if jwt else {}
+
+    def _replay_register(self, connection: sqlite3.Connection, params: dict, height: int):
+        self._insert_credential(connection, self._payload(params), height)
+
+    def _replay_register_list(self, connection: sqlite3.Connection, params: dict, height: int):
+        for jwt in (params.get("credentialJwtList") or "").split(","):
+            self._insert_credential(connection, JwtUtil.decode_payload(jwt), height)
+
+    def _replay_revoke(self, connection: sqlite3.Connection, params: dict, height: int):
+        payload: dict = self._payload(params)
+        connection.execute(
+            "UPDATE credential SET is_revoked = 1, revoke_date = ?, revoked = ? WHERE signature = ?",
+            (
+                payload.get(PropertyName.CREDENTIAL_INFO_REVOKE_DATE) or 0,
+                height,
+                payload.get(PropertyName.CREDENTIAL_INFO_SIGNATURE),
+            ),
+        )
+
+    def _replay_revoke_did(self, connection: sqlite3.Connection, params: dict, height: int):
+        connection.execute(
+            "INSERT OR IGNORE INTO revoked_did (did, height) VALUES (?, ?)",
+            (self._payload(params).get(PropertyName.CREDENTIAL_INFO_ISSUER_DID), height),
+        )
+
+    def _replay_revoke_vc_and_did(self, connection: sqlite3.Connection, params: dict, height: int):
+        self._replay_revoke(connection, params, height)
+        self._replay_revoke_did(connection, params, height)
+
+    def _succeeded(self, calls: List[ScoreCall]) -> List[bool]:
+        """Check the transaction results of the calls, since a failed transaction is in the block too.
+
+        :raise RuntimeError: if a result can not be read, so that the blocks are read again by the next sync
+        """
+        if not calls:
+            return []
+
+        if self._batch_client:
+            results: List[CallResult] = self._batch_client.call_many(
+                "icx_getTransactionResult", [{"txHash": call.tx_hash} for call in calls]
+            )
+        else:
+            results = [CallResult(result=self._icon_service.get_transaction_result(call.tx_hash)) for call in calls]
+
+        succeeded: List[bool] = []
+        for call, result in zip(calls, results):
+            if not result.success:
+                raise RuntimeError(f"Failed to read the result of transaction({call.tx_hash}): {result.error}")
+            status: Union[int, str] = result.result.get("status")
+            succeeded.append((int(status, 16) if isinstance(status, str) else status) == 1)
+        return succeeded
+
+    def catch_up(self, max_blocks: int = None) -> int:
+        """Sync until the mirror reaches the latest block of the chain at the start.
+
+        :param max_blocks: the maximum number of blocks per `sync`
+        :return: the number of calls replayed
+        """
+        replayed: int = len(self.sync(max_blocks))
+        height, target_height, _ = self._checkpoint()
+        while height < target_height:
+            replayed += len(self.sync(max_blocks))
+            height = self.height
+        return replayed
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+        if self._batch_client:
+            self._batch_client.close()
+
+    def export(self, path: str):
+        """Save a consistent snapshot of the mirror, including its checkpoint, to a new SQLite file.
+
+        A mirror opened on a copy of the snapshot resumes from its checkpoint. The sync is not blocked meanwhile.
+
+        :param path: the path of the snapshot
+        """
+        source: sqlite3.Connection = sqlite3.connect(self._path, timeout=10)
+        target: sqlite3.Connection = sqlite3.connect(path)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+
+    def get(self, signature: str) -> Optional[dict]:
+        """Get the credential info in the json format of the `get` of the score.
+
+        :param signature: the credential signature
+        :return: the credential info, or None if it is not in the mirror
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT issuer_did, holder_did, issue_date, expiry_date, revoke_date, is_revoked, created, revoked "
+                    "FROM credential WHERE signature = ?",
+                    (signature,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+
+        return {
+            PropertyName.CREDENTIAL_INFO_ISSUER_DID: row[0],
+            PropertyName.CREDENTIAL_INFO_HOLDER_DID: row[1],
+            PropertyName.CREDENTIAL_INFO_SIGNATURE: signature,
+            PropertyName.CREDENTIAL_INFO_ISSUE_DATE: row[2],
+            PropertyName.CREDENTIAL_INFO_EXPIRY_DATE: row[3],
+            PropertyName.CREDENTIAL_INFO_REVOKE_DATE: row[4],
+            PropertyName.CREDENTIAL_INFO_REVOKE_STATUS2: bool(row[5]),
+            PropertyName.CREDENTIAL_INFO_CREATED: row[6],
+            PropertyName.CREDENTIAL_INFO_REVOKED: row[7],
+        }
+
+    def is_valid(self, signature: str, timestamp: int = None) -> Optional[dict]:
+        """Check the validation of the credential as the `isValid` of the score, including its expiry.
+
+        :param signature: the credential signature
+        :param timestamp: the time to check the expiry at, in seconds since the epoch. Now if omitted.
+        :return: the status json, or None if the credential is not in the mirror
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT credential.is_revoked, revoked_did.did IS NOT NULL, credential.expiry_date FROM credential "
+                    "LEFT JOIN revoked_did ON revoked_did.did = credential.issuer_did WHERE credential.signature = ?",
+                    (signature,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+
+        return credential_validity(
+            signature,
+            is_revoked=bool(row[0]),
+            is_issuer_revoked=bool(row[1]),
+            expiry_date=row[2],
+            timestamp=int(time.time()) if timestamp is None else timestamp,
+        )
+
+    def sync(self, max_blocks: int = None) -> List[ScoreCall]:
+        """Replay the blocks confirmed since the checkpoint.
+
+        :param max_blocks: the maximum number of blocks to read. `MYIDSDK_MIRROR_SYNC_BLOCKS` if omitted.
+        :return: the calls replayed, in chain order
+        """
+        if not self._icon_service or not self._score_address:
+            raise ValueError("The mirror needs an IconService and the score address to sync.")
+
+        height: Optional[int] = self.height
+        if height is None and self._start_height is None:
+            raise ValueError("start_height is required to build an empty mirror.")
+
+        block_follower: BlockFollower = BlockFollower(
+            self._icon_service,
+            self._score_address,
+            start_height=self._start_height if height is None else height + 1,
+            batch_client=self._batch_client,
+        )
+        calls: List[ScoreCall] = block_follower.poll(max_blocks or settings.MYIDSDK_MIRROR_SYNC_BLOCKS)
+        calls = [call for call in calls if call.method in self._replays]
+        replayed: List[ScoreCall] = [call for call, succeeded in zip(calls, self._succeeded(calls)) if succeeded]
+
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                for call in replayed:
+                    self._replays[call.method](connection, call.params, call.height)
+                connection.execute(
+                    "INSERT OR REPLACE INTO checkpoint (id, score_address, height, head_height, head_time) "
+                    "VALUES (0, ?, ?, ?, ?)",
+                    (self._score_address, block_follower.height, block_follower.latest_height, time.time()),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+
+        logger.debug(f"mirror of {self._score_address}: {len(replayed)} calls up to {block_follower.height}")
+        return replayed
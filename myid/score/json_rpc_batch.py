@@ -0,0 +1,143 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Tuple, Union
+
+from iconsdk.icon_service import IconService
+
+from myid.config import settings
+
+if TYPE_CHECKING:
+    import requests
+
+
+@dataclass(frozen=True)
+class CallResult:
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+class JsonRpcBatchClient:
+    """Sends many JSON-RPC requests of a node packed into batch requests.
+
+    The requests are split into batches of `batch_size`, up to `max_concurrency` batches are sent at once over one
+    keep-alive session, and the results are returned in input order with an error per failed request.
+    The session is created on the first batch, so a client that never sends one does not import `requests`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: int = None,
+        max_concurrency: int = None,
+        timeout: Union[int, float, Tuple[float, float]] = None,
+    ):
+        """Create the client. Omitted arguments fall back to `MyIdSettings`.
+
+        :param url: the JSON-RPC endpoint, e.g. `https://lisbon.net.solidwallet.io/api/v3`
+        :param batch_size: the maximum number of requests in a batch
+        :param max_concurrency: the maximum number of batches sent at once
+        :param timeout: the timeout of a batch request, in seconds
+        """
+        self._url: str = url
+        self._batch_size: int = batch_size or settings.MYIDSDK_RPC_BATCH_SIZE
+        self._max_concurrency: int = max_concurrency or settings.MYIDSDK_RPC_BATCH_CONCURRENCY
+        self._timeout = (
+            timeout if timeout else (settings.MYIDSDK_HTTP_CONNECT_TIMEOUT, settings.MYIDSDK_HTTP_READ_TIMEOUT)
+        )
+        self._session: Optional["requests.Session"] = None
+        self._session_lock: threading.Lock = threading.Lock()
+        self._executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self._max_concurrency, thread_name_prefix="myid-rpc-batch"
+        )
+
+    def __enter__(self) -> "JsonRpcBatchClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _batches(self, method: str, params_list: List[dict]) -> Iterator[List[dict]]:
+        rpc_requests: List[dict] = [
+            {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+            for request_id, params in enumerate(params_list)
+        ]
+        for start in range(0, len(rpc_requests), self._batch_size):
+            yield rpc_requests[start : start + self._batch_size]
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        adapter: HTTPAdapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._max_concurrency)
+        session: requests.Session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_session(self) -> "requests.Session":
+        session: Optional["requests.Session"] = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    def _send_batch(self, batch: List[dict]) -> List[CallResult]:
+        try:
+            response: "requests.Response" = self._get_session().post(self._url, json=batch, timeout=self._timeout)
+            content = response.json()
+        except Exception as e:
+            return [CallResult(error=str(e))] * len(batch)
+
+        if not isinstance(content, list):
+            # a node without batch support answers with a single error object.
+            error = content.get("error") if isinstance(content, dict) else content
+            return [CallResult(error=str(error))] * len(batch)
+
+        responses: dict = {item.get("id"): item for item in content if isinstance(item, dict)}
+        results: List[CallResult] = []
+        for request in batch:
+            item: Optional[dict] = responses.get(request["id"])
+            if item is None:
+                results.append(CallResult(error="No response in the batch."))
+            elif "error" in item:
+                results.append(CallResult(error=str(item["error"])))
+            else:
+                results.append(CallResult(result=item.get("result")))
+        return results
+
+    @staticmethod
+    def from_icon_service(icon_service: IconService, **kwargs) -> Optional["JsonRpcBatchClient"]:
+        """Create the client for the node of the IconService, if it is connected by an `HTTPProvider`.
+
+        :param icon_service: the IconService object
+        :param kwargs: the other arguments of `JsonRpcBatchClient`
+        :return: the client, or None if the endpoint of the node is not known
+        """
+        provider = getattr(icon_service, "_IconService__provider", None)
+        url: Optional[str] = getattr(provider, "_URL_MAP", {}).get("icx")
+        return JsonRpcBatchClient(url, **kwargs) if url else None
+
+    def call_many(self, method: str, params_list: List[dict]) -> List[CallResult]:
+        """Send a request per params.
+
+        :param method: the JSON-RPC method, e.g. `icx_call`
+        :param params_list: the params of each request
+        :return: a result per params, in input order
+        """
+        batch_results = self._executor.map(self._send_batch, self._batches(method, params_list))
+        return list(itertools.chain.from_iterable(batch_results))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
@@ -0,0 +1,63 @@
+import math
+from typing import Callable, Optional, Tuple
+
+from iconsdk.builder.transaction_builder import Transaction
+from iconsdk.exception import IconServiceBaseException
+from iconsdk.icon_service import IconService
+from loguru import logger
+
+from myid.config import settings
+from myid.utils.cache import TTLCache
+
+_NOT_CACHED = object()
+
+
+class StepEstimator:
+    """Estimates the step limit of transactions with `debug_estimateStep`.
+
+    Estimates are cached per score method and payload size bucket (powers of two), so only the first transaction
+    of a bucket pays the extra RPC. The cached estimate is scaled by the payload size and a safety margin.
+    If the node can not estimate, `DEFAULT_STEP_LIMIT` is used and the failure is cached for a short while.
+    """
+
+    DEFAULT_STEP_LIMIT = 5_000_000
+
+    def __init__(self, icon_service: IconService, margin: float = None, ttl: int = None):
+        """Create the estimator. Omitted arguments fall back to `MyIdSettings`.
+
+        :param icon_service: the IconService object
+        :param margin: the multiplier applied to the estimated step
+        :param ttl: the lifetime of a cached estimate, in seconds
+        """
+        self._icon_service: IconService = icon_service
+        self._margin: float = margin or settings.MYIDSDK_STEP_MARGIN
+        self._cache: TTLCache = TTLCache(max_size=1024, ttl=ttl or settings.MYIDSDK_STEP_CACHE_TTL, name="step")
+
+    def _estimate(self, transaction: Transaction) -> Optional[int]:
+        try:
+            return self._icon_service.estimate_step(transaction)
+        except (Exception, IconServiceBaseException) as e:
+            logger.debug(f"Failed to estimate step, use {self.DEFAULT_STEP_LIMIT}: {e}")
+            return None
+
+    def step_limit(self, method: str, payload_size: int, build_transaction: Callable[[], Transaction]) -> int:
+        """Get the step limit for the transaction.
+
+        :param method: the score method of the transaction
+        :param payload_size: the size of the transaction parameters
+        :param build_transaction: builds the transaction to estimate when the bucket is not cached yet
+        :return: the step limit
+        """
+        key: Tuple[str, int] = (method, payload_size.bit_length())
+        entry: Optional[Tuple[int, int]] = self._cache.get(key, _NOT_CACHED)
+        if entry is _NOT_CACHED:
+            estimated_step: Optional[int] = self._estimate(build_transaction())
+            entry = (payload_size, estimated_step) if estimated_step else None
+            self._cache.put(key, entry, ttl=None if entry else settings.MYIDSDK_STEP_CACHE_NEGATIVE_TTL)
+
+        if entry is None:
+            return self.DEFAULT_STEP_LIMIT
+
+        estimated_size, estimated_step = entry
+        scale: float = max(1.0, payload_size / estimated_size) if estimated_size else 1.0
+        return math.ceil(estimated_step * scale * self._margin)
@@ -0,0 +1,233 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple, Union
+
+from iconsdk.exception import (
+    DataTypeException,
+    IconServiceBaseException,
+    JSONRPCException,
+)
+from iconsdk.icon_service import IconService
+from iconsdk.utils.converter import convert
+from iconsdk.utils.templates import TRANSACTION_RESULT
+from iconsdk.utils.validation import is_T_HASH
+from loguru import logger
+
+from myid.config import settings
+from myid.score.json_rpc_batch import CallResult, JsonRpcBatchClient
+
+
+class TransactionPoller:
+    """Waits for the results of all outstanding transactions with a single polling loop.
+
+    Each round asks the node for the result of every pending transaction hash, packed into JSON-RPC batch requests,
+    and resolves the waiters whose result has landed. While nothing lands, the interval grows by `backoff_factor`
+    up to `max_interval`; it is reset whenever a result lands or a new transaction is tracked.
+
+    The polling loop runs on the event loop of the waiters. While it runs, waiting from another event loop raises
+    `RuntimeError`; use a poller per event loop instead.
+    """
+
+    def __init__(
+        self,
+        icon_service: IconService,
+        interval: Union[int, float] = None,
+        max_interval: Union[int, float] = None,
+        backoff_factor: float = None,
+        executor: Executor = None,
+        batch_client: JsonRpcBatchClient = None,
+    ):
+        """Create the poller. Omitted arguments fall back to `MyIdSettings`.
+
+        :param icon_service: the IconService object
+        :param interval: the first polling interval, in seconds
+        :param max_interval: the maximum polling interval, in seconds
+        :param backoff_factor: the multiplier applied to the interval after a round without any result
+        :param executor: the executor running the blocking JSON-RPC calls. The loop's default one if omitted.
+        :param batch_client: the client of the batch requests. If omitted, one is created for the node of the
+            IconService, or each round falls back to one `get_transaction_result` per hash if the node is not known.
+            The poller does not close it.
+        """
+        self._icon_service: IconService = icon_service
+        self._interval: Union[int, float] = settings.MYIDSDK_TX_SLEEP_TIME if interval is None else interval
+        self._max_interval: Union[int, float] = (
+            settings.MYIDSDK_TX_MAX_SLEEP_TIME if max_interval is None else max_interval
+        )
+        self._backoff_factor: float = settings.MYIDSDK_TX_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+        self._executor: Optional[Executor] = executor
+        self._batch_client: Optional[JsonRpcBatchClient] = (
+            batch_client if batch_client else JsonRpcBatchClient.from_icon_service(icon_service)
+        )
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._tracked_new: bool = False
+
+    @property
+    def pending_count(self) -> int:
+        """The number of transaction hashes being polled."""
+        return len(self._waiters)
+
+    def _check_loop(self, loop: asyncio.AbstractEventLoop):
+        """Raise if the polling loop runs on another event loop. The one of a closed event loop is dropped."""
+        if self._task is None or self._task.done() or self._task.get_loop() is loop:
+            return
+        if not self._task.get_loop().is_closed():
+            raise RuntimeError("The transaction poller is polling on another event loop.")
+
+        # the waiters of a closed event loop can never be resolved
+        self._task = None
+        self._waiters.clear()
+
+    def _ensure_running(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+        else:
+            self._tracked_new = True
+
+    def _get_transaction_result(self, tx_hash: str) -> Tuple[Optional[dict], Optional[BaseException]]:
+        """Ask the result of the transaction.
+
+        :return: the result, or the error raised for it. Both are None while the transaction is pending.
+        """
+        try:
+            tx_result = self._icon_service.get_transaction_result(tx_hash)
+            if not tx_result:
+                raise JSONRPCException("transaction result is None.")
+        except JSONRPCException as e:
+            logger.debug(f"{tx_hash}: {e}")
+            return None, None
+        except (Exception, IconServiceBaseException) as e:
+            return None, e
+
+        return tx_result, None
+
+    def _get_transaction_results(self, tx_hashes: List[str]) -> List[Tuple[Optional[dict], Optional[BaseException]]]:
+        """Ask the results of the transactions with `icx_getTransactionResult` batch requests.
+
+        A JSON-RPC error is taken as pending, as `_get_transaction_result` does. A hash that is not well-formed fails
+        at once instead of being polled until the timeout.
+
+        :return: the result or the error per hash, in input order. Both are None while the transaction is pending.
+        """
+        responses: List[Tuple[Optional[dict], Optional[BaseException]]] = []
+        for tx_hash in tx_hashes:
+            try:
+                is_T_HASH(tx_hash)
+                responses.append((None, None))
+            except DataTypeException as e:
+                responses.append((None, e))
+        queried: List[int] = [index for index, response in enumerate(responses) if response[1] is None]
+        call_results: List[CallResult] = (
+            self._batch_client.call_many(
+                "icx_getTransactionResult", [{"txHash": tx_hashes[index]} for index in queried]
+            )
+            if queried
+            else []
+        )
+        for index, call_result in zip(queried, call_results):
+            if not call_result.success or not call_result.result:
+                logger.debug(f"{tx_hashes[index]}: {call_result.error}")
+                continue
+
+            try:
+                responses[index] = convert(call_result.result, TRANSACTION_RESULT), None
+            except Exception as e:
+                responses[index] = None, e
+
+        return responses
+
+    async def _poll(self) -> bool:
+        """Ask the result of every pending transaction once.
+
+        The requests are sent in batches on the executor. Without a batch client, one request per transaction runs
+        concurrently on it.
+
+        :return: True if any waiter was resolved
+        """
+        loop = asyncio.get_running_loop()
+        tx_hashes: List[str] = list(self._waiters)
+        if self._batch_client:
+            responses = await loop.run_in_executor(self._executor, self._get_transaction_results, tx_hashes)
+        else:
+            responses = await asyncio.gather(
+                *[loop.run_in_executor(self._executor, self._get_transaction_result, tx_hash) for tx_hash in tx_hashes]
+            )
+
+        resolved: bool = False
+        for tx_hash, (tx_result, exception) in zip(tx_hashes, responses):
+            if tx_result is not None or exception is not None:
+                self._resolve(tx_hash, result=tx_result, exception=exception)
+                resolved = True
+
+        return resolved
+
+    def _resolve(self, tx_hash: str, result: dict = None, exception: BaseException = None):
+        for future in self._waiters.pop(tx_hash, []):
+            if future.done():
+                continue
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    async def _run(self):
+        interval: Union[int, float] = self._interval
+        while self._waiters:
+            await asyncio.sleep(interval)
+
+            if await self._poll() or self._tracked_new:
+                interval = self._interval
+            else:
+                interval = min(interval * self._backoff_factor, self._max_interval)
+            self._tracked_new = False
+            logger.debug(f"pending transactions: {self.pending_count}, next poll in {interval}s")
+
+    def close(self):
+        """Stop polling, and cancel the waiters of the pending transactions."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        for tx_hash in list(self._waiters):
+            for future in self._waiters.pop(tx_hash):
+                future.cancel()
+
+    async def lookup(self, tx_hash: str) -> Optional[dict]:
+        """Ask the result of the transaction once, without waiting for it.
+
+        :param tx_hash: the hash of transaction
+        :return: the result of transaction, or None while it is pending
+        """
+        tx_result, exception = await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._get_transaction_result, tx_hash
+        )
+        if exception is not None:
+            raise exception
+        return tx_result
+
+    async def wait(self, tx_hash: str, timeout: Union[int, float]) -> dict:
+        """Wait for the result of the transaction.
+
+        :param tx_hash: the hash of transaction
+        :param timeout: the maximum time to wait, in seconds
+        :return: the result of transaction
+        :raise RuntimeError: if the poller is polling on another event loop
+        """
+        loop = asyncio.get_running_loop()
+        self._check_loop(loop)
+        future: asyncio.Future = loop.create_future()
+        self._waiters.setdefault(tx_hash, []).append(future)
+        self._ensure_running()
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            # imported here, so that the chain path does not load didsdk until it is needed
+            from didsdk.exceptions import TransactionException
+
+            raise TransactionException(f"Timed out waiting for the result of transaction({tx_hash}) after {timeout}s.")
+        finally:
+            waiters: List[asyncio.Future] = self._waiters.get(tx_hash, [])
+            if future in waiters:
+                waiters.remove(future)
+                if not waiters:
+                    del self._waiters[tx_hash]
@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING, Any
+
+from myid.vo.result_response import ResultResponse
+
+if TYPE_CHECKING:
+    from didsdk.jwt.jwt import VerifyResult
+    from didsdk.protocol.protocol_message import SignResult
+
+
+class ServiceResult:
+    def __init__(self, success: bool, result: Any, signed_object: dict = None):
+        self._success: bool = success
+        self._signed_object: dict = signed_object
+        self._result: Any = result
+        self._fail_message: str = str(result) if not success and result else None
+
+    @property
+    def success(self) -> bool:
+        return self._success
+
+    @property
+    def signed_object(self) -> dict:
+        return self._signed_object
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def fail_message(self) -> str:
+        return self._fail_message
+
+    @staticmethod
+    def from_fail_message(message: str) -> "ServiceResult":
+        return ServiceResult(success=False, result=message)
+
+    @staticmethod
+    def from_result(result: ResultResponse) -> "ServiceResult":
+        return ServiceResult(success=result.status, result=result.result)
+
+    @staticmethod
+    def from_signed_object(signed_object: "SignResult") -> "ServiceResult":
+        return ServiceResult(
+            success=signed_object.success, signed_object=signed_object.result, result=signed_object.fail_message
+        )
+
+    @staticmethod
+    def from_verify_result(verify_result: "VerifyResult") -> "ServiceResult":
+        return ServiceResult(
+            success=verify_result.success, result=None if verify_result.success else verify_result.fail_message
+        )
@@ -0,0 +1,3 @@
+from myid.simulator.server import Simulator, SimulatorConfig
+
+__all__ = ["Simulator", "SimulatorConfig"]
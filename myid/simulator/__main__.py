@@ -0,0 +1,47 @@
+"""Run the IV WAS and ICON node simulator.
+
+Usage: python -m myid.simulator [--port N] [--block-time SECONDS] [--latency SECONDS] [--error-rate RATIO]
+"""
+
+import argparse
+import asyncio
+
+from myid.simulator.server import Simulator, SimulatorConfig, uvloop
+
+
+async def _serve(simulator: Simulator):
+    await simulator.start()
+    print(f"myid simulator: WAS {simulator.url}, node {simulator.url}/api/v3", flush=True)
+    await simulator.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--block-time", type=float, default=2, help="the interval of the blocks, in seconds")
+    parser.add_argument("--latency", type=float, default=0, help="the delay of every response, in seconds")
+    parser.add_argument("--jitter", type=float, default=0, help="the random delay on top of the latency, in seconds")
+    parser.add_argument("--error-rate", type=float, default=0, help="the ratio of the requests failed on purpose")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config: SimulatorConfig = SimulatorConfig(
+        host=args.host,
+        port=args.port,
+        block_time=args.block_time,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+    )
+    try:
+        (uvloop.run if uvloop else asyncio.run)(_serve(Simulator(config)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
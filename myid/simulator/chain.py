@@ -0,0 +1,180 @@
+import hashlib
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Union
+
+from myid.simulator.ledger import CredentialLedger, LedgerError
+from myid.vo.codec import VOCodec
+
+# the error codes of the ICON node
+PENDING_ERROR = -31002
+SCORE_ERROR = -30032
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+
+
+class JsonRpcError(Exception):
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code: int = code
+        self.message: str = message
+
+
+@dataclass
+class _Transaction:
+    tx_hash: str
+    height: int
+    params: dict
+
+
+class ChainSimulator:
+    """An ICON node with the credentialInfo score, in memory.
+
+    A sent transaction is confirmed in the next block, and blocks are produced every `block_time` seconds,
+    so `icx_getTransactionResult` answers `Pending` (-31002) until then, like a real node. The blocks are made
+    lazily when a request comes in; nothing runs between requests. A `block_time` of 0 confirms transactions at once.
+    """
+
+    def __init__(
+        self,
+        ledger: CredentialLedger,
+        block_time: Union[int, float] = 2,
+        max_blocks: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create the chain.
+
+        :param ledger: the state of the credentialInfo score
+        :param block_time: the interval of the blocks, in seconds
+        :param max_blocks: the number of recent blocks kept with their transactions for `icx_getBlockByHeight`
+        :param clock: the monotonic clock of the block production
+        """
+        self._ledger: CredentialLedger = ledger
+        self._block_time: Union[int, float] = block_time
+        self._max_blocks: int = max_blocks
+        self._clock: Callable[[], float] = clock
+        self._started_at: float = clock()
+        self._genesis_time: float = time.time()
+        self._height: int = 1
+        self._pending: Deque[_Transaction] = deque()
+        self._pending_hashes: Set[str] = set()
+        self._blocks: "OrderedDict[int, List[dict]]" = OrderedDict()
+        self._results: Dict[str, dict] = {}
+        self._methods: Dict[str, Callable[[dict], Any]] = {
+            "debug_estimateStep": self._estimate_step,
+            "icx_call": self._call,
+            "icx_getBlockByHeight": self._get_block_by_height,
+            "icx_getLastBlock": lambda params: self._block(self._height),
+            "icx_getTransactionResult": self._get_transaction_result,
+            "icx_sendTransaction": self._send_transaction,
+        }
+
+    @property
+    def height(self) -> int:
+        self._advance()
+        return self._height
+
+    def _advance(self):
+        """Produce the blocks due by the clock and confirm their transactions."""
+        if self._block_time:
+            self._height = max(self._height, 1 + int((self._clock() - self._started_at) / self._block_time))
+        while self._pending and self._pending[0].height <= self._height:
+            transaction: _Transaction = self._pending.popleft()
+            self._pending_hashes.discard(transaction.tx_hash)
+            self._confirm(transaction)
+
+    def _block(self, height: int) -> dict:
+        if not 0 < height <= self._height:
+            raise JsonRpcError(INVALID_PARAMS, f"Block not found: {height}")
+        return {
+            "version": "0.1a",
+            "height": height,
+            "block_hash": hashlib.sha3_256(height.to_bytes(8, "big")).hexdigest(),
+            "prev_block_hash": hashlib.sha3_256((height - 1).to_bytes(8, "big")).hexdigest(),
+            "merkle_tree_root_hash": "",
+            "time_stamp": int((self._genesis_time + (height - 1) * self._block_time) * 1_000_000),
+            "confirmed_transaction_list": self._blocks.get(height, []),
+            "peer_id": "hx" + "0" * 40,
+            "signature": "",
+        }
+
+    def _call(self, params: dict) -> str:
+        data: dict = params.get("data") or {}
+        try:
+            return VOCodec.dumps(self._ledger.call(data.get("method"), data.get("params") or {})).decode("utf-8")
+        except LedgerError as e:
+            raise JsonRpcError(SCORE_ERROR, str(e))
+
+    def _confirm(self, transaction: _Transaction):
+        data: dict = transaction.params.get("data") or {}
+        failure: Optional[dict] = None
+        try:
+            self._ledger.execute(data.get("method"), data.get("params") or {}, transaction.height, transaction.tx_hash)
+        except LedgerError as e:
+            failure = {"code": hex(SCORE_ERROR & 0xFFFF), "message": str(e)}
+
+        block: List[dict] = self._blocks.setdefault(transaction.height, [])
+        block.append(dict(transaction.params, txHash=transaction.tx_hash))
+        while len(self._blocks) > self._max_blocks:
+            self._blocks.popitem(last=False)
+
+        result: dict = {
+            "status": "0x0" if failure else "0x1",
+            "to": transaction.params.get("to"),
+            "txHash": transaction.tx_hash,
+            "txIndex": hex(len(block) - 1),
+            "blockHeight": hex(transaction.height),
+            "blockHash": "0x" + hashlib.sha3_256(transaction.height.to_bytes(8, "big")).hexdigest(),
+            "cumulativeStepUsed": "0x186a0",
+            "stepUsed": "0x186a0",
+            "stepPrice": "0x2e90edd00",
+            "eventLogs": [],
+            "logsBloom": "0x" + "0" * 512,
+        }
+        if failure:
+            result["failure"] = failure
+        self._results[transaction.tx_hash] = result
+
+    @staticmethod
+    def _estimate_step(params: dict) -> str:
+        return hex(100_000 + 100 * len(VOCodec.dumps(params.get("data") or {})))
+
+    def _get_block_by_height(self, params: dict) -> dict:
+        return self._block(int(params.get("height", "0x0"), 16))
+
+    def _get_transaction_result(self, params: dict) -> dict:
+        result: Optional[dict] = self._results.get(params.get("txHash"))
+        if result is None:
+            raise JsonRpcError(PENDING_ERROR, "Pending")
+        return result
+
+    def _send_transaction(self, params: dict) -> str:
+        if params.get("dataType") != "call" or not params.get("data"):
+            raise JsonRpcError(INVALID_PARAMS, "Only the score calls are supported.")
+
+        unsigned: dict = {key: value for key, value in params.items() if key != "signature"}
+        tx_hash: str = "0x" + hashlib.sha3_256(VOCodec.dumps(unsigned)).hexdigest()
+        if tx_hash in self._results or tx_hash in self._pending_hashes:
+            raise JsonRpcError(INVALID_PARAMS, f"Duplicated transaction: {tx_hash}")
+
+        self._pending_hashes.add(tx_hash)
+        self._pending.append(_Transaction(tx_hash=tx_hash, height=self._height + 1, params=params))
+        if not self._block_time:
+            self._height += 1
+            self._advance()
+        return tx_hash
+
+    def handle(self, request: Union[dict, list]) -> Union[dict, list]:
+        """Answer a JSON-RPC request or batch."""
+        if isinstance(request, list):
+            return [self.handle(item) for item in request]
+
+        self._advance()
+        method: Optional[Callable[[dict], Any]] = self._methods.get(request.get("method"))
+        try:
+            if method is None:
+                raise JsonRpcError(METHOD_NOT_FOUND, f"Method not found: {request.get('method')}")
+            return {"jsonrpc": "2.0", "id": request.get("id"), "result": method(request.get("params") or {})}
+        except JsonRpcError as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": e.code, "message": e.message}}
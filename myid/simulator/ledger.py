@@ -0,0 +1,168 @@
+import time
+from typing import Callable, Dict, List, Optional, Set
+
+from myid.core.property_name import PropertyName
+from myid.credential.credential_validity import credential_validity
+from myid.utils.jwt_util import JwtUtil
+
+
+class LedgerError(Exception):
+    """A score call is rejected, e.g. the credential is already registered."""
+
+
+class CredentialLedger:
+    """The in-memory state of the credentialInfo score.
+
+    The JWTs are decoded without verifying their signature, so any JWT in the format of
+    `CredentialInfoScoreParameter`/`RevokeCredentialInfoScoreParameter` is accepted.
+    """
+
+    def __init__(self):
+        self._credentials: Dict[str, dict] = {}
+        self._revoked_dids: Set[str] = set()
+        self._reject_history: Dict[str, List[dict]] = {}
+        self._transactions: Dict[str, Callable[[dict, int, str], None]] = {
+            "register": self._register,
+            "registerList": self._register_list,
+            "registerRejectHistory": self._register_reject_history,
+            "revoke": self._revoke,
+            "revokeDid": self._revoke_did,
+            "revokeVCAndDid": self._revoke_vc_and_did,
+        }
+        self._calls: Dict[str, Callable[[dict], dict]] = {
+            "get": lambda params: self.get(params.get("sig")),
+            "getRejectHistory": lambda params: self.get_reject_history(params.get("vcId")),
+            "isValid": lambda params: self.is_valid(params.get("sig")),
+        }
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+    @staticmethod
+    def _payload(jwt: Optional[str]) -> dict:
+        payload: dict = JwtUtil.decode_payload(jwt) if jwt else {}
+        if not payload:
+            raise LedgerError("Invalid JWT.")
+        return payload
+
+    def _register(self, params: dict, height: int, tx_hash: str):
+        self.register(self._payload(params.get("credentialJwt")), height)
+
+    def _register_list(self, params: dict, height: int, tx_hash: str):
+        payloads: List[dict] = [self._payload(jwt) for jwt in (params.get("credentialJwtList") or "").split(",")]
+        signatures: List[str] = [payload.get(PropertyName.CREDENTIAL_INFO_SIGNATURE) for payload in payloads]
+        if len(set(signatures)) != len(signatures) or any(signature in self._credentials for signature in signatures):
+            raise LedgerError("The credential is already registered.")
+
+        for payload in payloads:
+            self.register(payload, height)
+
+    def _register_reject_history(self, params: dict, height: int, tx_hash: str):
+        payload: dict = self._payload(params.get("rejectJwt"))
+        vc_id: Optional[str] = payload.get(PropertyName.REJECT_HISTORY_VC_ID)
+        if not vc_id:
+            raise LedgerError("vcId is required.")
+
+        self._reject_history.setdefault(vc_id, []).append(
+            {
+                PropertyName.REJECT_HISTORY_REPORTER_DID: payload.get(PropertyName.REJECT_HISTORY_REPORTER_DID),
+                PropertyName.REJECT_HISTORY_REPORTER_NAME: payload.get(PropertyName.REJECT_HISTORY_REPORTER_NAME),
+                PropertyName.REJECT_HISTORY_REJECT_CODE: payload.get(PropertyName.REJECT_HISTORY_REJECT_CODE),
+                PropertyName.REJECT_HISTORY_REJECT_MESSAGE: payload.get(PropertyName.REJECT_HISTORY_REJECT_MESSAGE),
+                PropertyName.REJECT_HISTORY_TX_HASH: tx_hash,
+            }
+        )
+
+    def _revoke(self, params: dict, height: int, tx_hash: str):
+        self.revoke(self._payload(params.get("credentialJwt")), height)
+
+    def _revoke_did(self, params: dict, height: int, tx_hash: str):
+        payload: dict = self._payload(params.get("credentialJwt"))
+        self._revoked_dids.add(payload.get(PropertyName.CREDENTIAL_INFO_ISSUER_DID))
+
+    def _revoke_vc_and_did(self, params: dict, height: int, tx_hash: str):
+        payload: dict = self._payload(params.get("credentialJwt"))
+        self.revoke(payload, height)
+        self._revoked_dids.add(payload.get(PropertyName.CREDENTIAL_INFO_ISSUER_DID))
+
+    def call(self, method: str, params: dict) -> dict:
+        """Run a read-only score method.
+
+        :raise LedgerError: if the method is unknown or its target is not found
+        """
+        if method not in self._calls:
+            raise LedgerError(f"Method not found: {method}")
+        return self._calls[method](params)
+
+    def execute(self, method: str, params: dict, height: int, tx_hash: str):
+        """Run a score method of a transaction confirmed in the block.
+
+        :raise LedgerError: if the transaction fails
+        """
+        if method not in self._transactions:
+            raise LedgerError(f"Method not found: {method}")
+        self._transactions[method](params, height, tx_hash)
+
+    def get(self, signature: Optional[str]) -> dict:
+        credential: Optional[dict] = self._credentials.get(signature)
+        if credential is None:
+            raise LedgerError(f"The credential is not found: {signature}")
+        return dict(credential)
+
+    def get_reject_history(self, vc_id: Optional[str]) -> dict:
+        history: List[dict] = self._reject_history.get(vc_id, [])
+        return {PropertyName.REJECT_HISTORY_COUNT: len(history), PropertyName.REJECT_HISTORY_HISTORY: list(history)}
+
+    def is_valid(self, signature: Optional[str], timestamp: int = None) -> dict:
+        """Check the validation of the credential.
+
+        :param signature: the credential signature
+        :param timestamp: the time to check the expiry at, in seconds since the epoch. Now if omitted.
+        """
+        credential: dict = self.get(signature)
+        return credential_validity(
+            signature,
+            is_revoked=credential[PropertyName.CREDENTIAL_INFO_REVOKE_STATUS2],
+            is_issuer_revoked=credential[PropertyName.CREDENTIAL_INFO_ISSUER_DID] in self._revoked_dids,
+            expiry_date=credential[PropertyName.CREDENTIAL_INFO_EXPIRY_DATE],
+            timestamp=int(time.time()) if timestamp is None else timestamp,
+        )
+
+    def register(self, payload: dict, height: int):
+        """Register the credential info in the json format of `CredentialInfoScoreParameter`."""
+        signature: Optional[str] = payload.get(PropertyName.CREDENTIAL_INFO_SIGNATURE)
+        issuer_did: Optional[str] = payload.get(PropertyName.CREDENTIAL_INFO_ISSUER_DID)
+        if not signature or not issuer_did:
+            raise LedgerError("issuerDid and sig are required.")
+        if signature in self._credentials:
+            raise LedgerError("The credential is already registered.")
+        if issuer_did in self._revoked_dids:
+            raise LedgerError("The issuer DID is revoked.")
+
+        self._credentials[signature] = {
+            PropertyName.CREDENTIAL_INFO_ISSUER_DID: issuer_did,
+            PropertyName.CREDENTIAL_INFO_HOLDER_DID: payload.get(PropertyName.CREDENTIAL_INFO_HOLDER_DID),
+            PropertyName.CREDENTIAL_INFO_SIGNATURE: signature,
+            PropertyName.CREDENTIAL_INFO_ISSUE_DATE: payload.get(PropertyName.CREDENTIAL_INFO_ISSUE_DATE) or 0,
+            PropertyName.CREDENTIAL_INFO_EXPIRY_DATE: payload.get(PropertyName.CREDENTIAL_INFO_EXPIRY_DATE) or 0,
+            PropertyName.CREDENTIAL_INFO_REVOKE_DATE: 0,
+            PropertyName.CREDENTIAL_INFO_REVOKE_STATUS2: False,
+            PropertyName.CREDENTIAL_INFO_CREATED: height,
+            PropertyName.CREDENTIAL_INFO_REVOKED: 0,
+        }
+
+    def revoke(self, payload: dict, height: int):
+        """Revoke the credential info in the json format of `RevokeCredentialInfoScoreParameter`."""
+        credential: Optional[dict] = self._credentials.get(payload.get(PropertyName.CREDENTIAL_INFO_SIGNATURE))
+        if credential is None:
+            raise LedgerError("The credential is not found.")
+        if credential[PropertyName.CREDENTIAL_INFO_ISSUER_DID] != payload.get(PropertyName.CREDENTIAL_INFO_ISSUER_DID):
+            raise LedgerError("The issuer DID is not matched.")
+        if credential[PropertyName.CREDENTIAL_INFO_REVOKE_STATUS2]:
+            raise LedgerError("The credential is already revoked.")
+
+        credential[PropertyName.CREDENTIAL_INFO_REVOKE_STATUS2] = True
+        credential[PropertyName.CREDENTIAL_INFO_REVOKE_DATE] = (
+            payload.get(PropertyName.CREDENTIAL_INFO_REVOKE_DATE) or 0
+        )
+        credential[PropertyName.CREDENTIAL_INFO_REVOKED] = height
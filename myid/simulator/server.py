@@ -0,0 +1,197 @@
+import asyncio
+import random
+import threading
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+from myid.simulator.chain import ChainSimulator
+from myid.simulator.ledger import CredentialLedger
+from myid.simulator.was import WasSimulator
+from myid.vo.codec import VOCodec
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
+
+# the paths of the ICON node, e.g. `/api/v3` and `/api/debug/v3`
+NODE_PATH = "/api/"
+
+
+@dataclass
+class SimulatorConfig:
+    """The settings of a `Simulator`.
+
+    :param host: the address to listen on
+    :param port: the port to listen on. 0 picks a free one, see `Simulator.url`.
+    :param block_time: the interval of the blocks, in seconds. 0 confirms the transactions at once.
+    :param latency: the delay added to every response, in seconds
+    :param jitter: the random delay added on top of `latency`, up to this many seconds
+    :param error_rate: the ratio of the requests answered by `error_status` instead, from 0 to 1
+    :param error_status: the HTTP status of the injected errors
+    :param seed: the seed of the random jitter and errors, for reproducible runs
+    """
+
+    host: str = "127.0.0.1"
+    port: int = 0
+    block_time: Union[int, float] = 2
+    latency: float = 0
+    jitter: float = 0
+    error_rate: float = 0
+    error_status: int = 503
+    seed: Optional[int] = None
+
+
+class Simulator:
+    """The IV WAS and an ICON node with the credentialInfo score, in memory, on one local HTTP server.
+
+    The WAS answers the `APIPath` endpoints and the node answers the JSON-RPC of `/api/v3` and `/api/debug/v3`,
+    so `IssuerService`, `VerifierService` and `CredentialService` (`HTTPProvider(simulator.url, 3)`) run against it
+    unchanged, for tests, benchmarks and local development.
+
+    Run it in the current event loop with `async with Simulator() as simulator`, or in a background thread with
+    `with Simulator() as simulator`. The state is kept only in memory and lost when it stops.
+    """
+
+    def __init__(self, config: SimulatorConfig = None):
+        self._config: SimulatorConfig = config or SimulatorConfig()
+        self._random: random.Random = random.Random(self._config.seed)
+        self._ledger: CredentialLedger = CredentialLedger()
+        self._chain: ChainSimulator = ChainSimulator(self._ledger, block_time=self._config.block_time)
+        self._was: WasSimulator = WasSimulator(self._ledger, height=lambda: self._chain.height)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def __aenter__(self) -> "Simulator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def __enter__(self) -> "Simulator":
+        self._loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="myid-simulator", daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start(), self._loop).result()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    @property
+    def chain(self) -> ChainSimulator:
+        return self._chain
+
+    @property
+    def ledger(self) -> CredentialLedger:
+        return self._ledger
+
+    @property
+    def url(self) -> str:
+        """The URL of the WAS, and of the node for `HTTPProvider(url, 3)`."""
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def was(self) -> WasSimulator:
+        return self._was
+
+    async def _delay(self):
+        delay: float = self._config.latency + (
+            self._random.uniform(0, self._config.jitter) if self._config.jitter else 0
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _respond(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        if self._config.error_rate and self._random.random() < self._config.error_rate:
+            return self._config.error_status, VOCodec.dumps({"result": "Injected error"})
+
+        url = urlsplit(target)
+        try:
+            if url.path.startswith(NODE_PATH):
+                answer: Union[dict, list] = self._chain.handle(VOCodec.loads(body))
+                # a node answers an error with 400, except in a batch
+                return 400 if "error" in answer else 200, VOCodec.dumps(answer)
+            if method == "GET":
+                status, result = self._was.get(url.path, dict(parse_qsl(url.query)))
+            else:
+                status, result = self._was.post(url.path, VOCodec.loads(body) if body else {})
+        except (AttributeError, TypeError, ValueError) as e:
+            status, result = 400, f"Invalid request: {e}"
+        return status, VOCodec.dumps({"result": result})
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer the HTTP/1.1 requests of a connection, kept alive until the client closes it."""
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    head: bytes = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    return
+
+                request_line, *lines = head[:-4].decode("latin-1").split("\r\n")
+                method, target, version = request_line.split(" ", 2)
+                headers: Dict[str, str] = {}
+                for line in lines:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length: int = int(headers.get("content-length") or 0)
+                body: bytes = await reader.readexactly(length) if length else b""
+
+                await self._delay()
+                status, content = self._respond(method, target, body)
+                keep_alive: bool = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                writer.write(
+                    b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n"
+                    % (
+                        status,
+                        HTTPStatus(status).phrase.encode(),
+                        len(content),
+                        b"" if keep_alive else b"Connection: close\r\n",
+                    )
+                    + content
+                )
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    def add_document(self, did: str, document: dict):
+        """Serve the DID document from `R_DID`."""
+        self._was.add_document(did, document)
+
+    async def serve_forever(self):
+        """Serve until cancelled, starting the server unless `start` was awaited."""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._serve, self._config.host, self._config.port, backlog=1024)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # the kept alive connections would hold `wait_closed` until the clients close them
+            tasks = list(self._connections.values())
+            for writer in list(self._connections):
+                writer.close()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
@@ -0,0 +1,142 @@
+import hashlib
+from collections import Counter
+from typing import Callable, Dict, Optional, Tuple
+
+from myid.core.api_path import APIPath
+from myid.simulator.ledger import CredentialLedger, LedgerError
+from myid.utils.jwt_util import JwtUtil
+
+# (HTTP status, the `result` of the IV WAS response)
+Reply = Tuple[int, object]
+
+
+class WasSimulator:
+    """The IV WAS, in memory.
+
+    The credentials are registered and revoked in the ledger shared with the `ChainSimulator`, at once, as the WAS
+    answers after the transaction is confirmed. The DIDs are created from `DIDRequest` and updated by the JWT of
+    `U_DID`: `status` 1 adds the `publicKey` of the payload, 0 revokes the key named by `revokeKey`.
+    The logs are only counted.
+    """
+
+    def __init__(self, ledger: CredentialLedger, height: Callable[[], int]):
+        """Create the WAS.
+
+        :param ledger: the state of the credentialInfo score shared with the chain
+        :param height: the current block height, for the `created`/`revoked` heights
+        """
+        self._ledger: CredentialLedger = ledger
+        self._height: Callable[[], int] = height
+        self._documents: Dict[str, dict] = {}
+        self.logs: Counter = Counter()
+        self._gets: Dict[str, Callable[[str, Dict[str, str]], Reply]] = {
+            APIPath.GET_VC: self._get_vc,
+            APIPath.IS_VALID_VC: self._is_valid_vc,
+        }
+        self._posts: Dict[str, Callable[[dict], Reply]] = {
+            APIPath.C_DID: self._create_did,
+            APIPath.U_DID: self._update_did,
+            APIPath.REG_VC: self._register_vc,
+            APIPath.REV_VC: self._revoke_vc,
+        }
+
+    def _create_did(self, body: dict) -> Reply:
+        if not body.get("keyId") or not body.get("publicKey"):
+            return 400, "keyId and publicKey are required."
+
+        nid: int = int(body.get("nid") or 1)
+        did: str = f"did:icon:{nid:02x}:{hashlib.sha3_256(body['publicKey'].encode()).hexdigest()[:48]}"
+        if did in self._documents:
+            return 400, f"The DID already exists: {did}"
+
+        height: int = self._height()
+        self._documents[did] = {
+            "id": did,
+            "created": height,
+            "updated": height,
+            "publicKey": {
+                body["keyId"]: {
+                    "id": body["keyId"],
+                    "type": ["Secp256k1VerificationKey"],
+                    "publicKey": body["publicKey"],
+                    "encodeType": 1,
+                    "created": height,
+                }
+            },
+            "authentication": [{"publicKey": f"{did}#{body['keyId']}"}],
+        }
+        return 200, self._documents[did]
+
+    def _get_did(self, path: str, query: Dict[str, str]) -> Reply:
+        document: Optional[dict] = self._documents.get(path[len(APIPath.R_DID) :])
+        return (200, document) if document else (404, f"The DID is not found: {path[len(APIPath.R_DID):]}")
+
+    def _get_vc(self, path: str, query: Dict[str, str]) -> Reply:
+        try:
+            return 200, self._ledger.get(query.get("sig"))
+        except LedgerError as e:
+            return 404, str(e)
+
+    def _is_valid_vc(self, path: str, query: Dict[str, str]) -> Reply:
+        try:
+            result: dict = self._ledger.is_valid(query.get("sig"))
+        except LedgerError as e:
+            return 404, str(e)
+        return (200, result) if result["isValid"] else (400, result)
+
+    def _register_vc(self, body: dict) -> Reply:
+        try:
+            self._ledger.register(JwtUtil.decode_payload(body.get("jwt") or ""), self._height())
+        except LedgerError as e:
+            return 400, str(e)
+        return 200, True
+
+    def _revoke_vc(self, body: dict) -> Reply:
+        try:
+            self._ledger.revoke(JwtUtil.decode_payload(body.get("jwt") or ""), self._height())
+        except LedgerError as e:
+            return 400, str(e)
+        return 200, True
+
+    def _update_did(self, body: dict) -> Reply:
+        jwt: str = body.get("jwt") or ""
+        # the header is decoded as the payload of a JWT without a header
+        header: dict = JwtUtil.decode_payload("." + jwt.split(".", 1)[0])
+        did: str = (header.get("kid") or "").split("#")[0]
+        document: Optional[dict] = self._documents.get(did)
+        if document is None:
+            return 404, f"The DID is not found: {did}"
+
+        payload: dict = JwtUtil.decode_payload(jwt)
+        height: int = self._height()
+        if int(body.get("status") or 0):
+            public_key: dict = payload.get("publicKey") or {}
+            if not public_key.get("id"):
+                return 400, "publicKey is required."
+            document["publicKey"][public_key["id"]] = dict(public_key, created=height)
+        else:
+            public_key: Optional[dict] = document["publicKey"].get(payload.get("revokeKey"))
+            if public_key is None:
+                return 404, f"The key is not found: {payload.get('revokeKey')}"
+            public_key["revoked"] = height
+        document["updated"] = height
+        return 200, document
+
+    def add_document(self, did: str, document: dict):
+        """Serve the DID document from `R_DID`."""
+        self._documents[did] = document
+
+    def get(self, path: str, query: Dict[str, str]) -> Reply:
+        if path.startswith(APIPath.R_DID):
+            return self._get_did(path, query)
+        handler: Optional[Callable[[str, Dict[str, str]], Reply]] = self._gets.get(path)
+        return handler(path, query) if handler else (404, f"Not found: {path}")
+
+    def post(self, path: str, body: dict) -> Reply:
+        handler: Optional[Callable[[dict], Reply]] = self._posts.get(path)
+        if handler:
+            return handler(body)
+        if path.startswith("/v1/log/"):
+            self.logs[path] += 1
+            return 200, True
+        return 404, f"Not found: {path}"
@@ -1,27 +1,66 @@
-import requests
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
 
+from myid.core.api_path import APIPath
+from myid.utils.metrics import metrics
+from myid.vo.codec import VOCodec
 from myid.vo.result_response import ResultResponse
 
+if TYPE_CHECKING:
+    import requests
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# the longest first, so `R_DID` only matches the DID resolution
+_API_PATHS = sorted(
+    (value for name, value in vars(APIPath).items() if not name.startswith("_") and isinstance(value, str)),
+    key=len,
+    reverse=True,
+)
+
 
 class HttpUtil:
+    @staticmethod
+    def api_path(url: str) -> str:
+        """Get the `APIPath` of the URL, the label of the WAS calls in `metrics`."""
+        path: str = urlsplit(url).path
+        for api_path in _API_PATHS:
+            if path.endswith(api_path) or (api_path == APIPath.R_DID and api_path in path):
+                return api_path
+        return "other"
+
     @staticmethod
     def get(url: str) -> ResultResponse:
+        import requests
+
         try:
-            with requests.Session() as session:
-                response: requests.Response = session.get(url=url)
-            return ResultResponse(
-                status=(response.status_code == requests.codes.ok), result=response.json().get("result")
-            )
+            with HttpUtil.timer("GET", url), requests.Session() as session:
+                response: "requests.Response" = session.get(url=url)
+            return HttpUtil.to_result_response(response)
         except Exception as e:
             return ResultResponse(status=False, result=str(e))
 
     @staticmethod
     def post(url: str, json: dict):
+        import requests
+
         try:
-            with requests.Session() as session:
-                response: requests.Response = session.post(url=url, json=json)
-            return ResultResponse(
-                status=(response.status_code == requests.codes.ok), result=response.json().get("result")
-            )
+            with HttpUtil.timer("POST", url), requests.Session() as session:
+                response: "requests.Response" = session.post(url=url, json=json)
+            return HttpUtil.to_result_response(response)
         except Exception as e:
             return ResultResponse(status=False, result=str(e))
+
+    @staticmethod
+    def timer(method: str, url: str):
+        """Time a WAS call into `myid_http_request_seconds` by the method and the `APIPath`."""
+        if not metrics.enabled:
+            return metrics.timer("myid_http_request_seconds")
+        return metrics.timer("myid_http_request_seconds", method=method, path=HttpUtil.api_path(url))
+
+    @staticmethod
+    def to_result_response(response: "requests.Response") -> ResultResponse:
+        return ResultResponse(
+            status=(response.status_code == HTTPStatus.OK), result=VOCodec.loads(response.content).get("result")
+        )
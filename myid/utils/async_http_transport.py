@@ -0,0 +1,217 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from myid.config import settings
+from myid.utils import JSON_HEADERS, HttpUtil
+from myid.utils.endpoint_pool import Endpoint, EndpointPool
+from myid.vo.codec import VOCodec
+from myid.vo.result_response import ResultResponse
+
+try:
+    import httpx
+except ImportError:  # no cov
+    httpx = None
+
+
+class AsyncHttpTransport:
+    """Non-blocking keep-alive HTTP transport for the IV WAS.
+
+    It is the asyncio counterpart of `HttpTransport` and requires `httpx` (`pip install myid-sdk[async]`).
+    One transport can be shared by several async services so they draw from the same connection pool.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = None,
+        connect_timeout: Union[int, float] = None,
+        read_timeout: Union[int, float] = None,
+        retry_count: int = None,
+    ):
+        """Create the transport. Omitted arguments fall back to `MyIdSettings`.
+
+        :param pool_maxsize: the maximum number of connections kept alive
+        :param connect_timeout: the connect timeout, in seconds
+        :param read_timeout: the read timeout, in seconds
+        :param retry_count: the number of retries when the connection could not be established
+        """
+        if httpx is None:
+            raise ImportError("httpx is required for AsyncHttpTransport. Install it by `pip install myid-sdk[async]`.")
+
+        pool_maxsize = settings.MYIDSDK_HTTP_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize
+        self._client: httpx.AsyncClient = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                settings.MYIDSDK_HTTP_READ_TIMEOUT if read_timeout is None else read_timeout,
+                connect=settings.MYIDSDK_HTTP_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout,
+            ),
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+                retries=settings.MYIDSDK_HTTP_RETRY_COUNT if retry_count is None else retry_count,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncHttpTransport":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @staticmethod
+    def _to_result_response(response: "httpx.Response") -> ResultResponse:
+        return ResultResponse(
+            status=(response.status_code == httpx.codes.OK), result=VOCodec.loads(response.content).get("result")
+        )
+
+    async def _send(self, method: str, url: str, body: bytes = None) -> "httpx.Response":
+        with HttpUtil.timer(method, url):
+            return await self._client.request(
+                method, url, content=body, headers=JSON_HEADERS if body is not None else None
+            )
+
+    async def close(self):
+        await self._client.aclose()
+
+    async def get(self, url: str) -> ResultResponse:
+        try:
+            return self._to_result_response(await self._send("GET", url))
+        except Exception as e:
+            return ResultResponse(status=False, result=str(e))
+
+    async def post(self, url: str, json: Any = None, content: bytes = None) -> ResultResponse:
+        """Post a JSON body.
+
+        :param url: the URL
+        :param json: the body to encode
+        :param content: the already encoded body, e.g. by `VOCodec.encode`. It takes precedence over `json`.
+        """
+        try:
+            body: bytes = content if content is not None else VOCodec.dumps(json)
+            return self._to_result_response(await self._send("POST", url, body))
+        except Exception as e:
+            return ResultResponse(status=False, result=str(e))
+
+
+class PooledAsyncHttpTransport(AsyncHttpTransport):
+    """The asyncio counterpart of `PooledHttpTransport`.
+
+    The requests are balanced, failed over and hedged the same way. The request that loses a hedge is cancelled.
+    """
+
+    NO_ENDPOINT = "No WAS endpoint is available."
+
+    def __init__(
+        self,
+        endpoints: Union[Sequence[str], EndpointPool],
+        pool_maxsize: int = None,
+        connect_timeout: Union[int, float] = None,
+        read_timeout: Union[int, float] = None,
+        retry_count: int = 0,
+    ):
+        """Create the transport. Omitted arguments fall back to `MyIdSettings`.
+
+        :param endpoints: the endpoints of the replicas, or a pool to share with other transports
+        :param pool_maxsize: the maximum number of connections kept alive
+        :param connect_timeout: the connect timeout, in seconds
+        :param read_timeout: the read timeout, in seconds
+        :param retry_count: the number of retries on the same endpoint when the connection could not be established
+        """
+        super().__init__(
+            pool_maxsize=pool_maxsize,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retry_count=retry_count,
+        )
+        self._pool: EndpointPool = endpoints if isinstance(endpoints, EndpointPool) else EndpointPool(endpoints)
+
+    @property
+    def pool(self) -> EndpointPool:
+        return self._pool
+
+    async def _attempt(
+        self, endpoint: Endpoint, method: str, path: str, body: bytes = None
+    ) -> Tuple[bool, ResultResponse]:
+        """Send a request to an endpoint and record its outcome in the pool.
+
+        :return: whether the request may be sent to another endpoint, and the response
+        """
+        started: float = time.perf_counter()
+        try:
+            response: httpx.Response = await self._send(method, endpoint.url + path, body)
+        except asyncio.CancelledError:
+            self._pool.release(endpoint, None, success=None)
+            raise
+        except Exception as e:
+            self._pool.release(endpoint, time.perf_counter() - started, success=False)
+            not_sent: bool = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout))
+            return method == "GET" or not_sent, ResultResponse(status=False, result=str(e))
+
+        success: bool = response.status_code < 500
+        self._pool.release(endpoint, time.perf_counter() - started, success=success)
+        try:
+            result_response: ResultResponse = self._to_result_response(response)
+        except Exception as e:
+            result_response = ResultResponse(status=False, result=str(e))
+        return method == "GET" and not success, result_response
+
+    async def _failover(self, method: str, path: str, body: bytes = None) -> ResultResponse:
+        tried: List[Endpoint] = []
+        result_response: ResultResponse = ResultResponse(status=False, result=self.NO_ENDPOINT)
+        while True:
+            endpoint: Optional[Endpoint] = self._pool.acquire(exclude=tried)
+            if endpoint is None:
+                return result_response
+            tried.append(endpoint)
+            retry, result_response = await self._attempt(endpoint, method, path, body)
+            if not retry:
+                return result_response
+
+    async def _hedged_get(self, path: str, delay: float) -> ResultResponse:
+        tried: List[Endpoint] = []
+        pending: Dict[asyncio.Task, Endpoint] = {}
+        backup: Optional[Endpoint] = None
+        hedged: bool = False
+        result_response: ResultResponse = ResultResponse(status=False, result=self.NO_ENDPOINT)
+        start: bool = True
+        try:
+            while True:
+                if start:
+                    endpoint: Optional[Endpoint] = self._pool.acquire(exclude=tried)
+                    if endpoint is None:
+                        if not pending:
+                            return result_response
+                        # no other endpoint to hedge with: wait for the request in flight
+                        hedged = True
+                    else:
+                        if pending:
+                            backup, hedged = endpoint, True
+                            self._pool.record_hedge(endpoint)
+                        tried.append(endpoint)
+                        pending[asyncio.ensure_future(self._attempt(endpoint, "GET", path))] = endpoint
+
+                timeout: Optional[float] = None if hedged or len(pending) > 1 else delay
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    endpoint = pending.pop(task)
+                    retry, result_response = task.result()
+                    if not retry:
+                        if endpoint is backup:
+                            self._pool.record_hedge(endpoint, won=True)
+                        return result_response
+                # send the backup once the delay elapsed, or the next request once all of them failed
+                start = not done or not pending
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get(self, url: str) -> ResultResponse:
+        path: Optional[str] = self._pool.split(url)
+        if path is None:
+            return await super().get(url)
+        delay: Optional[float] = self._pool.hedge_delay()
+        return await (self._failover("GET", path) if delay is None else self._hedged_get(path, delay))
+
+    async def post(self, url: str, json: Any = None, content: bytes = None) -> ResultResponse:
+        path: Optional[str] = self._pool.split(url)
+        if path is None:
+            return await super().post(url, json=json, content=content)
+        return await self._failover("POST", path, content if content is not None else VOCodec.dumps(json))
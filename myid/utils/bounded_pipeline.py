@@ -0,0 +1,62 @@
+import asyncio
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    TypeVar,
+    Union,
+)
+
+T = TypeVar("T")
+
+
+async def aiter_items(items: Union[Iterable[T], AsyncIterable[T]]) -> AsyncIterator[T]:
+    """Iterate an iterable or an async iterable asynchronously."""
+    if isinstance(items, AsyncIterable):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def run_bounded(items: AsyncIterable[T], handle: Callable[[T], Awaitable[None]], max_in_flight: int):
+    """Handle the items concurrently, with up to `max_in_flight` of them at once.
+
+    The next item is only taken once a handling slot is free, so the input is consumed as fast as items complete.
+
+    :param items: the items to handle
+    :param handle: handles an item. It records its own outcome; an error raised by it cancels the items in flight
+        and is raised from the run.
+    :param max_in_flight: the maximum number of items being handled at the same time
+    """
+    in_flight: asyncio.Semaphore = asyncio.Semaphore(max_in_flight)
+    tasks: List[asyncio.Task] = []
+
+    async def handled(item: T):
+        try:
+            await handle(item)
+        finally:
+            in_flight.release()
+
+    try:
+        async for item in items:
+            await in_flight.acquire()
+            tasks.append(asyncio.create_task(handled(item)))
+            pending: List[asyncio.Task] = []
+            for task in tasks:
+                if task.done():
+                    # raises the error of a failed handler
+                    task.result()
+                else:
+                    pending.append(task)
+            tasks = pending
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple, Union
+
+from myid.utils.metrics import metrics
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        total: int = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class TTLCache:
+    """A thread-safe LRU cache whose entries expire after a TTL.
+
+    A `max_size` of 0 disables the cache: `put` is ignored and every `get` is a miss.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: Union[int, float], clock: Callable[[], float] = time.monotonic, name: str = None
+    ):
+        """Create the cache.
+
+        :param max_size: the maximum number of entries. The least recently used entry is evicted beyond it.
+        :param ttl: the default lifetime of an entry, in seconds
+        :param clock: the monotonic clock used for expiry
+        :param name: the `cache` label of the hits and misses in `metrics`. They are not recorded if omitted.
+        """
+        self._max_size: int = max_size
+        self._ttl: Union[int, float] = ttl
+        self._clock: Callable[[], float] = clock
+        self._name: Optional[str] = name
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(hits=self._hits, misses=self._misses, size=len(self._entries))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+
+        if self._name and metrics.enabled:
+            metrics.inc("myid_cache_requests_total", cache=self._name, result="miss" if entry is None else "hit")
+        return default if entry is None else entry[1]
+
+    def invalidate(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def put(self, key: Hashable, value: Any, ttl: Union[int, float] = None):
+        """Store the value.
+
+        :param key: the key of the entry
+        :param value: the value of the entry
+        :param ttl: the lifetime of this entry, in seconds. The cache's default TTL is used if omitted.
+        """
+        if self._max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (self._clock() + (self._ttl if ttl is None else ttl), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
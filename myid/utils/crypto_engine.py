@@ -0,0 +1,124 @@
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, TypeVar
+
+from coincurve import PublicKey
+from didsdk.core.did_key_holder import DidKeyHolder
+from didsdk.jwe.ecdhkey import ECDHKey
+from didsdk.jwt.jwt import Jwt, VerifyResult
+from didsdk.protocol.protocol_message import ProtocolMessage, SignResult
+
+from myid.config import settings
+
+T = TypeVar("T")
+
+# the engine whose thread pool runs the current thread
+_worker = threading.local()
+
+
+def _verify(jwt: Jwt, public_key: bytes) -> VerifyResult:
+    return jwt.verify(PublicKey(public_key))
+
+
+def _decrypt(protocol_message: ProtocolMessage, ecdh_key: ECDHKey) -> ProtocolMessage:
+    protocol_message.decrypt_jwe(ecdh_key)
+    return protocol_message
+
+
+def _sign_encrypt(protocol_message: ProtocolMessage, did_key_holder: DidKeyHolder, ecdh_key: ECDHKey) -> SignResult:
+    return protocol_message.sign_encrypt(did_key_holder=did_key_holder, ecdh_key=ecdh_key)
+
+
+def _run_inline(func: Callable[..., T], *args) -> "Future[T]":
+    future: Future = Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+class CryptoEngine:
+    """Runs the CPU-bound crypto of the services (JWT verify, JWE decrypt, sign and encrypt) on a worker pool.
+
+    With threads, libsecp256k1 and the `cryptography` backend release the GIL while they compute, so the work
+    spreads over cores. With processes, the signature verification runs in worker processes; decryption and
+    signing keep running on a thread pool of the same size because the key objects they need can not be pickled.
+
+    A function handed to `submit` runs on the thread pool, and the crypto it asks from the same engine runs inline
+    on that worker, so it never waits for a free worker of its own pool.
+    """
+
+    def __init__(self, max_workers: int = None, use_processes: bool = None):
+        """Create the engine. Omitted arguments fall back to `MyIdSettings`.
+
+        :param max_workers: the number of workers. The executor's default if `MYIDSDK_CRYPTO_WORKERS` is not set either.
+        :param use_processes: run the signature verification in a process pool instead of a thread pool
+        """
+        max_workers = max_workers or settings.MYIDSDK_CRYPTO_WORKERS
+        use_processes = settings.MYIDSDK_CRYPTO_USE_PROCESSES if use_processes is None else use_processes
+        self._key_executor: Executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="myid-crypto", initializer=self._mark_worker
+        )
+        self._verify_executor: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers) if use_processes else self._key_executor
+        )
+
+    def __enter__(self) -> "CryptoEngine":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _mark_worker(self):
+        _worker.engine = self
+
+    def _submit_key_work(self, func: Callable[..., T], *args) -> "Future[T]":
+        if getattr(_worker, "engine", None) is self:
+            return _run_inline(func, *args)
+
+        return self._key_executor.submit(func, *args)
+
+    def decrypt(self, protocol_message: ProtocolMessage, ecdh_key: ECDHKey) -> "Future[ProtocolMessage]":
+        """Decrypt the JWE of the protocol message in place.
+
+        :return: the future of the decrypted protocol message
+        """
+        return self._submit_key_work(_decrypt, protocol_message, ecdh_key)
+
+    def shutdown(self, wait: bool = True):
+        self._key_executor.shutdown(wait=wait)
+        if self._verify_executor is not self._key_executor:
+            self._verify_executor.shutdown(wait=wait)
+
+    def sign(self, jwt: Jwt, did_key_holder: DidKeyHolder) -> "Future[str]":
+        """Sign the JWT.
+
+        :return: the future of the encoded JWT with its signature
+        """
+        return self._submit_key_work(did_key_holder.sign, jwt)
+
+    def sign_encrypt(
+        self, protocol_message: ProtocolMessage, did_key_holder: DidKeyHolder, ecdh_key: ECDHKey = None
+    ) -> "Future[SignResult]":
+        return self._submit_key_work(_sign_encrypt, protocol_message, did_key_holder, ecdh_key)
+
+    def submit(self, func: Callable[..., T], *args) -> "Future[T]":
+        """Run the function on the thread pool, e.g. a service step that decodes, decrypts and parses a message.
+
+        :return: the future of the result of the function
+        """
+        return self._submit_key_work(func, *args)
+
+    def verify(self, jwt: Jwt, public_key: PublicKey, public_key_bytes: bytes = None) -> "Future[VerifyResult]":
+        """Verify the signature of the JWT.
+
+        :param jwt: the JWT to verify
+        :param public_key: the public key of the signer
+        :param public_key_bytes: the serialized `public_key`, to skip serializing it for the worker processes
+        :return: the future of the verify result
+        """
+        if self._verify_executor is self._key_executor:
+            return self._submit_key_work(jwt.verify, public_key)
+
+        return self._verify_executor.submit(_verify, jwt, public_key_bytes or public_key.format())
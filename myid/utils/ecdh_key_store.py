@@ -0,0 +1,222 @@
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union
+
+from myid.utils.cache import TTLCache
+
+if TYPE_CHECKING:
+    from didsdk.jwe.ecdhkey import ECDHKey
+
+
+def _ec_key_attributes(key: "ECDHKey") -> Dict[str, Any]:
+    """Get the `cryptography` EC keys held by the ECDH key, by attribute name."""
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    return {
+        name: value
+        for name, value in vars(key).items()
+        if isinstance(value, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey))
+    }
+
+
+def ecdh_key_to_private_bytes(key: "ECDHKey") -> bytes:
+    """Export the private key of the ECDH key as PKCS8 DER. `ecdh_key_from_private_bytes` restores the key.
+
+    :raise TypeError: if the key holds no EC private key
+    """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    for value in _ec_key_attributes(key).values():
+        if isinstance(value, ec.EllipticCurvePrivateKey):
+            return value.private_bytes(
+                serialization.Encoding.DER, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+            )
+    raise TypeError(f"{type(key).__name__} holds no EC private key to store.")
+
+
+def ecdh_key_from_private_bytes(private_bytes: bytes, kid: str) -> "ECDHKey":
+    """Rebuild the ECDH key of the kid from the private key exported by `ecdh_key_to_private_bytes`.
+
+    A key of the same curve is made with `ECDHKey.generate_key`, and its EC keys are replaced by the stored one.
+    """
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+    from didsdk.jwe.ecdhkey import ECDHKey
+
+    private_key = serialization.load_der_private_key(private_bytes, None)
+    key: ECDHKey = ECDHKey.generate_key(private_key.curve.name)
+    for name, value in _ec_key_attributes(key).items():
+        setattr(key, name, private_key if isinstance(value, ec.EllipticCurvePrivateKey) else private_key.public_key())
+    if hasattr(key, "kid"):
+        key.kid = kid
+    return key
+
+
+class EcdhKeyStore(ABC):
+    """The store of the ECDH keys of the sessions, by kid."""
+
+    @abstractmethod
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+    @abstractmethod
+    def delete(self, kid: str):
+        pass
+
+    @abstractmethod
+    def get(self, kid: str) -> Optional["ECDHKey"]:
+        pass
+
+    @abstractmethod
+    def put(self, kid: str, key: "ECDHKey"):
+        pass
+
+
+class MemoryEcdhKeyStore(EcdhKeyStore):
+    """An in-process store. The least recently used key is evicted beyond `max_size`, and a key expires after `ttl`.
+
+    Unlike the former dict of the services, a key is dropped without `delete_ecdh_key` once it expires or is evicted:
+    after `MYIDSDK_ECDH_KEY_TTL` (3600 seconds) or beyond `MYIDSDK_ECDH_KEY_STORE_SIZE` (10,000 keys) by default.
+    """
+
+    def __init__(self, max_size: int, ttl: Union[int, float]):
+        """Create the store.
+
+        :param max_size: the maximum number of keys
+        :param ttl: the lifetime of a key, in seconds
+        """
+        self._cache: TTLCache = TTLCache(max_size=max_size, ttl=ttl, name="ecdh_key")
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self):
+        self._cache.clear()
+
+    def delete(self, kid: str):
+        self._cache.invalidate(kid)
+
+    def get(self, kid: str) -> Optional["ECDHKey"]:
+        return self._cache.get(kid)
+
+    def put(self, kid: str, key: "ECDHKey"):
+        self._cache.put(kid, key)
+
+
+class SqliteEcdhKeyStore(EcdhKeyStore):
+    """A store in a local SQLite file, shared by every process that opens the same path.
+
+    A pre-fork worker fleet can decrypt a message of a session whose key was added by another worker.
+    Each process (and each fork) opens its own connection. The file is in WAL mode, so readers do not block the
+    writer. The oldest keys are evicted beyond `max_size` and a key expires after `ttl` by the wall clock.
+
+    A key is stored as its kid and its private key bytes, `ecdh_key_to_private_bytes` by default, and rebuilt from
+    them. The private keys are not encrypted, so the path must be private to the service: a new file is created
+    readable and writable by its owner only (0600), as SQLite creates its -wal and -shm files, and an existing file
+    is used as it is.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int,
+        ttl: Union[int, float],
+        encode: Callable[["ECDHKey"], bytes] = ecdh_key_to_private_bytes,
+        decode: Callable[[bytes, str], "ECDHKey"] = ecdh_key_from_private_bytes,
+    ):
+        """Create the store.
+
+        :param path: the path of the SQLite file, private to the service
+        :param max_size: the maximum number of keys
+        :param ttl: the lifetime of a key, in seconds
+        :param encode: exports the private key bytes of a key
+        :param decode: rebuilds a key from its private key bytes and kid
+        """
+        self._path: str = path
+        self._max_size: int = max_size
+        self._ttl: Union[int, float] = ttl
+        self._encode: Callable[["ECDHKey"], bytes] = encode
+        self._decode: Callable[[bytes, str], "ECDHKey"] = decode
+        self._lock: threading.Lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM ecdh_private_key").fetchone()[0]
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection of this process. A connection inherited by a fork is not reused."""
+        if self._connection is None or self._pid != os.getpid():
+            # created private before SQLite opens it. SQLite gives the -wal and -shm files the same permissions.
+            os.close(os.open(self._path, os.O_RDWR | os.O_CREAT, 0o600))
+            connection: sqlite3.Connection = sqlite3.connect(
+                self._path, timeout=10, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            # the table of the former pickled keys is dropped rather than read
+            connection.execute("DROP TABLE IF EXISTS ecdh_key")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS ecdh_private_key "
+                "(kid TEXT PRIMARY KEY, private_key BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ecdh_private_key_expires_at ON ecdh_private_key (expires_at)"
+            )
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM ecdh_private_key")
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    def delete(self, kid: str):
+        with self._lock:
+            self._connect().execute("DELETE FROM ecdh_private_key WHERE kid = ?", (kid,))
+
+    def get(self, kid: str) -> Optional["ECDHKey"]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT private_key FROM ecdh_private_key WHERE kid = ? AND expires_at > ?", (kid, time.time())
+                )
+                .fetchone()
+            )
+        return self._decode(row[0], kid) if row else None
+
+    def put(self, kid: str, key: "ECDHKey"):
+        private_bytes: bytes = self._encode(key)
+        with self._lock:
+            connection: sqlite3.Connection = self._connect()
+            now: float = time.time()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute(
+                    "INSERT OR REPLACE INTO ecdh_private_key (kid, private_key, expires_at) VALUES (?, ?, ?)",
+                    (kid, private_bytes, now + self._ttl),
+                )
+                connection.execute("DELETE FROM ecdh_private_key WHERE expires_at <= ?", (now,))
+                connection.execute(
+                    "DELETE FROM ecdh_private_key WHERE kid IN "
+                    "(SELECT kid FROM ecdh_private_key ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self._max_size,),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
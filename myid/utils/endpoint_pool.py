@@ -0,0 +1,237 @@
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Union
+
+from myid.config import settings
+from myid.utils.metrics import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class EndpointStats:
+    url: str
+    state: str
+    in_flight: int
+    requests: int
+    failures: int
+    latency: Optional[float]
+    hedges: int
+    hedge_wins: int
+
+    @property
+    def healthy(self) -> bool:
+        return self.state == CLOSED
+
+
+class Endpoint:
+    """The counters of one endpoint. They are only changed by its `EndpointPool`, under the lock of the pool."""
+
+    def __init__(self, url: str):
+        self.url: str = url
+        self.latency: Optional[float] = None
+        self.last_used: float = 0
+        self.in_flight: int = 0
+        self.requests: int = 0
+        self.failures: int = 0
+        self.consecutive_failures: int = 0
+        self.opened_at: Optional[float] = None
+        self.probing: bool = False
+        self.hedges: int = 0
+        self.hedge_wins: int = 0
+
+
+class EndpointPool:
+    """A pool of replicas of the IV WAS with latency-aware load balancing and a circuit breaker per endpoint.
+
+    Each request goes to the better of two endpoints picked at random, scored by the moving average of their latency
+    times the requests they have in flight. An endpoint unused for `STALE_SECONDS` scores 0, so a replica that was
+    slow is tried again. After `failure_threshold` consecutive failures, the breaker of an endpoint opens and it gets
+    no request for `open_seconds`; then a single probe is let through, which closes the breaker again on success.
+
+    The latencies of the pool also give the delay after which a read is hedged: the `hedge_percentile` of the recent
+    latencies, so that only the slowest reads send a backup request.
+    """
+
+    EWMA_ALPHA = 0.2
+    STALE_SECONDS = 5
+    LATENCY_WINDOW = 512
+    MIN_HEDGE_SAMPLES = 20
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        failure_threshold: int = None,
+        open_seconds: Union[int, float] = None,
+        hedge: bool = None,
+        hedge_percentile: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create the pool. Omitted arguments fall back to `MyIdSettings`.
+
+        :param urls: the endpoints of the replicas
+        :param failure_threshold: the number of consecutive failures that opens the breaker of an endpoint
+        :param open_seconds: how long an open breaker rejects requests before letting a probe through, in seconds
+        :param hedge: whether the reads send a backup request to another endpoint when they are slow
+        :param hedge_percentile: the percentile of the recent latencies after which a read is hedged
+        :param clock: the monotonic clock of the breakers and of the staleness of the latencies
+        """
+        if not urls:
+            raise ValueError("The pool needs at least one endpoint.")
+        self._endpoints: List[Endpoint] = [Endpoint(url) for url in urls]
+        self._failure_threshold: int = (
+            settings.MYIDSDK_WAS_BREAKER_FAILURES if failure_threshold is None else failure_threshold
+        )
+        self._open_seconds: Union[int, float] = (
+            settings.MYIDSDK_WAS_BREAKER_OPEN_SECONDS if open_seconds is None else open_seconds
+        )
+        self._hedge: bool = settings.MYIDSDK_WAS_HEDGE if hedge is None else hedge
+        self._hedge_percentile: float = (
+            settings.MYIDSDK_WAS_HEDGE_PERCENTILE if hedge_percentile is None else hedge_percentile
+        )
+        self._clock: Callable[[], float] = clock
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self._hedge_delay: Optional[float] = None
+        self._samples_since_delay: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._endpoints)
+
+    @property
+    def stats(self) -> Dict[str, EndpointStats]:
+        """The health, load and latency of each endpoint, by URL."""
+        with self._lock:
+            now: float = self._clock()
+            return {
+                endpoint.url: EndpointStats(
+                    url=endpoint.url,
+                    state=self._state(endpoint, now),
+                    in_flight=endpoint.in_flight,
+                    requests=endpoint.requests,
+                    failures=endpoint.failures,
+                    latency=endpoint.latency,
+                    hedges=endpoint.hedges,
+                    hedge_wins=endpoint.hedge_wins,
+                )
+                for endpoint in self._endpoints
+            }
+
+    @property
+    def urls(self) -> List[str]:
+        return [endpoint.url for endpoint in self._endpoints]
+
+    def _available(self, endpoint: Endpoint, now: float) -> bool:
+        state: str = self._state(endpoint, now)
+        return state == CLOSED or (state == HALF_OPEN and not endpoint.probing)
+
+    def _score(self, endpoint: Endpoint, now: float) -> float:
+        if endpoint.latency is None or now - endpoint.last_used > self.STALE_SECONDS:
+            return 0
+        return endpoint.latency * (endpoint.in_flight + 1)
+
+    def _state(self, endpoint: Endpoint, now: float) -> str:
+        if endpoint.opened_at is None:
+            return CLOSED
+        return OPEN if now - endpoint.opened_at < self._open_seconds else HALF_OPEN
+
+    def acquire(self, exclude: Sequence[Endpoint] = ()) -> Optional[Endpoint]:
+        """Choose the endpoint of a request and count it in flight until `release`.
+
+        When every breaker is open, the endpoint whose breaker opened first is tried anyway, so that the pool does not
+        fail faster than a single endpoint would.
+
+        :param exclude: the endpoints already tried by the request
+        :return: the endpoint, or None if all of them are excluded
+        """
+        with self._lock:
+            now: float = self._clock()
+            candidates: List[Endpoint] = [e for e in self._endpoints if e not in exclude and self._available(e, now)]
+            if len(candidates) > 2:
+                candidates = random.sample(candidates, 2)
+            if candidates:
+                endpoint: Endpoint = min(candidates, key=lambda e: self._score(e, now))
+            else:
+                remaining: List[Endpoint] = [e for e in self._endpoints if e not in exclude]
+                if not remaining:
+                    return None
+                endpoint = min(remaining, key=lambda e: e.opened_at)
+            if endpoint.opened_at is not None:
+                endpoint.probing = True
+            endpoint.in_flight += 1
+            endpoint.last_used = now
+            return endpoint
+
+    def hedge_delay(self) -> Optional[float]:
+        """The delay after which a read sends a backup request, in seconds.
+
+        :return: the delay, or None if hedging is disabled, the pool has a single endpoint or too few latencies
+            were observed yet
+        """
+        if not self._hedge or len(self._endpoints) < 2:
+            return None
+        with self._lock:
+            if self._samples_since_delay >= self.MIN_HEDGE_SAMPLES and len(self._latencies) >= self.MIN_HEDGE_SAMPLES:
+                latencies: List[float] = sorted(self._latencies)
+                self._hedge_delay = latencies[int(self._hedge_percentile / 100 * (len(latencies) - 1))]
+                self._samples_since_delay = 0
+            return self._hedge_delay
+
+    def record_hedge(self, endpoint: Endpoint, won: bool = False):
+        """Count a backup request sent to the endpoint, or one that answered before the request it backed up."""
+        with self._lock:
+            if won:
+                endpoint.hedge_wins += 1
+            else:
+                endpoint.hedges += 1
+        if not won:
+            metrics.inc("myid_was_hedges_total")
+
+    def release(self, endpoint: Endpoint, seconds: Optional[float], success: Optional[bool]):
+        """Record the end of a request.
+
+        :param endpoint: the endpoint returned by `acquire`
+        :param seconds: the duration of the request
+        :param success: whether the endpoint answered, even with a client error. None if the request was cancelled.
+        """
+        opened: bool = False
+        with self._lock:
+            endpoint.in_flight -= 1
+            was_probing: bool = endpoint.probing
+            endpoint.probing = False
+            if success is None:
+                return
+            endpoint.requests += 1
+            if success:
+                endpoint.consecutive_failures = 0
+                endpoint.opened_at = None
+                endpoint.latency = (
+                    seconds
+                    if endpoint.latency is None
+                    else self.EWMA_ALPHA * seconds + (1 - self.EWMA_ALPHA) * endpoint.latency
+                )
+                self._latencies.append(seconds)
+                self._samples_since_delay += 1
+            else:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if was_probing or endpoint.consecutive_failures >= self._failure_threshold:
+                    opened = endpoint.opened_at is None or was_probing
+                    endpoint.opened_at = self._clock()
+        if opened:
+            metrics.inc("myid_was_breaker_opens_total", endpoint=endpoint.url)
+
+    def split(self, url: str) -> Optional[str]:
+        """Get the path of a URL on one of the endpoints, to send it to another one.
+
+        :return: the path, or None if the URL is not on an endpoint of the pool
+        """
+        for endpoint in self._endpoints:
+            if url.startswith(endpoint.url):
+                return url[len(endpoint.url) :]
+        return None
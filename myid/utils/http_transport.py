@@ -0,0 +1,296 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from myid.config import settings
+from myid.utils import JSON_HEADERS, HttpUtil
+from myid.utils.endpoint_pool import Endpoint, EndpointPool
+from myid.utils.metrics import metrics
+from myid.vo.codec import VOCodec
+from myid.vo.result_response import ResultResponse
+
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+
+class HttpTransport:
+    """Keep-alive HTTP transport for the IV WAS.
+
+    Unlike `HttpUtil`, which opens a new `requests.Session` per call, a transport keeps one session
+    whose connection pool is reused by every request, so consecutive calls skip the TCP/TLS handshake.
+    The session is created on the first request, so a process that never calls the WAS does not import `requests`.
+    """
+
+    RETRY_STATUS_CODES = (502, 503, 504)
+
+    def __init__(
+        self,
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        connect_timeout: Union[int, float] = None,
+        read_timeout: Union[int, float] = None,
+        retry_count: int = None,
+        retry_backoff_factor: float = None,
+    ):
+        """Create the transport. Omitted arguments fall back to `MyIdSettings`.
+
+        :param pool_connections: the number of per-host connection pools to cache
+        :param pool_maxsize: the maximum number of connections kept alive per host
+        :param connect_timeout: the connect timeout, in seconds
+        :param read_timeout: the read timeout, in seconds
+        :param retry_count: the number of retries. POST is retried only when the connection could not be established.
+        :param retry_backoff_factor: the backoff factor between retries, in seconds
+        """
+        self._timeout: Tuple[float, float] = (
+            settings.MYIDSDK_HTTP_CONNECT_TIMEOUT if connect_timeout is None else connect_timeout,
+            settings.MYIDSDK_HTTP_READ_TIMEOUT if read_timeout is None else read_timeout,
+        )
+        self._pool_connections: int = (
+            settings.MYIDSDK_HTTP_POOL_CONNECTIONS if pool_connections is None else pool_connections
+        )
+        self._pool_maxsize: int = settings.MYIDSDK_HTTP_POOL_MAXSIZE if pool_maxsize is None else pool_maxsize
+        self._retry_count: int = settings.MYIDSDK_HTTP_RETRY_COUNT if retry_count is None else retry_count
+        self._retry_backoff_factor: float = (
+            settings.MYIDSDK_HTTP_RETRY_BACKOFF_FACTOR if retry_backoff_factor is None else retry_backoff_factor
+        )
+        self._session: Optional["requests.Session"] = None
+        self._session_lock: threading.Lock = threading.Lock()
+
+    def __enter__(self) -> "HttpTransport":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self._timeout
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry: Retry = Retry(
+            total=self._retry_count,
+            backoff_factor=self._retry_backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        adapter: HTTPAdapter = HTTPAdapter(
+            pool_connections=self._pool_connections, pool_maxsize=self._pool_maxsize, max_retries=retry
+        )
+        session: requests.Session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_session(self) -> "requests.Session":
+        session: Optional["requests.Session"] = self._session
+        if session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+                session = self._session
+        return session
+
+    @staticmethod
+    def _record_retries(url: str, response: "requests.Response"):
+        """Count the retries made by urllib3 for the response into `myid_retries_total`."""
+        retries: Optional["Retry"] = getattr(response.raw, "retries", None)
+        if retries is not None and retries.history:
+            metrics.inc("myid_retries_total", len(retries.history), operation="http", path=HttpUtil.api_path(url))
+
+    def _send(self, method: str, url: str, body: bytes = None) -> "requests.Response":
+        with HttpUtil.timer(method, url):
+            response: "requests.Response" = self._get_session().request(
+                method, url, data=body, headers=JSON_HEADERS if body is not None else None, timeout=self._timeout
+            )
+        if metrics.enabled:
+            self._record_retries(url, response)
+        return response
+
+    def close(self):
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def get(self, url: str) -> ResultResponse:
+        try:
+            return HttpUtil.to_result_response(self._send("GET", url))
+        except Exception as e:
+            return ResultResponse(status=False, result=str(e))
+
+    def post(self, url: str, json: Any = None, content: bytes = None) -> ResultResponse:
+        """Post a JSON body.
+
+        :param url: the URL
+        :param json: the body to encode
+        :param content: the already encoded body, e.g. by `VOCodec.encode`. It takes precedence over `json`.
+        """
+        try:
+            body: bytes = content if content is not None else VOCodec.dumps(json)
+            return HttpUtil.to_result_response(self._send("POST", url, body))
+        except Exception as e:
+            return ResultResponse(status=False, result=str(e))
+
+
+class PooledHttpTransport(HttpTransport):
+    """`HttpTransport` over a pool of replicas of the IV WAS.
+
+    A request to a URL on any endpoint of the pool is sent to the endpoint chosen by the `EndpointPool`, so services
+    keep building their URLs on the first endpoint. A GET only reads, so it is sent to another endpoint when one fails
+    or answers with a server error, and it is hedged when the pool enables it: once the hedge delay elapses, a backup
+    request is sent to another endpoint and the first answer wins. The slower request completes in the background and
+    still feeds the latencies. A POST is only sent to another endpoint when the connection could not be established.
+    Retries go to the other endpoints rather than the same one, so the urllib3 retries are disabled by default.
+    """
+
+    NO_ENDPOINT = "No WAS endpoint is available."
+
+    def __init__(
+        self,
+        endpoints: Union[Sequence[str], EndpointPool],
+        pool_connections: int = None,
+        pool_maxsize: int = None,
+        connect_timeout: Union[int, float] = None,
+        read_timeout: Union[int, float] = None,
+        retry_count: int = 0,
+        retry_backoff_factor: float = None,
+    ):
+        """Create the transport. Omitted arguments fall back to `MyIdSettings`.
+
+        :param endpoints: the endpoints of the replicas, or a pool to share with other transports
+        :param pool_connections: the number of per-host connection pools to cache
+        :param pool_maxsize: the maximum number of connections kept alive per host
+        :param connect_timeout: the connect timeout, in seconds
+        :param read_timeout: the read timeout, in seconds
+        :param retry_count: the number of retries on the same endpoint
+        :param retry_backoff_factor: the backoff factor between retries, in seconds
+        """
+        super().__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            connect_timeout=connect_timeout,
+            read_timeout=read_timeout,
+            retry_count=retry_count,
+            retry_backoff_factor=retry_backoff_factor,
+        )
+        self._pool: EndpointPool = endpoints if isinstance(endpoints, EndpointPool) else EndpointPool(endpoints)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pool(self) -> EndpointPool:
+        return self._pool
+
+    def _attempt(self, endpoint: Endpoint, method: str, path: str, body: bytes = None) -> Tuple[bool, ResultResponse]:
+        """Send a request to an endpoint and record its outcome in the pool.
+
+        :return: whether the request may be sent to another endpoint, and the response
+        """
+        started: float = time.perf_counter()
+        try:
+            response: "requests.Response" = self._send(method, endpoint.url + path, body)
+        except Exception as e:
+            self._pool.release(endpoint, time.perf_counter() - started, success=False)
+            return method == "GET" or self._not_sent(e), ResultResponse(status=False, result=str(e))
+
+        success: bool = response.status_code < 500
+        self._pool.release(endpoint, time.perf_counter() - started, success=success)
+        try:
+            result_response: ResultResponse = HttpUtil.to_result_response(response)
+        except Exception as e:
+            result_response = ResultResponse(status=False, result=str(e))
+        return method == "GET" and not success, result_response
+
+    def _failover(self, method: str, path: str, body: bytes = None) -> ResultResponse:
+        tried: List[Endpoint] = []
+        result_response: ResultResponse = ResultResponse(status=False, result=self.NO_ENDPOINT)
+        while True:
+            endpoint: Optional[Endpoint] = self._pool.acquire(exclude=tried)
+            if endpoint is None:
+                return result_response
+            tried.append(endpoint)
+            retry, result_response = self._attempt(endpoint, method, path, body)
+            if not retry:
+                return result_response
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        executor: Optional[ThreadPoolExecutor] = self._executor
+        if executor is None:
+            with self._session_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._pool_maxsize * len(self._pool), thread_name_prefix="myid-was-pool"
+                    )
+                executor = self._executor
+        return executor
+
+    def _hedged_get(self, path: str, delay: float) -> ResultResponse:
+        executor: ThreadPoolExecutor = self._get_executor()
+        tried: List[Endpoint] = []
+        pending: Dict[Future, Endpoint] = {}
+        backup: Optional[Endpoint] = None
+        hedged: bool = False
+        result_response: ResultResponse = ResultResponse(status=False, result=self.NO_ENDPOINT)
+        start: bool = True
+        while True:
+            if start:
+                endpoint: Optional[Endpoint] = self._pool.acquire(exclude=tried)
+                if endpoint is None:
+                    if not pending:
+                        return result_response
+                    # no other endpoint to hedge with: wait for the request in flight
+                    hedged = True
+                else:
+                    if pending:
+                        backup, hedged = endpoint, True
+                        self._pool.record_hedge(endpoint)
+                    tried.append(endpoint)
+                    pending[executor.submit(self._attempt, endpoint, "GET", path)] = endpoint
+
+            timeout: Optional[float] = None if hedged or len(pending) > 1 else delay
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                endpoint = pending.pop(future)
+                retry, result_response = future.result()
+                if not retry:
+                    if endpoint is backup:
+                        self._pool.record_hedge(endpoint, won=True)
+                    return result_response
+            # send the backup once the delay elapsed, or the next request once all of them failed
+            start = not done or not pending
+
+    @staticmethod
+    def _not_sent(error: Exception) -> bool:
+        import requests
+        from urllib3.exceptions import NewConnectionError
+
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        reason: Any = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(error, requests.exceptions.ConnectionError) and isinstance(reason, NewConnectionError)
+
+    def close(self):
+        with self._session_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        super().close()
+
+    def get(self, url: str) -> ResultResponse:
+        path: Optional[str] = self._pool.split(url)
+        if path is None:
+            return super().get(url)
+        delay: Optional[float] = self._pool.hedge_delay()
+        return self._failover("GET", path) if delay is None else self._hedged_get(path, delay)
+
+    def post(self, url: str, json: Any = None, content: bytes = None) -> ResultResponse:
+        path: Optional[str] = self._pool.split(url)
+        if path is None:
+            return super().post(url, json=json, content=content)
+        return self._failover("POST", path, content if content is not None else VOCodec.dumps(json))
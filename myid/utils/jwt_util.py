@@ -0,0 +1,33 @@
+import base64
+import json
+
+
+class JwtUtil:
+    @staticmethod
+    def get_signature(encoded_jwt: str) -> str:
+        """Get the signature part of the JWT without decoding it, like `Jwt.decode(encoded_jwt).signature`.
+
+        :param encoded_jwt: the compact serialized JWT
+        :return: the signature. An empty string if the JWT is not signed.
+        """
+        parts = encoded_jwt.split(".")
+        return parts[2] if len(parts) > 2 else ""
+
+    @staticmethod
+    def decode_payload(encoded_jwt: str) -> dict:
+        """Decode the payload of the JWT without verifying it.
+
+        :param encoded_jwt: the compact serialized JWT
+        :return: the claims of the payload. An empty dict if the JWT is malformed.
+        """
+        parts = encoded_jwt.split(".")
+        if len(parts) < 2:
+            return {}
+
+        try:
+            payload: bytes = base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4))
+            claims = json.loads(payload)
+        except ValueError:
+            return {}
+
+        return claims if isinstance(claims, dict) else {}
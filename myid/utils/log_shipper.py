@@ -0,0 +1,208 @@
+import atexit
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, List, Optional, Tuple, Union
+
+from loguru import logger
+
+from myid.config import settings
+from myid.utils.http_transport import HttpTransport
+from myid.vo.codec import VOCodec
+from myid.vo.result_response import ResultResponse
+
+# the shippers with a running thread, drained at interpreter exit. Weak, so the exit hook keeps none of them alive.
+_running_shippers: "weakref.WeakSet[LogShipper]" = weakref.WeakSet()
+
+
+@dataclass(frozen=True)
+class LogShipperStats:
+    pending: int
+    shipped: int
+    failed: int
+    dropped: int
+
+
+class LogShipper:
+    """Ships the log records of the IV WAS (`ISS_VC_LOG`, `ISS_VP_LOG`, `VRF_VP_LOG`) from a background thread.
+
+    `ship` only puts the record into a bounded queue, so the caller does not wait for the log round-trip.
+    The thread takes the records in batches of up to `batch_size`, or whatever is queued after `flush_interval`,
+    and posts them over a keep-alive `HttpTransport`. The queue is drained on `flush`, `close` and interpreter exit.
+    The thread is started by the first record and stops after `idle_timeout` without records, so a shipper that is
+    discarded without `close` is not kept alive by it.
+
+    When the queue is full, a record is dropped, or the caller waits up to `block_timeout` for room if
+    `block_when_full` is set. The dropped and failed records are counted in `stats`.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        transport: HttpTransport = None,
+        max_queue_size: int = None,
+        batch_size: int = None,
+        flush_interval: Union[int, float] = None,
+        block_when_full: bool = None,
+        block_timeout: Union[int, float] = None,
+        idle_timeout: Union[int, float] = None,
+    ):
+        """Create the shipper. Omitted arguments fall back to `MyIdSettings`.
+
+        :param url: the IV WAS endpoint
+        :param transport: the HTTP transport to post the records. A new one is created and owned if omitted.
+        :param max_queue_size: the maximum number of queued records
+        :param batch_size: the maximum number of records posted in a batch
+        :param flush_interval: the maximum time a record waits for its batch to fill, in seconds
+        :param block_when_full: wait for room instead of dropping the record when the queue is full
+        :param block_timeout: the maximum time to wait for room, in seconds
+        :param idle_timeout: the time without records after which the thread stops, in seconds
+        """
+        self._url: str = url
+        self._owns_transport: bool = transport is None
+        self._transport: HttpTransport = transport if transport else HttpTransport()
+        self._max_queue_size: int = max_queue_size or settings.MYIDSDK_LOG_SHIP_QUEUE_SIZE
+        self._batch_size: int = batch_size or settings.MYIDSDK_LOG_SHIP_BATCH_SIZE
+        self._flush_interval: Union[int, float] = (
+            settings.MYIDSDK_LOG_SHIP_FLUSH_INTERVAL if flush_interval is None else flush_interval
+        )
+        self._block_when_full: bool = (
+            settings.MYIDSDK_LOG_SHIP_BLOCK_WHEN_FULL if block_when_full is None else block_when_full
+        )
+        self._block_timeout: Union[int, float] = (
+            settings.MYIDSDK_LOG_SHIP_BLOCK_TIMEOUT if block_timeout is None else block_timeout
+        )
+        self._idle_timeout: Union[int, float] = (
+            settings.MYIDSDK_LOG_SHIP_IDLE_TIMEOUT if idle_timeout is None else idle_timeout
+        )
+        self._records: Deque[Tuple[str, bytes]] = deque()
+        self._condition: threading.Condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed: bool = False
+        self._flushing: int = 0
+        self._pending: int = 0
+        self._shipped: int = 0
+        self._failed: int = 0
+        self._dropped: int = 0
+
+    def __enter__(self) -> "LogShipper":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _next_batch(self) -> List[Tuple[str, bytes]]:
+        """Wait for the next batch. An empty batch means the shipper is closed and drained, or idle."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._records or self._closed, self._idle_timeout):
+                # the next record starts a new thread
+                self._thread = None
+                _running_shippers.discard(self)
+                return []
+            deadline: float = time.monotonic() + self._flush_interval
+            while len(self._records) < self._batch_size and not self._closed and not self._flushing:
+                remaining: float = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            batch: List[Tuple[str, bytes]] = [
+                self._records.popleft() for _ in range(min(self._batch_size, len(self._records)))
+            ]
+            self._condition.notify_all()
+            return batch
+
+    def _post(self, path: str, body: bytes) -> bool:
+        result_response: ResultResponse = self._transport.post(url=self._url + path, content=body)
+        if not result_response.status:
+            logger.debug(f"Failed to ship the log to {path}: {result_response.result}")
+        return result_response.status
+
+    def _run(self):
+        while True:
+            batch: List[Tuple[str, bytes]] = self._next_batch()
+            if not batch:
+                return
+
+            shipped: int = sum(self._post(path, body) for path, body in batch)
+            with self._condition:
+                self._pending -= len(batch)
+                self._shipped += shipped
+                self._failed += len(batch) - shipped
+                self._condition.notify_all()
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="myid-log-shipper", daemon=True)
+        self._thread.start()
+        _running_shippers.add(self)
+
+    @property
+    def stats(self) -> LogShipperStats:
+        with self._condition:
+            return LogShipperStats(
+                pending=self._pending, shipped=self._shipped, failed=self._failed, dropped=self._dropped
+            )
+
+    def close(self, timeout: Union[int, float] = None):
+        """Ship the queued records and stop the thread. Records shipped afterwards are dropped.
+
+        :param timeout: the maximum time to wait for the queue to drain, in seconds. No limit if omitted.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+            thread: Optional[threading.Thread] = self._thread
+
+        if thread:
+            thread.join(timeout)
+        _running_shippers.discard(self)
+        if self._owns_transport:
+            self._transport.close()
+
+    def flush(self, timeout: Union[int, float] = None) -> bool:
+        """Wait until every queued record is shipped.
+
+        :param timeout: the maximum time to wait, in seconds. No limit if omitted.
+        :return: False if records are still pending after the timeout
+        """
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(lambda: self._pending == 0, timeout)
+            finally:
+                self._flushing -= 1
+
+    def ship(self, path: str, record: Any) -> bool:
+        """Queue the log record.
+
+        :param path: the log API path, e.g. `APIPath.ISS_VC_LOG`
+        :param record: the log record, a dataclass or a dict
+        :return: False if the record is dropped
+        """
+        body: bytes = VOCodec.dumps(record) if isinstance(record, dict) else VOCodec.encode(record)
+        with self._condition:
+            if not self._closed and len(self._records) >= self._max_queue_size and self._block_when_full:
+                self._condition.wait_for(
+                    lambda: len(self._records) < self._max_queue_size or self._closed, self._block_timeout
+                )
+            if self._closed or len(self._records) >= self._max_queue_size:
+                self._dropped += 1
+                return False
+
+            self._records.append((path, body))
+            self._pending += 1
+            if not self._thread:
+                self._start()
+            self._condition.notify_all()
+            return True
+
+
+@atexit.register
+def _close_running_shippers():
+    for log_shipper in list(_running_shippers):
+        log_shipper.close()
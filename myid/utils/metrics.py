@@ -0,0 +1,260 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from myid.config import settings
+
+F = TypeVar("F", bound=Callable)
+Labels = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+@dataclass(frozen=True)
+class MetricEvent:
+    kind: str
+    name: str
+    value: float
+    labels: Dict[str, str]
+
+
+@dataclass(frozen=True)
+class HistogramStats:
+    count: int
+    sum: float
+    buckets: Tuple[Tuple[float, int], ...]
+
+
+class _Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.counts: List[int] = [0] * size
+        self.sum: float = 0.0
+        self.count: int = 0
+
+
+class _Timer:
+    __slots__ = ("_registry", "_name", "_labels", "_started")
+
+    def __init__(self, registry: "MetricsRegistry", name: str, labels: Dict[str, str]):
+        self._registry: MetricsRegistry = registry
+        self._name: str = name
+        self._labels: Dict[str, str] = labels
+
+    def __enter__(self) -> "_Timer":
+        self._started: float = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._registry.observe(self._name, time.perf_counter() - self._started, **self._labels)
+
+
+class _NullTimer:
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _label_key(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = ((key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in labels)
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class MetricsRegistry:
+    """An in-process registry of the counters and latency histograms of the SDK.
+
+    The SDK records the WAS calls per `APIPath`, DID resolution, JWT verify/sign, JWE decrypt, the submission and
+    confirmation of transactions, retries and cache hits. Read them with `to_prometheus`, or forward every
+    observation to hooks, e.g. to feed OpenTelemetry instruments.
+
+    A disabled registry records nothing: the instrumented functions check one flag and call straight through.
+    """
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """Create the registry.
+
+        :param enabled: record the observations
+        :param buckets: the upper bounds of the histogram buckets, in seconds
+        """
+        self._enabled: bool = enabled
+        self._buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._lock: threading.Lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._hooks: List[Callable[[MetricEvent], None]] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def _emit(self, kind: str, name: str, value: float, labels: Dict[str, str]):
+        if self._hooks:
+            event: MetricEvent = MetricEvent(kind=kind, name=name, value=value, labels=labels)
+            for hook in list(self._hooks):
+                hook(event)
+
+    def _observe(self, name: str, value: float, key: Labels, labels: Dict[str, str]):
+        with self._lock:
+            series: Dict[Labels, _Histogram] = self._histograms.setdefault(name, {})
+            histogram: Optional[_Histogram] = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(len(self._buckets))
+            index: int = bisect.bisect_left(self._buckets, value)
+            if index < len(self._buckets):
+                histogram.counts[index] += 1
+            histogram.sum += value
+            histogram.count += 1
+        self._emit("histogram", name, value, labels)
+
+    def add_hook(self, hook: Callable[[MetricEvent], None]):
+        """Call the hook with every observation while the registry is enabled.
+
+        :param hook: called on the observing thread, so it should be fast and must not raise
+        """
+        self._hooks.append(hook)
+
+    def counter(self, name: str, **labels) -> float:
+        """The value of the counter, 0 if it is not recorded."""
+        with self._lock:
+            return self._counters.get(name, {}).get(_label_key(labels), 0)
+
+    def disable(self):
+        self._enabled = False
+
+    def enable(self):
+        self._enabled = True
+
+    def histogram(self, name: str, **labels) -> Optional[HistogramStats]:
+        """The snapshot of the histogram, None if it is not recorded."""
+        with self._lock:
+            histogram: Optional[_Histogram] = self._histograms.get(name, {}).get(_label_key(labels))
+            if histogram is None:
+                return None
+            return HistogramStats(
+                count=histogram.count, sum=histogram.sum, buckets=tuple(zip(self._buckets, histogram.counts))
+            )
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increase the counter.
+
+        :param name: the metric name, e.g. `myid_retries_total`
+        :param amount: the increase
+        :param labels: the label values
+        """
+        if not self._enabled:
+            return
+        key: Labels = _label_key(labels)
+        with self._lock:
+            series: Dict[Labels, float] = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+        self._emit("counter", name, amount, labels)
+
+    def observe(self, name: str, value: float, **labels):
+        """Record the value in the histogram.
+
+        :param name: the metric name, e.g. `myid_http_request_seconds`
+        :param value: the observed value, in seconds for latencies
+        :param labels: the label values
+        """
+        if self._enabled:
+            self._observe(name, value, _label_key(labels), labels)
+
+    def remove_hook(self, hook: Callable[[MetricEvent], None]):
+        self._hooks.remove(hook)
+
+    def reset(self):
+        """Drop every recorded value. The hooks are kept."""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def timed(self, name: str, **labels) -> Callable[[F], F]:
+        """Decorate a function or a coroutine function to record its latency in the histogram.
+
+        :param name: the metric name
+        :param labels: the label values
+        """
+        key: Labels = _label_key(labels)
+
+        def decorator(func: F) -> F:
+            if inspect.iscoroutinefunction(func):
+
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not self._enabled:
+                        return await func(*args, **kwargs)
+                    started: float = time.perf_counter()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        self._observe(name, time.perf_counter() - started, key, labels)
+
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self._enabled:
+                    return func(*args, **kwargs)
+                started: float = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._observe(name, time.perf_counter() - started, key, labels)
+
+            return wrapper
+
+        return decorator
+
+    def timer(self, name: str, **labels):
+        """A context manager recording the latency of its block in the histogram.
+
+        :param name: the metric name
+        :param labels: the label values
+        """
+        return _Timer(self, name, labels) if self._enabled else _NULL_TIMER
+
+    def to_prometheus(self) -> str:
+        """Dump every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(series.items(), key=lambda item: item[0]):
+                    cumulative: int = 0
+                    for bound, count in zip(self._buckets, histogram.counts):
+                        cumulative += count
+                        bucket_labels: Labels = labels + (("le", _format_value(bound)),)
+                        lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+metrics: MetricsRegistry = MetricsRegistry(enabled=settings.MYIDSDK_METRICS_ENABLED)
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from myid.config import settings
+from myid.utils.metrics import metrics
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SingleFlightStats:
+    calls: int
+    executions: int
+
+    @property
+    def coalesced(self) -> int:
+        """The calls that shared the execution of another call."""
+        return self.calls - self.executions
+
+    @property
+    def coalescing_ratio(self) -> float:
+        return self.coalesced / self.calls if self.calls else 0.0
+
+
+class _Call:
+    __slots__ = ("done", "result", "exception")
+
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.exception: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce the concurrent calls with the same key into one execution.
+
+    The first caller of a key runs the function, and the callers arriving while it is in flight wait for it and get
+    its result or exception. Nothing is kept once it completes, so the next call runs again: it is not a cache,
+    and it works the same with or without one in front. Threads use `do` and coroutines use `do_async`;
+    the two do not share their flights.
+    """
+
+    def __init__(self, name: str = None, enabled: bool = None):
+        """Create the single-flight group.
+
+        :param name: the `flight` label of the calls in `metrics`. They are not recorded if omitted.
+        :param enabled: run every call on its own if False. `MYIDSDK_SINGLE_FLIGHT` is used if omitted.
+        """
+        self._name: Optional[str] = name
+        self._enabled: bool = settings.MYIDSDK_SINGLE_FLIGHT if enabled is None else enabled
+        self._lock: threading.Lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], asyncio.Future] = {}
+        self._call_count: int = 0
+        self._execution_count: int = 0
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        return SingleFlightStats(calls=self._call_count, executions=self._execution_count)
+
+    def _count(self, executed: bool):
+        with self._lock:
+            self._call_count += 1
+            self._execution_count += executed
+        if self._name and metrics.enabled:
+            metrics.inc(
+                "myid_single_flight_calls_total", flight=self._name, result="executed" if executed else "shared"
+            )
+
+    def _finish(self, task_key: Tuple[asyncio.AbstractEventLoop, Hashable], task: asyncio.Future):
+        if self._tasks.get(task_key) is task:
+            del self._tasks[task_key]
+        # retrieved here, so it is not reported as never retrieved when every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def do(self, key: Hashable, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call the function, or wait for the call of the same key in flight on another thread.
+
+        :param key: the identity of the call, e.g. the arguments of a lookup
+        :param func: the function to call
+        :return: the result of the function. Its exception is raised to every caller sharing the call.
+        """
+        if not self._enabled:
+            self._count(executed=True)
+            return func(*args, **kwargs)
+
+        with self._lock:
+            call: Optional[_Call] = self._calls.get(key)
+            leader: bool = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        self._count(executed=leader)
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Await the coroutine function, or the call of the same key in flight in this event loop.
+
+        The call runs in its own task, so a cancelled caller does not cancel it for the others.
+
+        :param key: the identity of the call, e.g. the arguments of a lookup
+        :param func: the coroutine function to call
+        :return: the result of the coroutine. Its exception is raised to every caller sharing the call.
+        """
+        if not self._enabled:
+            self._count(executed=True)
+            return await func(*args, **kwargs)
+
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        task_key: Tuple[asyncio.AbstractEventLoop, Hashable] = (loop, key)
+        task: Optional[asyncio.Future] = self._tasks.get(task_key)
+        leader: bool = task is None
+        if leader:
+            task = self._tasks[task_key] = loop.create_task(func(*args, **kwargs))
+            task.add_done_callback(lambda done: self._finish(task_key, done))
+        self._count(executed=leader)
+
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable):
+        """Let the next calls of the key run again instead of joining the one in flight, e.g. after a write.
+
+        The callers already waiting still get the result of the call in flight.
+
+        :param key: the identity of the call
+        """
+        with self._lock:
+            self._calls.pop(key, None)
+        for task_key in [task_key for task_key in self._tasks if task_key[1] == key]:
+            del self._tasks[task_key]
+
+    def forget_all(self):
+        """Let the next calls of every key run again instead of joining the ones in flight."""
+        with self._lock:
+            self._calls.clear()
+        self._tasks.clear()
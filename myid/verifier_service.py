@@ -1,3 +1,8 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
 from coincurve import PublicKey
 from didsdk.core.did_key_holder import DidKeyHolder
 from didsdk.credential import Credential
@@ -11,66 +16,372 @@ from didsdk.protocol.protocol_message import ProtocolMessage, SignResult
 from didsdk.protocol.protocol_type import ProtocolType
 from jwcrypto.jwe import JWE
 
-from myid.base_service import BaseService, ServiceResult
+from myid.base_service import BaseService
+from myid.config import settings
 from myid.core.api_path import APIPath
-from myid.utils import HttpUtil
+from myid.service_result import ServiceResult
+from myid.utils.cache import TTLCache
+from myid.utils.crypto_engine import CryptoEngine
+from myid.utils.ecdh_key_store import EcdhKeyStore
+from myid.utils.http_transport import HttpTransport
+from myid.utils.log_shipper import LogShipper
+from myid.utils.metrics import metrics
+from myid.vo.presentation_log_request import PresentationLogRequest
 from myid.vo.result_response import ResultResponse
 from myid.vo.vc_request import VCRequest
 
 
+@dataclass(frozen=True)
+class VerificationContext:
+    """The ready-to-use verification material of an issuer key, built from one DID document."""
+
+    document: Document
+    is_revoked: bool
+    public_key: Optional[PublicKey]
+    public_key_bytes: Optional[bytes]
+
+
 class VerifierService(BaseService):
-    def __init__(self, url: str):
-        super().__init__(url=url)
+    def __init__(
+        self,
+        url: Union[str, Sequence[str]],
+        transport: HttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ):
+        super().__init__(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
+        )
+        self._verification_contexts: TTLCache = TTLCache(
+            max_size=settings.MYIDSDK_VERIFICATION_CONTEXT_CACHE_SIZE,
+            ttl=settings.MYIDSDK_DID_CACHE_TTL,
+            name="verification_context",
+        )
 
+    @metrics.timed("myid_crypto_seconds", operation="jwe_decrypt")
     def _decrypt(self, protocol_message: ProtocolMessage):
         kid: str = protocol_message.jwe_kid
-        ecdh_key: ECDHKey = self._ecdh_keys.get(kid)
+        ecdh_key: ECDHKey = self._ecdh_key_store.get(kid)
         if not ecdh_key:
             raise JweException(f"Not exist ECDHKey kid({kid})")
 
-        protocol_message.decrypt_jwe(ecdh_key)
+        if self._crypto_engine:
+            self._crypto_engine.decrypt(protocol_message, ecdh_key).result()
+        else:
+            protocol_message.decrypt_jwe(ecdh_key)
 
-    def _verified_credential_result(self, credential: Credential, holder_did: str) -> ServiceResult:
-        issuer_document: Document = self.get_did(credential.did)
-        issuer_key_property: PublicKeyProperty = issuer_document.get_public_key_property(credential.key_id)
-        if issuer_key_property.is_revoked():
-            return ServiceResult.from_fail_message("The Issuer's did is revoked.")
+    def _decrypt_credentials(self, jwe_token: str) -> Tuple[Presentation, List[Credential]]:
+        presentation: Presentation = self._decrypt_presentation(jwe_token)
+        if not presentation.credentials:
+            raise ValueError("The presentation has no credential.")
+
+        return presentation, [Credential.from_encoded_jwt(encoded_jwt) for encoded_jwt in presentation.credentials]
 
-        issuer_public_key: PublicKey = issuer_key_property.public_key
-        credential_verify_result: VerifyResult = credential.jwt.verify(issuer_public_key)
-        if not credential_verify_result.success:
-            return ServiceResult.from_verify_result(credential_verify_result)
+    def _decrypt_credentials_isolated(
+        self, jwe_token: str
+    ) -> Union[ServiceResult, Tuple[Presentation, List[Credential]]]:
+        """Same as `_decrypt_credentials`, but an error is returned as the failed result so it stays in its batch."""
+        try:
+            return self._decrypt_credentials(jwe_token)
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    def _decrypt_presentation(self, jwe_token: str) -> Presentation:
+        protocol_message: ProtocolMessage = ProtocolMessage.from_(
+            type_=ProtocolType.RESPONSE_PROTECTED_PRESENTATION.value,
+            message=JWE().deserialize(jwe_token),
+            is_protected=True,
+        )
+        self._decrypt(protocol_message)
+
+        return protocol_message.presentation
+
+    @staticmethod
+    def _finish_credential_verify(
+        credential: Credential, holder_did: str, verify_result: VerifyResult
+    ) -> Optional[ServiceResult]:
+        """Check the credential once its signature is verified.
+
+        :return: the failed result, or None if the credential passes the local checks
+        """
+        if not verify_result.success:
+            return ServiceResult.from_verify_result(verify_result)
 
         if holder_did != credential.target_did:
             return ServiceResult.from_fail_message("The Holder's did is not matched with target did.")
 
+        return None
+
+    def _finish_credential_verify_isolated(
+        self, credential: Credential, holder_did: str, verification: "Future[VerifyResult]"
+    ) -> Optional[ServiceResult]:
+        """Wait for the signature verification and check the credential, with an error as the failed result."""
+        try:
+            return self._finish_credential_verify(credential, holder_did, verification.result())
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    def _get_did_isolated(self, did: str) -> Union[ServiceResult, Optional[Document]]:
+        """Same as `get_did`, but an error is returned as the failed result of the issuer's credentials."""
+        try:
+            return self.get_did(did)
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    @staticmethod
+    def _is_valid_vc_result(result_response: ResultResponse) -> ServiceResult:
+        """Read the `IS_VALID_VC` response of a credential, which fails if the WAS answers it is not valid."""
+        result: ServiceResult = ServiceResult.from_result(result_response)
+        if not result.success:
+            return result
+
+        validity = result.result.get("isValid") if isinstance(result.result, dict) else result.result
+        if validity is False:
+            return ServiceResult.from_fail_message("The credential is not valid.")
+
+        return result
+
+    def _is_valid_vc_url(self, credential: Credential) -> str:
         request: VCRequest = VCRequest(nid=self.get_decimal_nid_from_did(credential.did), sig=credential.jwt.signature)
-        request_url: str = self._url + APIPath.IS_VALID_VC + request.to_query_param()
-        result_response: ResultResponse = HttpUtil.get(request_url)
+        return self._url + APIPath.IS_VALID_VC + request.to_query_param()
+
+    @staticmethod
+    def _presentation_result(presentation: Presentation, credential_results: List[ServiceResult]) -> ServiceResult:
+        for credential_result in credential_results:
+            if not credential_result.success:
+                return credential_result
 
-        return ServiceResult.from_result(result_response)
+        return ServiceResult(success=True, result=presentation)
+
+    def _ship_verification_logs(self, results: List[ServiceResult]):
+        """Queue the `VRF_VP_LOG` of the verified presentations, if `MYIDSDK_LOG_SHIP_VERIFIED_PRESENTATION` is set."""
+        if not settings.MYIDSDK_LOG_SHIP_VERIFIED_PRESENTATION:
+            return
+
+        log_date: int = int(time.time())
+        for result in results:
+            if result.success:
+                presentation: Presentation = result.result
+                self.ship_log(
+                    APIPath.VRF_VP_LOG,
+                    PresentationLogRequest(
+                        holderDid=presentation.did,
+                        vcSigs=[encoded_jwt.split(".")[-1] for encoded_jwt in presentation.credentials],
+                        logDate=log_date,
+                    ),
+                )
+
+    def _start_credential_verify(
+        self, credential: Credential, issuer_document: Document
+    ) -> Union[ServiceResult, "Future[VerifyResult]"]:
+        """Check the credential against the issuer's DID document, and start verifying its signature.
+
+        :return: the failed result, or the future of the signature verification
+        """
+        if not issuer_document:
+            return ServiceResult.from_fail_message("The Issuer's did document is not found.")
+
+        context: VerificationContext = self._verification_context(credential.did, credential.key_id, issuer_document)
+        if context.is_revoked:
+            return ServiceResult.from_fail_message("The Issuer's did is revoked.")
+
+        return self._submit_verify_jwt(credential.jwt, context.public_key, context.public_key_bytes)
+
+    def _start_credential_verify_isolated(
+        self, credential: Credential, issuer_document: Union[ServiceResult, Optional[Document]]
+    ) -> Union[ServiceResult, "Future[VerifyResult]"]:
+        """Same as `_start_credential_verify`, but an error is returned as the failed result of the batch.
+
+        :param issuer_document: the issuer's DID document, or the failed result of its resolution
+        """
+        if isinstance(issuer_document, ServiceResult):
+            return issuer_document
+
+        try:
+            return self._start_credential_verify(credential, issuer_document)
+        except Exception as e:
+            return ServiceResult.from_fail_message(str(e))
+
+    def _verification_context(self, did: str, key_id: str, issuer_document: Document) -> VerificationContext:
+        """Get the verification context of the issuer key, or build it from the document on a miss.
+
+        A context is valid only for the document object it was built from. A changed DID document is resolved into
+        a new object (after `invalidate_did` or the expiry of the DID cache), which makes the cached contexts of
+        the DID stale.
+
+        :param did: the issuer DID
+        :param key_id: the key id of the credential
+        :param issuer_document: the DID document of the issuer
+        :return: the verification context
+        """
+        cache_key: Tuple[str, str] = (did, key_id)
+        context: Optional[VerificationContext] = self._verification_contexts.get(cache_key)
+        if context is not None and context.document is issuer_document:
+            return context
+
+        issuer_key_property: Optional[PublicKeyProperty] = issuer_document.get_public_key_property(key_id)
+        if not issuer_key_property:
+            raise ValueError(f"The Issuer's key({key_id}) is not found.")
+
+        is_revoked: bool = issuer_key_property.is_revoked()
+        public_key: Optional[PublicKey] = None if is_revoked else issuer_key_property.public_key
+        context = VerificationContext(
+            document=issuer_document,
+            is_revoked=is_revoked,
+            public_key=public_key,
+            public_key_bytes=public_key.format() if public_key else None,
+        )
+        self._verification_contexts.put(cache_key, context)
+        return context
+
+    def _verified_credential_result(self, credential: Credential, holder_did: str) -> ServiceResult:
+        issuer_document: Optional[Document] = self.get_did(credential.did)
+        fail_result: Optional[ServiceResult] = self._verify_credential(credential, holder_did, issuer_document)
+        if fail_result:
+            return fail_result
+
+        result_response: ResultResponse = self._transport.get(self._is_valid_vc_url(credential))
+
+        return self._is_valid_vc_result(result_response)
+
+    def _verify_credential(
+        self, credential: Credential, holder_did: str, issuer_document: Document
+    ) -> Optional[ServiceResult]:
+        """Check the credential against the issuer's DID document.
+
+        :return: the failed result, or None if the credential passes the local checks
+        """
+        verification: Union[ServiceResult, Future] = self._start_credential_verify(credential, issuer_document)
+        if isinstance(verification, ServiceResult):
+            return verification
+
+        return self._finish_credential_verify(credential, holder_did, verification.result())
 
     @staticmethod
-    def create(url: str) -> "VerifierService":
+    def create(
+        url: Union[str, Sequence[str]],
+        transport: HttpTransport = None,
+        crypto_engine: CryptoEngine = None,
+        log_shipper: LogShipper = None,
+        ecdh_key_store: EcdhKeyStore = None,
+    ) -> "VerifierService":
         """Create a `VerifierService` instance that can use methods for Verifier.
 
-        :param url: A Verifier WAS endpoint
+        :param url: A Verifier WAS endpoint, or the endpoints of its replicas to balance the calls over
+        :param transport: the HTTP transport to share with other services. A new one, pooled if several endpoints are
+            given, is created if omitted.
+        :param crypto_engine: the engine to run the crypto off the calling thread. It runs inline if omitted.
+        :param log_shipper: the shipper of the IV WAS logs. A new one is created if omitted.
+        :param ecdh_key_store: the store of the ECDH keys to share with other services. A new one is created if omitted.
         :return: VerifierService instance
         """
-        return VerifierService(url=url)
-
-    def decrypt_presentation(self, jwe_token: str) -> Presentation:
-        protocol_message: ProtocolMessage = ProtocolMessage.from_(
-            type_=ProtocolType.RESPONSE_PROTECTED_PRESENTATION.value,
-            message=JWE().deserialize(jwe_token),
-            is_protected=True,
+        return VerifierService(
+            url=url,
+            transport=transport,
+            crypto_engine=crypto_engine,
+            log_shipper=log_shipper,
+            ecdh_key_store=ecdh_key_store,
         )
-        self._decrypt(protocol_message)
 
-        return protocol_message.presentation
+    def decrypt_presentation(self, jwe_token: str) -> Presentation:
+        return self._decrypt_presentation(jwe_token)
 
     def sign_encrypt_request_presentation(
         self, protocol_message: ProtocolMessage, verifier_key_holder: DidKeyHolder
     ) -> ServiceResult:
-        result: SignResult = protocol_message.sign_encrypt(verifier_key_holder)
+        result: SignResult = self._sign_encrypt(protocol_message, verifier_key_holder)
         return ServiceResult.from_signed_object(result)
+
+    def verify_presentation(self, jwe_token: str) -> ServiceResult:
+        """Decrypt the presentation and verify every credential in it.
+
+        :param jwe_token: the encrypted presentation
+        :return: the result holding the `Presentation` on success, or the first failure
+        """
+        return self.verify_presentations([jwe_token])[0]
+
+    def verify_presentations(self, jwe_tokens: List[str], max_concurrency: int = None) -> List[ServiceResult]:
+        """Verify many presentations at once.
+
+        Each issuer DID is resolved once for the whole batch. The decryption, the DID resolutions and the
+        `IS_VALID_VC` checks run concurrently; the crypto is dispatched to the `CryptoEngine` if one is set,
+        with the signatures of every credential submitted before any of them is waited for.
+
+        :param jwe_tokens: the encrypted presentations
+        :param max_concurrency: the maximum number of concurrent WAS calls. `MYIDSDK_VERIFY_CONCURRENCY` if omitted.
+        :return: a result per token, in the order of `jwe_tokens`. See `verify_presentation`.
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency or settings.MYIDSDK_VERIFY_CONCURRENCY) as executor:
+            decrypted: List[Union[ServiceResult, Tuple[Presentation, List[Credential]]]] = list(
+                executor.map(self._decrypt_credentials_isolated, jwe_tokens)
+            )
+            issuer_dids: List[str] = list(
+                {credential.did for entry in decrypted if isinstance(entry, tuple) for credential in entry[1]}
+            )
+            issuer_documents: Dict[str, Union[ServiceResult, Optional[Document]]] = dict(
+                zip(issuer_dids, executor.map(self._get_did_isolated, issuer_dids))
+            )
+
+            verifying: List[
+                Union[ServiceResult, Tuple[Presentation, List[Tuple[Credential, Union[ServiceResult, Future]]]]]
+            ] = []
+            for entry in decrypted:
+                if isinstance(entry, ServiceResult):
+                    verifying.append(entry)
+                    continue
+
+                presentation, credentials = entry
+                verifying.append(
+                    (
+                        presentation,
+                        [
+                            (
+                                credential,
+                                self._start_credential_verify_isolated(credential, issuer_documents[credential.did]),
+                            )
+                            for credential in credentials
+                        ],
+                    )
+                )
+
+            pending: List[Union[ServiceResult, Tuple[Presentation, List[Union[ServiceResult, Future]]]]] = []
+            for entry in verifying:
+                if isinstance(entry, ServiceResult):
+                    pending.append(entry)
+                    continue
+
+                presentation, verifications = entry
+                checks: List[Union[ServiceResult, Future]] = []
+                for credential, verification in verifications:
+                    fail_result: Optional[ServiceResult] = (
+                        verification
+                        if isinstance(verification, ServiceResult)
+                        else self._finish_credential_verify_isolated(credential, presentation.did, verification)
+                    )
+                    checks.append(
+                        fail_result
+                        if fail_result
+                        else executor.submit(self._transport.get, self._is_valid_vc_url(credential))
+                    )
+                pending.append((presentation, checks))
+
+            results: List[ServiceResult] = []
+            for entry in pending:
+                if isinstance(entry, ServiceResult):
+                    results.append(entry)
+                    continue
+
+                presentation, checks = entry
+                credential_results: List[ServiceResult] = [
+                    check if isinstance(check, ServiceResult) else self._is_valid_vc_result(check.result())
+                    for check in checks
+                ]
+                results.append(self._presentation_result(presentation, credential_results))
+
+        self._ship_verification_logs(results)
+        return results
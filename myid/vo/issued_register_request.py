@@ -1,8 +1,8 @@
-import dataclasses
-import json
 from dataclasses import dataclass
 from typing import List
 
+from myid.vo.codec import VOCodec
+
 
 @dataclass
 class IssuedRegRequest:
@@ -14,4 +14,4 @@ class IssuedRegRequest:
     vcType: List[str] = None
 
     def to_string(self) -> str:
-        return json.dumps(dataclasses.asdict(self))
+        return VOCodec.encode(self).decode("utf-8")
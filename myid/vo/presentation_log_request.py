@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+from typing import List
+
+from myid.vo.codec import VOCodec
+
+
+@dataclass
+class PresentationLogRequest:
+    holderDid: str
+    vcSigs: List[str]
+    logDate: int = None
+
+    def to_string(self) -> str:
+        return VOCodec.encode(self).decode("utf-8")
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
 
+from myid.vo.codec import VOCodec
+
 
 @dataclass
 class VCRequest:
@@ -22,14 +24,4 @@ class VCRequest:
         return f"{{{text[:-1]}}}"
 
     def to_query_param(self) -> str:
-        query: str = "?"
-        if self.jwt:
-            query += f"jwt={self.jwt}&"
-        if self.nid:
-            query += f"nid={self.nid}&"
-        if self.sig:
-            query += f"sig={self.sig}&"
-        if self.status:
-            query += f'status="{self.status}&'
-
-        return f"{query[:-1]}"
+        return VOCodec.to_query_param(self)
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from myid.vo.result_response import ResultResponse
+from tests.utils.stand_in_server import StandInServer
+
+pytest.importorskip("httpx")
+
+from myid.utils.async_http_transport import AsyncHttpTransport  # noqa: E402
+
+
+class TestAsyncHttpTransport:
+    @pytest.fixture
+    def server(self) -> StandInServer:
+        with StandInServer() as server:
+            yield server
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests(self, server: StandInServer):
+        # GIVEN a transport with a pool of 4 connections
+        async with AsyncHttpTransport(pool_maxsize=4, retry_count=0) as transport:
+            # WHEN send many requests concurrently
+            responses = await asyncio.gather(*[transport.get(f"{server.url}/ok/{i}") for i in range(20)])
+            response: ResultResponse = await transport.post(f"{server.url}/ok", json={"sig": "abc"})
+
+        # THEN all of them succeed over at most 4 connections
+        assert [r.result for r in responses] == [f"/ok/{i}" for i in range(20)]
+        assert response.status and response.result == {"sig": "abc"}
+        assert len(server.client_ports) <= 4
+
+    @pytest.mark.asyncio
+    async def test_connection_error(self):
+        async with AsyncHttpTransport(connect_timeout=0.5, retry_count=0) as transport:
+            # WHEN the server is unreachable
+            response: ResultResponse = await transport.get("http://127.0.0.1:1/ok")
+
+        # THEN the error is returned instead of raised
+        assert not response.status
+
+    @pytest.mark.asyncio
+    async def test_encoding_error(self, server: StandInServer):
+        async with AsyncHttpTransport(retry_count=0) as transport:
+            # WHEN post a body that can not be encoded as json
+            response: ResultResponse = await transport.post(f"{server.url}/ok", json={"sig": object()})
+
+        # THEN the error is returned instead of raised
+        assert not response.status
+        assert response.result
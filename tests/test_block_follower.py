@@ -0,0 +1,59 @@
+from typing import Dict, List
+
+from myid.score.block_follower import BlockFollower, ScoreCall
+
+SCORE_ADDRESS = "cx" + "1" * 40
+
+
+class _FakeIconService:
+    def __init__(self, blocks: Dict[int, List[dict]], latest: int):
+        self.blocks: Dict[int, List[dict]] = blocks
+        self.latest: int = latest
+        self.requested: List[int] = []
+
+    def get_block(self, value) -> dict:
+        height: int = self.latest if value == "latest" else value
+        self.requested.append(height)
+        return {"height": height, "confirmed_transaction_list": self.blocks.get(height, [])}
+
+
+def _call(tx_hash: str, method: str, to: str = SCORE_ADDRESS) -> dict:
+    return {
+        "txHash": tx_hash,
+        "to": to,
+        "dataType": "call",
+        "data": {"method": method, "params": {"credentialJwt": tx_hash}},
+    }
+
+
+class TestBlockFollower:
+    def test_poll(self):
+        # GIVEN blocks with calls to the score and to another one
+        icon_service = _FakeIconService(
+            {
+                10: [_call("0xa", "register")],
+                11: [_call("0xb", "revoke"), _call("0xc", "register", to="cx" + "2" * 40)],
+                12: [{"txHash": "0xd", "to": SCORE_ADDRESS, "value": 1}],
+            },
+            latest=11,
+        )
+        block_follower = BlockFollower(icon_service, SCORE_ADDRESS, start_height=10)
+
+        # WHEN poll the blocks
+        calls: List[ScoreCall] = block_follower.poll()
+
+        # THEN only the calls to the score are picked, in chain order
+        assert [(call.height, call.tx_hash, call.method) for call in calls] == [
+            (10, "0xa", "register"),
+            (11, "0xb", "revoke"),
+        ]
+        assert block_follower.height == 11
+
+        # WHEN poll again after a new block
+        icon_service.latest = 12
+        icon_service.requested.clear()
+
+        # THEN only the new block is read
+        assert block_follower.poll() == []
+        assert icon_service.requested == [12]
+        assert block_follower.height == 12
@@ -0,0 +1,62 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from myid.utils.bounded_pipeline import aiter_items, run_bounded
+
+
+class TestBoundedPipeline:
+    @pytest.mark.asyncio
+    async def test_aiter_items(self):
+        async def items():
+            for i in range(3):
+                yield i
+
+        assert [item async for item in aiter_items([0, 1, 2])] == [0, 1, 2]
+        assert [item async for item in aiter_items(items())] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_run_bounded(self):
+        # GIVEN a stream of items, recording how far it is consumed
+        taken: List[int] = []
+        handled: List[int] = []
+        in_flight: List[int] = [0, 0]
+
+        async def items():
+            for i in range(10):
+                taken.append(i)
+                yield i
+
+        async def handle(item: int):
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight[1], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            handled.append(item)
+            # the input is taken only as fast as the items complete
+            assert len(taken) <= len(handled) + 3
+
+        # WHEN handle them with up to 3 at once
+        await run_bounded(items(), handle, max_in_flight=3)
+
+        # THEN every item is handled, no more than 3 at once
+        assert sorted(handled) == list(range(10))
+        assert in_flight[1] == 3
+
+    @pytest.mark.asyncio
+    async def test_run_bounded_error(self):
+        # GIVEN a handler failing on the first item
+        handled: List[int] = []
+
+        async def handle(item: int):
+            if item == 0:
+                raise ValueError("can not handle 0")
+            await asyncio.sleep(0.01)
+            handled.append(item)
+
+        # WHEN handle the items
+        # THEN the error is raised from the run, and it stops taking items
+        with pytest.raises(ValueError, match="can not handle 0"):
+            await run_bounded(aiter_items(range(100)), handle, max_in_flight=2)
+        assert len(handled) < 99
@@ -0,0 +1,119 @@
+from typing import Callable, List, Optional
+
+import pytest
+
+from myid.bulk_registration import BulkRegistration, RegistrationOutcome
+
+
+class _FakeCredentialService:
+    """Rejects any list containing a JWT whose signature is `bad`, and fails to send the first call if asked."""
+
+    def __init__(self, fail_first_send: bool = False):
+        self.sent: List[List[str]] = []
+        self._fail_first_send: bool = fail_first_send
+
+    async def get_step_limit(self, wallet, signed_jwt: List[str], method: str = "registerList") -> int:
+        return 1_000 * len(signed_jwt)
+
+    async def register_credential_list(self, wallet, signed_jwt: List[str], sent: Callable[[str], None] = None) -> dict:
+        self.sent.append(signed_jwt)
+        if self._fail_first_send:
+            self._fail_first_send = False
+            raise ConnectionError("connection reset")
+        if any(jwt.endswith(".bad") for jwt in signed_jwt):
+            return {"status": 0, "txHash": f"0x{len(self.sent)}", "failure": {"message": "invalid signature"}}
+        return {"status": 1, "txHash": f"0x{len(self.sent)}"}
+
+
+class _TimingOutCredentialService(_FakeCredentialService):
+    """Times out waiting for every transaction, which has landed by the time it is looked up."""
+
+    def __init__(self):
+        super().__init__()
+        self.looked_up: List[str] = []
+
+    async def lookup_transaction_result(self, tx_hash: str) -> Optional[dict]:
+        self.looked_up.append(tx_hash)
+        return {"status": 1, "txHash": tx_hash}
+
+    async def register_credential_list(self, wallet, signed_jwt: List[str], sent: Callable[[str], None] = None) -> dict:
+        self.sent.append(signed_jwt)
+        sent(f"0x{len(self.sent)}")
+        raise TimeoutError(f"Timed out waiting for the result of transaction(0x{len(self.sent)}).")
+
+
+class TestBulkRegistration:
+    @pytest.mark.asyncio
+    async def test_chunk_and_isolate_rejected_jwt(self):
+        # GIVEN 10 JWTs, one rejected by the score and one without signature
+        jwts: List[str] = [f"h.p.sig{i}" for i in range(10)]
+        jwts[3] = "h.p.bad"
+        jwts[7] = "h.p."
+        service = _FakeCredentialService()
+
+        # WHEN register them in chunks of 4
+        outcomes: List[RegistrationOutcome] = await BulkRegistration(
+            service, wallet=None, max_chunk_size=4, max_in_flight=2
+        ).run(iter(jwts))
+
+        # THEN every JWT but the two bad ones is registered, and the outcomes keep the input order
+        assert [outcome.signed_jwt for outcome in outcomes] == jwts
+        assert [index for index, outcome in enumerate(outcomes) if not outcome.success] == [3, 7]
+        assert outcomes[3].error == str({"message": "invalid signature"})
+        assert all(len(chunk) <= 4 for chunk in service.sent)
+        assert "h.p." not in [jwt for chunk in service.sent for jwt in chunk]
+
+    @pytest.mark.asyncio
+    async def test_retry_failed_chunk(self):
+        # GIVEN a service failing to send the first transaction
+        service = _FakeCredentialService(fail_first_send=True)
+
+        async def jwts():
+            for i in range(3):
+                yield f"h.p.sig{i}"
+
+        # WHEN register JWTs from an async stream
+        outcomes: List[RegistrationOutcome] = await BulkRegistration(service, wallet=None, max_retries=1).run(jwts())
+
+        # THEN the chunk is sent again and succeeds
+        assert all(outcome.success for outcome in outcomes)
+        assert len(service.sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_split_by_bytes(self):
+        service = _FakeCredentialService()
+
+        await BulkRegistration(service, wallet=None, max_chunk_size=100, max_chunk_bytes=20).run(
+            [f"h.p.sig{i}" for i in range(4)]
+        )
+
+        assert [len(chunk) for chunk in service.sent] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_split_by_step(self):
+        # GIVEN a service estimating 1,000 steps per JWT
+        service = _FakeCredentialService()
+
+        # WHEN register 10 JWTs in chunks of at most 3,000 steps
+        outcomes: List[RegistrationOutcome] = await BulkRegistration(
+            service, wallet=None, max_chunk_size=10, max_chunk_step=3_000
+        ).run([f"h.p.sig{i}" for i in range(10)])
+
+        # THEN the chunk is split in halves until each part is within the limit
+        assert all(outcome.success for outcome in outcomes)
+        assert [len(chunk) for chunk in service.sent] == [2, 3, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_look_up_timed_out_transaction(self):
+        # GIVEN a service whose first transaction lands only after the wait for it has timed out
+        service = _TimingOutCredentialService()
+
+        # WHEN register JWTs
+        outcomes: List[RegistrationOutcome] = await BulkRegistration(service, wallet=None, max_retries=1).run(
+            [f"h.p.sig{i}" for i in range(3)]
+        )
+
+        # THEN the landed transaction is looked up instead of registering the JWTs again
+        assert all(outcome.success and outcome.tx_hash == "0x1" for outcome in outcomes)
+        assert len(service.sent) == 1
+        assert service.looked_up == ["0x1"]
@@ -0,0 +1,63 @@
+import asyncio
+import base64
+import json
+from typing import List
+
+import pytest
+
+from myid.bulk_revocation import BulkRevocation, RevocationOutcome
+from myid.utils.jwt_util import JwtUtil
+
+
+def _revoke_jwt(signature: str, jwt_signature: str = "c2ln") -> str:
+    payload: str = base64.urlsafe_b64encode(json.dumps({"sig": signature}).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJFUzI1NksifQ.{payload}.{jwt_signature}"
+
+
+class _FakeCredentialService:
+    """Rejects the credential `bad`, fails to send the first call of `flaky` and counts the transactions in flight."""
+
+    def __init__(self):
+        self.sent: List[str] = []
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+
+    async def revoke(self, wallet, signed_jwt: str) -> dict:
+        self.sent.append(signed_jwt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            signature: str = JwtUtil.decode_payload(signed_jwt)["sig"]
+            if signature == "flaky" and self.sent.count(signed_jwt) == 1:
+                raise ConnectionError("connection reset")
+            if signature == "bad":
+                return {"status": 0, "txHash": f"0x{len(self.sent)}", "failure": {"message": "not found"}}
+            return {"status": 1, "txHash": f"0x{len(self.sent)}"}
+        finally:
+            self.in_flight -= 1
+
+
+class TestBulkRevocation:
+    @pytest.mark.asyncio
+    async def test_pipeline_and_progress(self):
+        # GIVEN 50 revocation JWTs, one rejected by the score, one failing to be sent once and one without signature
+        signatures: List[str] = [f"sig-{i}" for i in range(47)] + ["bad", "flaky", "unsigned"]
+        jwts: List[str] = [_revoke_jwt(signature) for signature in signatures[:-1]] + [_revoke_jwt("unsigned", "")]
+        credential_service = _FakeCredentialService()
+        progressed: List[RevocationOutcome] = []
+
+        # WHEN revoke them with at most 8 transactions in flight
+        outcomes: List[RevocationOutcome] = await BulkRevocation(credential_service, wallet=None, max_in_flight=8).run(
+            iter(jwts), progress=progressed.append
+        )
+
+        # THEN the outcomes are in input order, and each one was reported as it completed
+        assert [outcome.signature for outcome in outcomes] == signatures
+        assert all(outcome.success for outcome in outcomes[:47]) and outcomes[48].success
+        assert not outcomes[47].success and "not found" in outcomes[47].error
+        assert not outcomes[49].success and credential_service.sent.count(jwts[49]) == 0
+        assert len(progressed) == 50
+        # AND the transactions were pipelined within the bound, retrying the one that failed to be sent
+        assert credential_service.max_in_flight == 8
+        assert len(credential_service.sent) == 50
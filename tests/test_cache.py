@@ -0,0 +1,64 @@
+from myid.utils.cache import TTLCache
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTTLCache:
+    def test_expire_entry(self):
+        # GIVEN a cache with an entry
+        clock = _FakeClock()
+        cache = TTLCache(max_size=10, ttl=30, clock=clock)
+        cache.put("did", "document")
+        cache.put("missing", None, ttl=5)
+
+        # WHEN the negative TTL passes
+        clock.now = 10
+
+        # THEN only the entry with the short TTL is expired
+        assert cache.get("did") == "document"
+        assert cache.get("missing", "expired") == "expired"
+
+        # WHEN the default TTL passes
+        clock.now = 31
+
+        # THEN the entry is expired too
+        assert cache.get("did") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 2
+
+    def test_evict_least_recently_used(self):
+        # GIVEN a full cache
+        cache = TTLCache(max_size=2, ttl=30)
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        # WHEN touch the oldest entry and add another
+        cache.get("a")
+        cache.put("c", 3)
+
+        # THEN the least recently used entry is evicted
+        assert "a" in cache and "c" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_invalidate(self):
+        cache = TTLCache(max_size=2, ttl=30)
+        cache.put("a", 1)
+
+        cache.invalidate("a")
+        cache.invalidate("unknown")
+
+        assert cache.get("a") is None
+
+    def test_disabled(self):
+        cache = TTLCache(max_size=0, ttl=30)
+        cache.put("a", 1)
+
+        assert cache.get("a") is None
+        assert cache.stats.size == 0
@@ -0,0 +1,36 @@
+from typing import List
+
+from myid.credential.credential_info import CredentialInfo
+from myid.credential.credential_info_batch import CredentialInfoBatch
+
+
+class TestCredentialInfoBatch:
+    def test_from_json_and_filters(self):
+        # GIVEN credential infos of the credentialInfo score
+        rows: List[dict] = [
+            {"issuerDid": "did:icon:02:a", "sig": "sig-0", "expiryDate": 100, "created": 10},
+            {"issuerDid": "did:icon:02:a", "sig": "sig-1", "expiryDate": 300, "isRevoke": True, "revokeDate": 50},
+            {"issuerDid": "did:icon:02:b", "holderDid": "did:icon:02:h", "sig": "sig-2", "expiryDate": 150},
+        ]
+
+        # WHEN load them into a batch
+        batch: CredentialInfoBatch = CredentialInfoBatch.from_json(rows)
+
+        # THEN the filters select the rows by the columns
+        assert len(batch) == 3
+        assert batch.expired_before(200).signatures == ["sig-0", "sig-2"]
+        assert batch.revoked().signatures == ["sig-1"]
+        assert batch.issued_by("did:icon:02:a").expired_before(200).signatures == ["sig-0"]
+
+        # THEN a row is read as the same credential info as `CredentialInfo.from_json`
+        assert batch.to_json() == [CredentialInfo.from_json(data).to_json() for data in rows]
+        assert batch[2].holder_did == "did:icon:02:h"
+
+    def test_slots(self):
+        # GIVEN a credential info read from json
+        credential_info: CredentialInfo = CredentialInfo.from_json({"issuerDid": "did:icon:02:a", "sig": "sig-0"})
+
+        # THEN it has no per-instance dict
+        assert not hasattr(credential_info, "__dict__")
+        assert credential_info.expiry_date is None
+        assert credential_info.is_revoke is False
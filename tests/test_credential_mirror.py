@@ -0,0 +1,150 @@
+import base64
+import json
+from typing import List
+
+from myid.credential_service import CredentialService
+from myid.score.credential_mirror import CredentialMirror
+from myid.simulator.chain import ChainSimulator
+from myid.simulator.ledger import CredentialLedger
+
+SCORE_ADDRESS = "cx" + "1" * 40
+ISSUER_DID = "did:icon:02:1234"
+# 2100-01-01, so the registered credentials do not expire
+EXPIRY_DATE = 4_102_444_800
+
+
+def _jwt(claims: dict) -> str:
+    payload: str = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJFUzI1NksifQ.{payload}.c2lnbmF0dXJl"
+
+
+def _register_jwt(signature: str) -> str:
+    return _jwt({"issuerDid": ISSUER_DID, "sig": signature, "issueDate": 1, "expiryDate": EXPIRY_DATE})
+
+
+class _Clock:
+    def __init__(self):
+        self.now: float = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _ChainIconService:
+    """The IconService methods read by the mirror, answered by a `ChainSimulator`."""
+
+    def __init__(self):
+        self.clock: _Clock = _Clock()
+        self.chain: ChainSimulator = ChainSimulator(CredentialLedger(), block_time=2, clock=self.clock)
+        self.calls: List[str] = []
+
+    def _handle(self, method: str, params: dict = None):
+        return self.chain.handle({"id": 1, "method": method, "params": params or {}})["result"]
+
+    def call(self, call) -> str:
+        self.calls.append(call.method)
+        return json.dumps({"isValid": True, "sig": call.params["sig"]})
+
+    def get_block(self, value) -> dict:
+        if value == "latest":
+            return self._handle("icx_getLastBlock")
+        return self._handle("icx_getBlockByHeight", {"height": hex(value)})
+
+    def get_transaction_result(self, tx_hash: str) -> dict:
+        return self._handle("icx_getTransactionResult", {"txHash": tx_hash})
+
+    def send(self, method: str, params: dict):
+        self._handle(
+            "icx_sendTransaction",
+            {"to": SCORE_ADDRESS, "dataType": "call", "data": {"method": method, "params": params}},
+        )
+
+    def next_block(self):
+        self.clock.now += 2
+
+
+class TestCredentialMirror:
+    def test_replay_resume_and_export(self, tmp_path):
+        # GIVEN blocks with registrations, a revocation and a revocation by another issuer that fails
+        icon_service = _ChainIconService()
+        icon_service.send("register", {"credentialJwt": _register_jwt("sig-1")})
+        icon_service.send("registerList", {"credentialJwtList": f"{_register_jwt('sig-2')},{_register_jwt('sig-3')}"})
+        icon_service.next_block()
+        icon_service.send("revoke", {"credentialJwt": _jwt({"issuerDid": ISSUER_DID, "sig": "sig-2", "revokeDate": 3})})
+        icon_service.send("revoke", {"credentialJwt": _jwt({"issuerDid": "did:icon:02:ffff", "sig": "sig-3"})})
+        icon_service.next_block()
+        path: str = str(tmp_path / "mirror.db")
+        mirror = CredentialMirror(path, icon_service, SCORE_ADDRESS, start_height=1, batch_client=None)
+
+        # WHEN catch up with 1 block per sync
+        replayed: int = mirror.catch_up(max_blocks=1)
+
+        # THEN the calls that succeeded are replayed, and the mirror answers as the score
+        assert replayed == 3 and len(mirror) == 3
+        assert mirror.height == icon_service.chain.height and mirror.lag == 0
+        assert mirror.get("sig-2") == icon_service.chain._ledger.get("sig-2")
+        assert mirror.is_valid("sig-3") == {"sig": "sig-3", "isValid": True}
+        assert mirror.is_valid("sig-4") is None
+        mirror.close()
+
+        # WHEN reopen the file after the issuer DID is revoked, and export a snapshot
+        icon_service.send("revokeDid", {"credentialJwt": _jwt({"issuerDid": ISSUER_DID, "sig": "sig-1"})})
+        icon_service.next_block()
+        mirror = CredentialMirror(path, icon_service, SCORE_ADDRESS)
+        assert mirror.catch_up() == 1
+        mirror.export(str(tmp_path / "snapshot.db"))
+        mirror.close()
+
+        # THEN it resumed from the checkpoint, and the snapshot answers without a node
+        snapshot = CredentialMirror(str(tmp_path / "snapshot.db"))
+        assert snapshot.height == icon_service.chain.height
+        assert snapshot.is_valid("sig-1") == {"sig": "sig-1", "isValid": False}
+        snapshot.close()
+
+    def test_is_valid_as_score(self, tmp_path):
+        # GIVEN an expired credential and one that is not
+        icon_service = _ChainIconService()
+        icon_service.send(
+            "register", {"credentialJwt": _jwt({"issuerDid": ISSUER_DID, "sig": "sig-1", "expiryDate": 100})}
+        )
+        icon_service.send("register", {"credentialJwt": _register_jwt("sig-2")})
+        icon_service.next_block()
+        mirror = CredentialMirror(str(tmp_path / "mirror.db"), icon_service, SCORE_ADDRESS, start_height=1)
+        mirror.catch_up()
+        ledger: CredentialLedger = icon_service.chain._ledger
+
+        # WHEN check them on the mirror and on the score
+        # THEN the mirror answers exactly as the score, and the expired credential is not valid
+        assert mirror.is_valid("sig-1") == ledger.is_valid("sig-1") == {"sig": "sig-1", "isValid": False}
+        assert mirror.is_valid("sig-2") == ledger.is_valid("sig-2") == {"sig": "sig-2", "isValid": True}
+        assert mirror.is_valid("sig-1", timestamp=99) == ledger.is_valid("sig-1", timestamp=99)
+        assert mirror.is_valid("sig-1", timestamp=99)["isValid"]
+        mirror.close()
+
+    def test_credential_service_mirror_mode(self, tmp_path):
+        # GIVEN a credential service with a mirror synced at the latest block
+        icon_service = _ChainIconService()
+        icon_service.send("register", {"credentialJwt": _register_jwt("sig-1")})
+        icon_service.next_block()
+        mirror = CredentialMirror(str(tmp_path / "mirror.db"), icon_service, SCORE_ADDRESS, start_height=1)
+        mirror.catch_up()
+        credential_service = CredentialService(
+            icon_service, network_id=2, score_address=SCORE_ADDRESS, mirror=mirror, mirror_max_lag=0
+        )
+
+        # WHEN read a mirrored credential and one the mirror does not have
+        # THEN only the latter calls the score
+        assert credential_service.is_valid("sig-1") == {"sig": "sig-1", "isValid": True}
+        assert credential_service.is_valid("sig-2") == {"sig": "sig-2", "isValid": True}
+        assert icon_service.calls == ["isValid"]
+
+        # WHEN the mirror lags more than the bound
+        icon_service.next_block()
+        icon_service.next_block()
+        mirror.sync(max_blocks=1)
+
+        # THEN the score is called
+        credential_service.is_valid("sig-1")
+        assert icon_service.calls == ["isValid", "isValid"]
+        credential_service.close()
+        mirror.close()
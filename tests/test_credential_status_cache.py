@@ -0,0 +1,162 @@
+import asyncio
+import base64
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+pytest.importorskip("didsdk")
+
+from myid.credential_service import CredentialService  # noqa: E402
+from myid.utils.cache import TTLCache  # noqa: E402
+from myid.utils.metrics import metrics  # noqa: E402
+
+SCORE_ADDRESS = "cx" + "1" * 40
+
+
+def _jwt(claims: dict) -> str:
+    payload: str = base64.urlsafe_b64encode(json.dumps(claims).encode()).decode().rstrip("=")
+    return f"eyJhbGciOiJFUzI1NksifQ.{payload}.c2lnbmF0dXJl"
+
+
+class _FakeIconService:
+    def __init__(self):
+        self.calls: List[str] = []
+        self.transactions: List[dict] = []
+
+    def call(self, call) -> str:
+        self.calls.append(call.method)
+        return json.dumps({"isValid": True, "sig": call.params["sig"]})
+
+    def get_block(self, value) -> dict:
+        return {"height": 1, "confirmed_transaction_list": self.transactions}
+
+
+class TestCredentialStatusCache:
+    @pytest.fixture
+    def icon_service(self) -> _FakeIconService:
+        return _FakeIconService()
+
+    @pytest.fixture
+    def credential_service(self, icon_service: _FakeIconService) -> CredentialService:
+        return CredentialService(
+            icon_service, network_id=2, score_address=SCORE_ADDRESS, status_cache=TTLCache(max_size=16, ttl=60)
+        )
+
+    def test_cache_and_invalidate(self, credential_service: CredentialService, icon_service: _FakeIconService):
+        # GIVEN a status read once
+        first: dict = credential_service.is_valid("sig-1")
+
+        # WHEN read it again and alter the returned status
+        second: dict = credential_service.is_valid("sig-1")
+        second["isValid"] = False
+
+        # THEN the score is called once and the cached status is not altered
+        assert icon_service.calls == ["isValid"]
+        assert first == credential_service.is_valid("sig-1")
+
+        # WHEN this process revokes the credential
+        credential_service._invalidate_status("revoke", [_jwt({"issuerDid": "did:icon:02:1", "sig": "sig-1"})])
+
+        # THEN the next read goes to the score
+        credential_service.is_valid("sig-1")
+        assert icon_service.calls == ["isValid", "isValid"]
+
+    @pytest.mark.asyncio
+    async def test_watch_credential_status(self, credential_service: CredentialService, icon_service: _FakeIconService):
+        # GIVEN cached statuses
+        credential_service.get("sig-1")
+        credential_service.get("sig-2")
+
+        # WHEN another process revokes one of them in a new block
+        icon_service.transactions = [
+            {
+                "txHash": "0x1",
+                "to": SCORE_ADDRESS,
+                "dataType": "call",
+                "data": {"method": "revoke", "params": {"credentialJwt": _jwt({"sig": "sig-2"})}},
+            }
+        ]
+        watcher = asyncio.create_task(credential_service.watch_credential_status(interval=0.01))
+        await asyncio.sleep(0.1)
+        watcher.cancel()
+
+        # THEN only the revoked one is read from the score again
+        credential_service.get("sig-1")
+        credential_service.get("sig-2")
+        assert icon_service.calls == ["get", "get", "get"]
+        credential_service.close()
+
+    def test_is_valid_many(self, credential_service: CredentialService, icon_service: _FakeIconService):
+        # GIVEN a cached status
+        credential_service.is_valid("sig-1")
+
+        # WHEN check many credentials at once
+        results = credential_service.is_valid_many(["sig-0", "sig-1", "", "sig-2"])
+
+        # THEN only the missed ones are called and the results are in input order
+        assert icon_service.calls == ["isValid", "isValid", "isValid"]
+        assert [result.success for result in results] == [True, True, False, True]
+        assert [result.result["sig"] for result in results if result.success] == ["sig-0", "sig-1", "sig-2"]
+
+    def test_revoke_during_read(self, credential_service: CredentialService, icon_service: _FakeIconService):
+        # GIVEN a status read that is slow on the score
+        entered: threading.Event = threading.Event()
+        release: threading.Event = threading.Event()
+        read = icon_service.call
+
+        def slow_call(call) -> str:
+            status: str = read(call)
+            entered.set()
+            release.wait(5)
+            return status
+
+        icon_service.call = slow_call
+        reader = threading.Thread(target=credential_service.is_valid, args=("sig-1",))
+        reader.start()
+        assert entered.wait(5)
+
+        # WHEN this process revokes the credential before the read returns
+        credential_service._invalidate_status("revoke", [_jwt({"issuerDid": "did:icon:02:1", "sig": "sig-1"})])
+        release.set()
+        reader.join(5)
+
+        # THEN the status read before the revoke is not cached
+        icon_service.call = read
+        credential_service.is_valid("sig-1")
+        assert icon_service.calls == ["isValid", "isValid"]
+
+    def test_status_read_metric(self, credential_service: CredentialService):
+        # GIVEN the metrics enabled
+        metrics.reset()
+        metrics.enable()
+        try:
+            # WHEN a status is read from the score
+            credential_service.is_valid("sig-1")
+
+            # THEN it is timed as a status read, not as a transaction confirmation
+            assert metrics.histogram("myid_status_read_seconds").count == 1
+            assert metrics.histogram("myid_transaction_seconds", stage="confirm") is None
+        finally:
+            metrics.disable()
+            metrics.reset()
+
+    def test_close_keeps_given_executor(self, icon_service: _FakeIconService):
+        # GIVEN services, one with the executor of the caller
+        executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        shared: CredentialService = CredentialService(
+            icon_service, network_id=2, score_address=SCORE_ADDRESS, executor=executor
+        )
+        dedicated: CredentialService = CredentialService(icon_service, network_id=2, score_address=SCORE_ADDRESS)
+
+        # WHEN close them
+        shared.close()
+        dedicated.close()
+
+        # THEN only the executor created by the service is shut down
+        assert executor.submit(lambda: "still running").result() == "still running"
+        with pytest.raises(RuntimeError):
+            dedicated._executor.submit(lambda: None)
+        executor.shutdown()
@@ -0,0 +1,69 @@
+import os
+import time
+from concurrent.futures import Future
+from typing import List
+
+import pytest
+
+pytest.importorskip("didsdk")
+
+from coincurve import PrivateKey, PublicKey  # noqa: E402
+from didsdk.core.did_key_holder import DidKeyHolder  # noqa: E402
+from didsdk.core.key_store import DidKeyStore  # noqa: E402
+from didsdk.jwt.elements import Header, Payload  # noqa: E402
+from didsdk.jwt.jwt import Jwt  # noqa: E402
+
+from myid.utils.crypto_engine import CryptoEngine  # noqa: E402
+
+KEY_FILE = os.path.join(os.path.dirname(__file__), "test_did_key.json")
+
+
+def _jwt(did_key_holder: DidKeyHolder, index: int) -> Jwt:
+    header: Header = Header(alg=did_key_holder.type.name, kid=did_key_holder.kid)
+    return Jwt(header, Payload({Payload.ISSUER: did_key_holder.did, Payload.ISSUED_AT: int(time.time()) + index}))
+
+
+class TestCryptoEngine:
+    @pytest.fixture(scope="class")
+    def did_key_holder(self) -> DidKeyHolder:
+        return DidKeyStore.load_did_key_holder(KEY_FILE, "P@ssw0rd")
+
+    @pytest.fixture(params=[False, True], ids=["threads", "processes"])
+    def engine(self, request) -> CryptoEngine:
+        with CryptoEngine(max_workers=2, use_processes=request.param) as engine:
+            yield engine
+
+    def test_sign_and_verify(self, engine: CryptoEngine, did_key_holder: DidKeyHolder):
+        # GIVEN JWTs signed on the engine
+        signed: List[str] = [engine.sign(_jwt(did_key_holder, index), did_key_holder).result() for index in range(4)]
+        public_key: PublicKey = did_key_holder.private_key.public_key
+
+        # WHEN verify them all at once, with the right key and a wrong one
+        futures: List[Future] = [engine.verify(Jwt.decode(encoded), public_key) for encoded in signed]
+        wrong: Future = engine.verify(Jwt.decode(signed[0]), PrivateKey().public_key)
+
+        # THEN every signature is verified against its key
+        assert all(future.result().success for future in futures)
+        assert not wrong.result().success
+
+    def test_verify_serialized_key(self, engine: CryptoEngine, did_key_holder: DidKeyHolder):
+        # GIVEN a signed JWT and the serialized public key of the signer
+        jwt: Jwt = Jwt.decode(did_key_holder.sign(_jwt(did_key_holder, 0)))
+        public_key: PublicKey = did_key_holder.private_key.public_key
+
+        # WHEN verify it with the serialized key given
+        # THEN it is verified
+        assert engine.verify(jwt, public_key, public_key.format()).result().success
+
+    def test_submit_runs_nested_work_inline(self, did_key_holder: DidKeyHolder):
+        # GIVEN an engine with a single worker
+        with CryptoEngine(max_workers=1) as engine:
+
+            def sign_on_engine() -> str:
+                return engine.sign(_jwt(did_key_holder, 0), did_key_holder).result(timeout=5)
+
+            # WHEN a submitted function asks the engine for more work
+            encoded: str = engine.submit(sign_on_engine).result(timeout=5)
+
+        # THEN it runs on the same worker instead of waiting for a free one
+        assert Jwt.decode(encoded).verify(did_key_holder.private_key.public_key).success
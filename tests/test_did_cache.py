@@ -0,0 +1,64 @@
+import threading
+from typing import List
+
+import pytest
+
+pytest.importorskip("didsdk")
+
+from myid.verifier_service import VerifierService  # noqa: E402
+from myid.vo.result_response import ResultResponse  # noqa: E402
+
+DID = "did:icon:02:issuer"
+
+
+class _BlockingTransport:
+    """Answers the DID resolutions in order, holding the first one until it is released."""
+
+    def __init__(self):
+        self.documents: List[str] = ["revoked-key document", "current document"]
+        self.started: threading.Event = threading.Event()
+        self.release: threading.Event = threading.Event()
+        self.calls: int = 0
+
+    def get(self, url: str) -> ResultResponse:
+        self.calls += 1
+        document: str = self.documents.pop(0)
+        if self.calls == 1:
+            self.started.set()
+            self.release.wait(5)
+        return ResultResponse(status=True, result=document)
+
+    def close(self):
+        pass
+
+
+class TestDidCache:
+    @pytest.fixture
+    def transport(self) -> _BlockingTransport:
+        return _BlockingTransport()
+
+    @pytest.fixture
+    def verifier_service(self, transport: _BlockingTransport, monkeypatch) -> VerifierService:
+        monkeypatch.setattr(VerifierService, "_to_document", staticmethod(lambda response: response.result))
+        verifier_service = VerifierService.create(url="http://127.0.0.1:1", transport=transport)
+        yield verifier_service
+        verifier_service.close()
+
+    def test_invalidate_during_fetch(self, verifier_service: VerifierService, transport: _BlockingTransport):
+        # GIVEN a resolution of the DID blocked in flight
+        stale: List[str] = []
+        fetch = threading.Thread(target=lambda: stale.append(verifier_service.get_did(DID)))
+        fetch.start()
+        assert transport.started.wait(5)
+
+        # WHEN the DID is invalidated, e.g. by `revoke_key`, before the resolution finishes
+        verifier_service.invalidate_did(DID)
+        fresh: str = verifier_service.get_did(DID)
+        transport.release.set()
+        fetch.join(5)
+
+        # THEN the new lookup does not join the stale resolution, and the stale document is not cached
+        assert stale == ["revoked-key document"]
+        assert fresh == "current document"
+        assert verifier_service.get_did(DID) == "current document"
+        assert transport.calls == 2
@@ -0,0 +1,130 @@
+import json
+import multiprocessing
+import os
+import stat
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from myid.utils.ecdh_key_store import (
+    MemoryEcdhKeyStore,
+    SqliteEcdhKeyStore,
+    ecdh_key_to_private_bytes,
+)
+
+
+class _FakeEcdhKey:
+    def __init__(self):
+        self.private_key = ec.generate_private_key(ec.SECP256K1())
+        self.public_key = self.private_key.public_key()
+
+
+def _dict_store(path: str, max_size: int = 10, ttl: float = 60) -> SqliteEcdhKeyStore:
+    """A store of dicts, which stands in for the ECDH keys that need didsdk to be rebuilt."""
+    return SqliteEcdhKeyStore(
+        path,
+        max_size=max_size,
+        ttl=ttl,
+        encode=lambda key: json.dumps(key).encode(),
+        decode=lambda data, kid: json.loads(data),
+    )
+
+
+def _put_in_child(path: str):
+    store = _dict_store(path)
+    store.put("kid-child", {"crv": "secp256k1", "d": "child"})
+    store.close()
+
+
+class TestEcdhKeyStore:
+    def test_memory_store_bounds(self):
+        # GIVEN a store of 2 keys
+        store = MemoryEcdhKeyStore(max_size=2, ttl=60)
+
+        # WHEN put 3 keys
+        for i in range(3):
+            store.put(f"kid-{i}", {"d": i})
+
+        # THEN the oldest is evicted
+        assert store.get("kid-0") is None
+        assert store.get("kid-2") == {"d": 2}
+        assert len(store) == 2
+
+    def test_sqlite_store(self, tmp_path):
+        # GIVEN a store with a short TTL
+        store = _dict_store(str(tmp_path / "keys.db"), max_size=2, ttl=0.2)
+
+        # WHEN put more keys than its size
+        for i in range(3):
+            store.put(f"kid-{i}", {"d": i})
+
+        # THEN the oldest is evicted and the others expire
+        assert store.get("kid-0") is None
+        assert store.get("kid-2") == {"d": 2}
+        time.sleep(0.3)
+        assert store.get("kid-2") is None
+
+        store.delete("kid-1")
+        store.clear()
+        store.close()
+
+    def test_sqlite_store_private(self, tmp_path):
+        # GIVEN a store of a new file
+        path: str = str(tmp_path / "keys.db")
+        store = _dict_store(path)
+
+        # WHEN put a key
+        store.put("kid-0", {"d": 0})
+
+        # THEN the file and its WAL files are readable and writable by the owner only
+        for suffix in ["", "-wal", "-shm"]:
+            assert stat.S_IMODE(os.stat(path + suffix).st_mode) == 0o600
+        store.close()
+
+    def test_private_bytes(self):
+        # GIVEN a key object holding EC keys
+        key = _FakeEcdhKey()
+
+        # WHEN export its private key
+        private_bytes: bytes = ecdh_key_to_private_bytes(key)
+
+        # THEN it is the PKCS8 DER of the private key only
+        restored = serialization.load_der_private_key(private_bytes, None)
+        assert restored.private_numbers() == key.private_key.private_numbers()
+        with pytest.raises(TypeError):
+            ecdh_key_to_private_bytes(object())
+
+    def test_sqlite_store_ecdh_key(self, tmp_path):
+        # GIVEN an ECDH key of a session
+        ecdhkey = pytest.importorskip("didsdk.jwe.ecdhkey")
+        key = ecdhkey.ECDHKey.generate_key(ecdhkey.EcdhCurveType.P256K.value.curve_name)
+        store = SqliteEcdhKeyStore(str(tmp_path / "keys.db"), max_size=10, ttl=60)
+
+        # WHEN put and get it
+        store.put("kid-ecdh", key)
+        restored = store.get("kid-ecdh")
+
+        # THEN the same key is rebuilt from its private key
+        assert isinstance(restored, ecdhkey.ECDHKey)
+        assert ecdh_key_to_private_bytes(restored) == ecdh_key_to_private_bytes(key)
+        store.close()
+
+    @pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="fork is not available")
+    def test_sqlite_store_across_processes(self, tmp_path):
+        # GIVEN a store opened before forking
+        path: str = str(tmp_path / "keys.db")
+        store = _dict_store(path)
+        store.put("kid-parent", {"d": "parent"})
+
+        # WHEN another process adds a key
+        process = multiprocessing.get_context("fork").Process(target=_put_in_child, args=(path,))
+        process.start()
+        process.join(10)
+
+        # THEN the key is found by this process
+        assert process.exitcode == 0
+        assert store.get("kid-child") == {"crv": "secp256k1", "d": "child"}
+        assert store.get("kid-parent") == {"d": "parent"}
+        store.close()
@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from myid.utils.endpoint_pool import EndpointPool
+from myid.utils.http_transport import PooledHttpTransport
+from myid.vo.result_response import ResultResponse
+from tests.utils.stand_in_server import StandInServer
+
+
+class _Clock:
+    def __init__(self):
+        self.now: float = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _warm(pool: EndpointPool, latencies: dict):
+    """Record 20 requests per endpoint with the given latency."""
+    for _ in range(20):
+        for url, seconds in latencies.items():
+            endpoint = pool.acquire(exclude=[e for e in pool._endpoints if e.url != url])
+            pool.release(endpoint, seconds, success=True)
+
+
+class TestEndpointPool:
+    def test_balance_and_breaker(self):
+        # GIVEN a pool of a fast and a slow endpoint
+        clock = _Clock()
+        pool = EndpointPool(["http://a", "http://b"], failure_threshold=2, open_seconds=10, clock=clock)
+        _warm(pool, {"http://a": 0.02, "http://b": 0.11})
+
+        # WHEN choose the endpoints of 10 requests in flight
+        chosen = [pool.acquire() for _ in range(10)]
+
+        # THEN the fast one takes most of them, in proportion to its latency
+        assert sum(endpoint.url == "http://a" for endpoint in chosen) == 9
+        for endpoint in chosen:
+            pool.release(endpoint, None, success=None)
+
+        # WHEN the fast one fails twice in a row
+        for _ in range(2):
+            pool.release(pool.acquire(exclude=[e for e in pool._endpoints if e.url == "http://b"]), 1, success=False)
+
+        # THEN its breaker opens and every request goes to the slow one
+        assert pool.stats["http://a"].state == "open" and not pool.stats["http://a"].healthy
+        assert {pool.acquire().url for _ in range(5)} == {"http://b"}
+
+        # WHEN the open period elapsed
+        clock.now += 10
+
+        # THEN a single probe is let through, and its success closes the breaker
+        probe = pool.acquire(exclude=[e for e in pool._endpoints if e.url == "http://b"])
+        assert probe.url == "http://a" and pool.stats["http://a"].state == "half_open"
+        assert pool.acquire(exclude=[e for e in pool._endpoints if e.url == "http://b"]).url == "http://a"
+        pool.release(probe, 0.01, success=True)
+        assert pool.stats["http://a"].state == "closed"
+        assert pool.stats["http://a"].failures == 2 and pool.stats["http://b"].in_flight == 5
+
+    def test_failover(self):
+        # GIVEN a pool of an unavailable replica, an unreachable one and a healthy one
+        with StandInServer(status=503) as unavailable, StandInServer() as healthy:
+            urls = [unavailable.url, "http://127.0.0.1:1", healthy.url]
+            with PooledHttpTransport(EndpointPool(urls, failure_threshold=1)) as transport:
+                # WHEN read through the pool, with URLs built on its first endpoint
+                responses = [transport.get(f"{urls[0]}/ok/{i}") for i in range(20)]
+                response: ResultResponse = transport.post(f"{urls[0]}/ok", json={"sig": "abc"})
+                stats = transport.pool.stats
+
+        # THEN the reads fail over to the healthy replica, and the breakers of the others are open
+        assert [r.result for r in responses] == [f"/ok/{i}" for i in range(20)]
+        assert stats[healthy.url].requests == 21 and stats[healthy.url].latency > 0
+        assert stats[unavailable.url].state == stats["http://127.0.0.1:1"].state == "open"
+        assert response.status and response.result == {"sig": "abc"}
+
+    def test_hedged_read(self):
+        # GIVEN a pool whose replica with the best latency so far became slow
+        with StandInServer(delay=0.5) as slow, StandInServer() as fast:
+            pool = EndpointPool([slow.url, fast.url], hedge=True, hedge_percentile=50)
+            _warm(pool, {slow.url: 0.001, fast.url: 0.01})
+            with PooledHttpTransport(pool) as transport:
+                # WHEN read through the pool
+                started: float = time.perf_counter()
+                response: ResultResponse = transport.get(f"{slow.url}/ok")
+                elapsed: float = time.perf_counter() - started
+
+        # THEN a backup is sent to the other replica after the median latency, and its answer is returned
+        assert response.status and response.result == "/ok"
+        assert elapsed < 0.4
+        assert pool.stats[fast.url].hedges == pool.stats[fast.url].hedge_wins == 1
+
+    @pytest.mark.asyncio
+    async def test_hedged_read_async(self):
+        pytest.importorskip("httpx")
+        from myid.utils.async_http_transport import PooledAsyncHttpTransport
+
+        # GIVEN a pool whose replica with the best latency so far became slow
+        with StandInServer(delay=0.5) as slow, StandInServer() as fast:
+            pool = EndpointPool([slow.url, fast.url], hedge=True, hedge_percentile=50)
+            _warm(pool, {slow.url: 0.001, fast.url: 0.01})
+            async with PooledAsyncHttpTransport(pool) as transport:
+                # WHEN read through the pool
+                started: float = time.perf_counter()
+                response: ResultResponse = await transport.get(f"{slow.url}/ok")
+                elapsed: float = time.perf_counter() - started
+
+        # THEN the backup answers first, and the slow request is cancelled
+        assert response.status and response.result == "/ok"
+        assert elapsed < 0.4
+        assert pool.stats[fast.url].hedge_wins == 1
+        assert pool.stats[slow.url].in_flight == 0 and pool.stats[slow.url].requests == 20
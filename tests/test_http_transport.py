@@ -0,0 +1,51 @@
+import pytest
+
+from myid.utils.http_transport import HttpTransport
+from myid.vo.result_response import ResultResponse
+from tests.utils.stand_in_server import StandInServer
+
+
+class TestHttpTransport:
+    @pytest.fixture
+    def server(self) -> StandInServer:
+        with StandInServer() as server:
+            yield server
+
+    def test_reuse_connection(self, server: StandInServer):
+        # GIVEN a transport
+        with HttpTransport(retry_count=0) as transport:
+            # WHEN send several requests
+            responses = [transport.get(f"{server.url}/ok/{i}") for i in range(5)]
+            response: ResultResponse = transport.post(f"{server.url}/ok", json={"sig": "abc"})
+
+        # THEN every request is served over one kept-alive connection
+        assert [r.result for r in responses] == [f"/ok/{i}" for i in range(5)]
+        assert response.status and response.result == {"sig": "abc"}
+        assert len(server.client_ports) == 1
+
+    def test_failure_status(self, server: StandInServer):
+        with HttpTransport(retry_count=0) as transport:
+            # WHEN the server responds with an error status
+            response: ResultResponse = transport.get(f"{server.url}/fail")
+
+        # THEN the response is marked as failed
+        assert not response.status
+        assert response.result == "/fail"
+
+    def test_connection_error(self):
+        with HttpTransport(connect_timeout=0.5, retry_count=0) as transport:
+            # WHEN the server is unreachable
+            response: ResultResponse = transport.get("http://127.0.0.1:1/ok")
+
+        # THEN the error is returned instead of raised
+        assert not response.status
+        assert response.result
+
+    def test_encoding_error(self, server: StandInServer):
+        with HttpTransport(retry_count=0) as transport:
+            # WHEN post a body that can not be encoded as json
+            response: ResultResponse = transport.post(f"{server.url}/ok", json={"sig": object()})
+
+        # THEN the error is returned instead of raised
+        assert not response.status
+        assert response.result
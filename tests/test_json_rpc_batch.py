@@ -0,0 +1,40 @@
+import json
+from typing import List
+
+import pytest
+
+from myid.score.credential_info_score import CredentialInfoScore
+from myid.score.json_rpc_batch import CallResult, JsonRpcBatchClient
+from tests.utils.stand_in_node import StandInNode
+
+
+class TestJsonRpcBatch:
+    @pytest.fixture
+    def node(self) -> StandInNode:
+        with StandInNode() as node:
+            yield node
+
+    def test_get_many(self, node: StandInNode):
+        # GIVEN a score whose bulk calls are sent in batches of 3
+        signatures: List[str] = [f"sig-{i}" for i in range(7)] + ["missing-1"]
+        with JsonRpcBatchClient(node.url, batch_size=3, max_concurrency=2) as batch_client:
+            score = CredentialInfoScore(None, 2, "cx" + "0" * 40, batch_client=batch_client)
+
+            # WHEN get the credential infos of the signatures
+            results: List[CallResult] = score.get_many(signatures)
+
+        # THEN the calls are packed into batches and the results are in input order with the errors per item
+        assert sorted(node.batch_sizes) == [2, 3, 3]
+        assert [json.loads(result.result)["sig"] for result in results[:-1]] == signatures[:-1]
+        assert not results[-1].success
+        assert "Not found" in results[-1].error
+
+    def test_connection_error(self):
+        # GIVEN a client of an unreachable node
+        with JsonRpcBatchClient("http://127.0.0.1:1/api/v3", timeout=0.5) as batch_client:
+            # WHEN send calls
+            results: List[CallResult] = batch_client.call_many("icx_call", [{}, {}])
+
+        # THEN every call fails instead of raising
+        assert len(results) == 2
+        assert not any(result.success for result in results)
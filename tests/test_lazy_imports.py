@@ -0,0 +1,62 @@
+import json
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+_HEAVY_MODULES: List[str] = ["didsdk", "jwcrypto", "iconsdk", "coincurve", "requests"]
+
+
+def _loaded_after(code: str) -> List[str]:
+    """Run the code in a fresh interpreter and get the heavy dependencies it loaded."""
+    probe: str = (
+        f"{code}\nimport json, sys\nprint(json.dumps([name for name in {_HEAVY_MODULES!r} if name in sys.modules]))"
+    )
+    completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+class TestLazyImports:
+    def test_package_and_transport(self):
+        # GIVEN a fresh interpreter
+        # WHEN import the package and create a transport that has not called the WAS yet
+        loaded: List[str] = _loaded_after(
+            "import myid\nfrom myid.utils.http_transport import HttpTransport\nHttpTransport().close()"
+        )
+
+        # THEN none of the heavy dependencies is loaded
+        assert loaded == []
+
+    def test_credential_service_without_didsdk(self):
+        pytest.importorskip("iconsdk")
+
+        # GIVEN a fresh interpreter
+        # WHEN access the credential service through the package
+        loaded: List[str] = _loaded_after("from myid import CredentialService")
+
+        # THEN only the chain dependencies are loaded
+        assert "didsdk" not in loaded and "jwcrypto" not in loaded and "requests" not in loaded
+        assert "iconsdk" in loaded
+
+    def test_batch_client_without_requests(self):
+        pytest.importorskip("iconsdk")
+
+        # GIVEN a fresh interpreter
+        # WHEN create a batch client that has not sent a batch yet
+        loaded: List[str] = _loaded_after(
+            "from myid.score.json_rpc_batch import JsonRpcBatchClient\n"
+            "JsonRpcBatchClient('http://127.0.0.1:1/api/v3').close()"
+        )
+
+        # THEN `requests` is not loaded
+        assert "requests" not in loaded
+
+    def test_unknown_attribute(self):
+        import myid
+
+        # WHEN access a name that is not in the public API
+        # THEN it is an AttributeError, as for any module
+        with pytest.raises(AttributeError):
+            myid.NoSuchService
+        assert "VerifierService" in dir(myid)
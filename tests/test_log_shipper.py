@@ -0,0 +1,87 @@
+import gc
+import threading
+import time
+import weakref
+from typing import List
+
+import pytest
+
+from myid.config import settings
+from myid.core.api_path import APIPath
+from myid.utils.log_shipper import LogShipper, LogShipperStats
+from myid.vo.issued_register_request import IssuedRegRequest
+from tests.utils.stand_in_server import StandInServer
+
+
+def _shipper_threads() -> int:
+    return sum(thread.name == "myid-log-shipper" for thread in threading.enumerate())
+
+
+class TestLogShipper:
+    @pytest.fixture
+    def server(self) -> StandInServer:
+        with StandInServer() as server:
+            yield server
+
+    def test_ship_and_flush(self, server: StandInServer):
+        # GIVEN a shipper waiting long for its batches to fill
+        with LogShipper(server.url, batch_size=100, flush_interval=60) as log_shipper:
+            # WHEN ship records and flush them
+            for i in range(5):
+                assert log_shipper.ship(
+                    APIPath.ISS_VC_LOG, IssuedRegRequest(vcSig=f"sig-{i}", issuerDid="did:icon:02:1", holderDid="")
+                )
+            assert log_shipper.flush(timeout=5)
+
+            # THEN every record is shipped without waiting for the interval
+            assert log_shipper.stats == LogShipperStats(pending=0, shipped=5, failed=0, dropped=0)
+
+    def test_drop_when_full(self):
+        # GIVEN a shipper of an unreachable WAS with a small queue
+        log_shipper = LogShipper("http://127.0.0.1:1", max_queue_size=2, flush_interval=60, block_when_full=False)
+
+        # WHEN ship more records than the queue holds
+        accepted = [log_shipper.ship(APIPath.VRF_VP_LOG, {"holderDid": "did:icon:02:1"}) for _ in range(3)]
+        log_shipper.close(timeout=10)
+
+        # THEN the overflow is dropped and the queued ones are tried on close
+        assert accepted == [True, True, False]
+        assert log_shipper.stats == LogShipperStats(pending=0, shipped=0, failed=2, dropped=1)
+        assert not log_shipper.ship(APIPath.VRF_VP_LOG, {})
+
+    def test_stop_when_idle(self, server: StandInServer):
+        # GIVEN a shipper stopping its thread after a short idle time
+        with LogShipper(server.url, flush_interval=0, idle_timeout=0.1) as log_shipper:
+            # WHEN ship a record and wait longer than the idle time
+            assert log_shipper.ship(APIPath.VRF_VP_LOG, {"holderDid": "did:icon:02:1"})
+            time.sleep(0.5)
+
+            # THEN the thread has stopped, and the next record starts it again
+            assert _shipper_threads() == 0
+            assert log_shipper.ship(APIPath.VRF_VP_LOG, {"holderDid": "did:icon:02:2"})
+            assert log_shipper.flush(timeout=5)
+            assert log_shipper.stats == LogShipperStats(pending=0, shipped=2, failed=0, dropped=0)
+
+    def test_discard_without_close(self, server: StandInServer, monkeypatch):
+        # GIVEN services that ship a log and are discarded without `close`, as when a service is created per request
+        pytest.importorskip("didsdk")
+        from myid.verifier_service import VerifierService
+
+        monkeypatch.setattr(settings, "MYIDSDK_LOG_SHIP_FLUSH_INTERVAL", 0)
+        monkeypatch.setattr(settings, "MYIDSDK_LOG_SHIP_IDLE_TIMEOUT", 0.1)
+        shippers: List[weakref.ref] = []
+        for i in range(50):
+            verifier_service = VerifierService.create(url=server.url)
+            assert verifier_service.ship_log(APIPath.VRF_VP_LOG, {"holderDid": f"did:icon:02:{i}"})
+            shippers.append(weakref.ref(verifier_service._log_shipper))
+            del verifier_service
+
+        # WHEN the shippers have been idle
+        deadline: float = time.monotonic() + 10
+        while _shipper_threads() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        gc.collect()
+
+        # THEN no thread is left, and nothing keeps the shippers alive
+        assert _shipper_threads() == 0
+        assert all(shipper() is None for shipper in shippers)
@@ -0,0 +1,98 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from myid.core.api_path import APIPath
+from myid.utils.cache import TTLCache
+from myid.utils.http_transport import HttpTransport
+from myid.utils.metrics import MetricEvent, MetricsRegistry, metrics
+from tests.utils.stand_in_server import StandInServer
+
+
+class TestMetricsRegistry:
+    def test_disabled_records_nothing(self):
+        # GIVEN a disabled registry
+        registry: MetricsRegistry = MetricsRegistry(enabled=False)
+
+        @registry.timed("work_seconds")
+        def work() -> int:
+            return 1
+
+        # WHEN the instrumented code runs
+        assert work() == 1
+        registry.inc("calls_total")
+        with registry.timer("block_seconds"):
+            pass
+
+        # THEN nothing is recorded
+        assert registry.to_prometheus() == ""
+
+    def test_prometheus_text(self):
+        # GIVEN an enabled registry with a hook
+        registry: MetricsRegistry = MetricsRegistry(enabled=True, buckets=(0.1, 1))
+        events: List[MetricEvent] = []
+        registry.add_hook(events.append)
+
+        # WHEN observe latencies and count
+        registry.observe("request_seconds", 0.05, path="/v1/did/")
+        registry.observe("request_seconds", 0.5, path="/v1/did/")
+        registry.observe("request_seconds", 3, path="/v1/did/")
+        registry.inc("cache_requests_total", cache="did", result="hit")
+
+        # THEN the histogram buckets are cumulative in the text format
+        text: str = registry.to_prometheus()
+        assert "# TYPE request_seconds histogram" in text
+        assert 'request_seconds_bucket{path="/v1/did/",le="0.1"} 1' in text
+        assert 'request_seconds_bucket{path="/v1/did/",le="1"} 2' in text
+        assert 'request_seconds_bucket{path="/v1/did/",le="+Inf"} 3' in text
+        assert 'request_seconds_count{path="/v1/did/"} 3' in text
+        assert 'cache_requests_total{cache="did",result="hit"} 1' in text
+        # AND the hook got every observation
+        assert [(event.kind, event.name) for event in events] == [("histogram", "request_seconds")] * 3 + [
+            ("counter", "cache_requests_total")
+        ]
+
+    def test_timed_coroutine(self):
+        # GIVEN an instrumented coroutine function
+        registry: MetricsRegistry = MetricsRegistry(enabled=True)
+
+        @registry.timed("confirm_seconds", stage="confirm")
+        async def confirm() -> str:
+            await asyncio.sleep(0.01)
+            return "done"
+
+        # WHEN await it
+        assert asyncio.run(confirm()) == "done"
+
+        # THEN its latency is recorded
+        stats = registry.histogram("confirm_seconds", stage="confirm")
+        assert stats.count == 1 and stats.sum >= 0.01
+
+
+class TestSdkMetrics:
+    @pytest.fixture
+    def enabled(self):
+        metrics.reset()
+        metrics.enable()
+        yield metrics
+        metrics.disable()
+        metrics.reset()
+
+    def test_http_and_cache(self, enabled: MetricsRegistry):
+        # GIVEN a transport and a named cache
+        cache: TTLCache = TTLCache(max_size=8, ttl=60, name="did")
+        cache.put("did:icon:02:a", "document")
+
+        # WHEN call the WAS and read the cache
+        with StandInServer() as server, HttpTransport(retry_count=0) as transport:
+            transport.get(f"{server.url}{APIPath.R_DID}did:icon:02:a")
+            transport.get(f"{server.url}{APIPath.IS_VALID_VC}?sig=abc")
+        cache.get("did:icon:02:a")
+        cache.get("did:icon:02:b")
+
+        # THEN the calls are timed per APIPath and the hits and misses are counted
+        assert enabled.histogram("myid_http_request_seconds", method="GET", path=APIPath.R_DID).count == 1
+        assert enabled.histogram("myid_http_request_seconds", method="GET", path=APIPath.IS_VALID_VC).count == 1
+        assert enabled.counter("myid_cache_requests_total", cache="did", result="hit") == 1
+        assert enabled.counter("myid_cache_requests_total", cache="did", result="miss") == 1
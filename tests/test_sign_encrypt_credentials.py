@@ -0,0 +1,167 @@
+import asyncio
+import json
+import threading
+import time
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("didsdk")
+
+from myid.async_issuer_service import AsyncIssuerService  # noqa: E402
+from myid.config import settings  # noqa: E402
+from myid.issuer_service import IssuerService  # noqa: E402
+from myid.service_result import ServiceResult  # noqa: E402
+
+
+class _FakeSignResult:
+    def __init__(self, name: str, success: bool):
+        self.success: bool = success
+        self.result: Optional[dict] = {"name": name, "signed": True} if success else None
+        self.fail_message: Optional[str] = None if success else f"Can not sign {name}."
+
+
+class _FakeProtocolMessage:
+    def __init__(self, name: str):
+        self.name: str = name
+        self.message: str = json.dumps({"name": name})
+
+
+class _FakeCredential:
+    def __init__(self, name: str):
+        self.name: str = name
+
+    @staticmethod
+    def from_jwt(claims: dict) -> "_FakeCredential":
+        return _FakeCredential(claims["name"])
+
+
+class _Registry:
+    """Registers the credentials after a delay, failing the ones named `unregistrable`."""
+
+    def __init__(self):
+        self.delay: float = 0
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self, credential: _FakeCredential) -> ServiceResult:
+        with self._lock:
+            self.in_flight -= 1
+        if credential.name.startswith("unregistrable"):
+            return ServiceResult.from_fail_message("The credential is already registered.")
+        return ServiceResult(success=True, result=True)
+
+
+def _sign_encrypt(protocol_message: _FakeProtocolMessage, issuer_key_holder, ecdh_key) -> _FakeSignResult:
+    return _FakeSignResult(protocol_message.name, success=not protocol_message.name.startswith("unsignable"))
+
+
+def _messages(names: List[str]) -> List[tuple]:
+    return [(_FakeProtocolMessage(name), "missing-kid" if name.startswith("keyless") else "kid") for name in names]
+
+
+class TestSignEncryptCredentials:
+    @pytest.fixture
+    def registry(self, monkeypatch) -> _Registry:
+        monkeypatch.setattr("myid.issuer_service.Credential", _FakeCredential)
+        monkeypatch.setattr("myid.async_issuer_service.Credential", _FakeCredential)
+        return _Registry()
+
+    @pytest.fixture
+    def issuer_service(self, registry: _Registry) -> IssuerService:
+        issuer_service = IssuerService.create(url="http://127.0.0.1:1")
+        issuer_service.add_ecdh_key("kid", object())
+        issuer_service._sign_encrypt = _sign_encrypt
+
+        def register_vc(credential: _FakeCredential, issuer_key_holder) -> ServiceResult:
+            registry.enter()
+            time.sleep(registry.delay)
+            return registry.leave(credential)
+
+        issuer_service.register_vc = register_vc
+        yield issuer_service
+        issuer_service.close()
+
+    @pytest.fixture
+    def async_issuer_service(self, registry: _Registry) -> AsyncIssuerService:
+        pytest.importorskip("httpx")
+        async_issuer_service = AsyncIssuerService.create(url="http://127.0.0.1:1")
+        async_issuer_service.add_ecdh_key("kid", object())
+        async_issuer_service._sign_encrypt = _sign_encrypt
+
+        async def register_vc(credential: _FakeCredential, issuer_key_holder) -> ServiceResult:
+            registry.enter()
+            await asyncio.sleep(registry.delay)
+            return registry.leave(credential)
+
+        async_issuer_service.register_vc = register_vc
+        return async_issuer_service
+
+    def test_results_in_order(self, issuer_service: IssuerService):
+        # GIVEN protocol messages of credentials
+        names: List[str] = [f"vc-{i}" for i in range(6)]
+
+        # WHEN issue them at once
+        results: List[ServiceResult] = issuer_service.sign_encrypt_credentials(_messages(names), None)
+
+        # THEN a result is returned per message, in order
+        assert all(result.success for result in results)
+        assert [result.signed_object["name"] for result in results] == names
+
+    def test_failure_isolation(self, issuer_service: IssuerService):
+        # GIVEN messages that fail to sign, have no ECDH key, or fail to register
+        names: List[str] = ["vc-0", "unsignable-1", "keyless-2", "unregistrable-3", "vc-4"]
+
+        # WHEN issue them at once
+        results: List[ServiceResult] = issuer_service.sign_encrypt_credentials(_messages(names), None)
+
+        # THEN only those fail, each with its own reason
+        assert [result.success for result in results] == [True, False, False, False, True]
+        assert results[1].fail_message == "Can not sign unsignable-1."
+        assert results[2].fail_message == "Not exist ECDHKey kid(missing-kid)"
+        # AND the credential signed but not registered keeps its signed object
+        assert results[3].fail_message == "The credential is already registered."
+        assert results[3].signed_object == {"name": "unregistrable-3", "signed": True}
+
+    def test_concurrency_bound(self, issuer_service: IssuerService, registry: _Registry, monkeypatch):
+        # GIVEN a WAS that registers slowly
+        registry.delay = 0.05
+        messages: List[tuple] = _messages([f"vc-{i}" for i in range(8)])
+
+        # WHEN issue the credentials with at most 2 at once, then with MYIDSDK_ISSUE_CONCURRENCY of 3
+        issuer_service.sign_encrypt_credentials(messages, None, max_concurrency=2)
+        bounded: int = registry.max_in_flight
+        registry.max_in_flight = 0
+        monkeypatch.setattr(settings, "MYIDSDK_ISSUE_CONCURRENCY", 3)
+        issuer_service.sign_encrypt_credentials(messages, None)
+
+        # THEN the registrations overlap within the bound
+        assert bounded == 2
+        assert registry.max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_async_issuance(self, async_issuer_service: AsyncIssuerService, registry: _Registry):
+        # GIVEN messages of which some fail, and a WAS that registers slowly
+        registry.delay = 0.05
+        names: List[str] = ["vc-0", "unsignable-1", "keyless-2", "unregistrable-3"] + [f"vc-{i}" for i in range(4, 8)]
+
+        # WHEN issue them at once with at most 2 at a time
+        results: List[ServiceResult] = await async_issuer_service.sign_encrypt_credentials(
+            _messages(names), None, max_concurrency=2
+        )
+
+        # THEN the results are in order, the failures are isolated and the registrations are bounded
+        assert [result.success for result in results] == [True, False, False, False] + [True] * 4
+        assert results[2].fail_message == "Not exist ECDHKey kid(missing-kid)"
+        assert results[3].signed_object == {"name": "unregistrable-3", "signed": True}
+        assert [result.signed_object["name"] for result in results if result.success] == [
+            name for name in names if name.startswith("vc-")
+        ]
+        assert registry.max_in_flight == 2
+        await async_issuer_service.close()
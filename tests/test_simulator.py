@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import json
+from typing import List
+
+import pytest
+
+from myid.core.api_path import APIPath
+from myid.simulator import Simulator, SimulatorConfig
+from myid.simulator.chain import PENDING_ERROR, ChainSimulator
+from myid.simulator.ledger import CredentialLedger
+from myid.utils.http_transport import HttpTransport
+from myid.vo.codec import VOCodec
+from myid.vo.result_response import ResultResponse
+from myid.vo.vc_request import VCRequest
+
+ISSUER_DID = "did:icon:02:1234"
+# 2100-01-01, so the registered credentials do not expire
+EXPIRY_DATE = 4_102_444_800
+
+
+def _jwt(payload: dict) -> str:
+    def encode(content: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(content).encode()).rstrip(b"=").decode()
+
+    return f"{encode({'alg': 'ES256K', 'kid': f'{ISSUER_DID}#key-1'})}.{encode(payload)}.c2lnbmF0dXJl"
+
+
+def _register_jwt(signature: str) -> str:
+    return _jwt(
+        {"type": "REGIST", "issuerDid": ISSUER_DID, "sig": signature, "issueDate": 1, "expiryDate": EXPIRY_DATE}
+    )
+
+
+class _Clock:
+    def __init__(self):
+        self.now: float = 0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestChainSimulator:
+    def test_confirmed_in_next_block(self):
+        # GIVEN a chain producing a block every 2 seconds
+        clock: _Clock = _Clock()
+        chain: ChainSimulator = ChainSimulator(CredentialLedger(), block_time=2, clock=clock)
+        params: dict = {
+            "to": "cx" + "0" * 40,
+            "dataType": "call",
+            "data": {"method": "register", "params": {"credentialJwt": _register_jwt("abc")}},
+        }
+
+        # WHEN send a transaction
+        tx_hash: str = chain.handle({"id": 1, "method": "icx_sendTransaction", "params": params})["result"]
+
+        # THEN its result is pending until the next block
+        request: dict = {"id": 2, "method": "icx_getTransactionResult", "params": {"txHash": tx_hash}}
+        assert chain.handle(request)["error"]["code"] == PENDING_ERROR
+        clock.now = 2
+        result: dict = chain.handle(request)["result"]
+        assert result["status"] == "0x1" and result["blockHeight"] == "0x2"
+        # AND the block lists it, and the score answers the credential
+        block: dict = chain.handle({"id": 3, "method": "icx_getLastBlock"})["result"]
+        assert [transaction["txHash"] for transaction in block["confirmed_transaction_list"]] == [tx_hash]
+        call: dict = {"to": params["to"], "dataType": "call", "data": {"method": "isValid", "params": {"sig": "abc"}}}
+        answers: List[dict] = chain.handle([{"id": 4, "method": "icx_call", "params": call}])
+        assert json.loads(answers[0]["result"]) == {"sig": "abc", "isValid": True}
+
+
+class TestSimulator:
+    def test_was_shares_ledger(self):
+        # GIVEN a simulator confirming at once
+        with Simulator(SimulatorConfig(block_time=0)) as simulator, HttpTransport(retry_count=0) as transport:
+            # WHEN register and revoke a credential through the WAS
+            registered: ResultResponse = transport.post(
+                simulator.url + APIPath.REG_VC, content=VOCodec.encode(VCRequest(jwt=_register_jwt("abc"), nid="2"))
+            )
+            revoke_jwt: str = _jwt({"type": "REVOKE", "issuerDid": ISSUER_DID, "sig": "abc", "revokeDate": 3})
+            revoked: ResultResponse = transport.post(
+                simulator.url + APIPath.REV_VC, content=VOCodec.encode(VCRequest(jwt=revoke_jwt, nid="2"))
+            )
+
+            # THEN the status is read from the WAS and the score
+            assert registered.status and revoked.status
+            credential: ResultResponse = transport.get(simulator.url + APIPath.GET_VC + "?nid=2&sig=abc")
+            assert credential.result["isRevoke"] is True and credential.result["revokeDate"] == 3
+            assert not transport.get(simulator.url + APIPath.IS_VALID_VC + "?nid=2&sig=abc").status
+            assert simulator.ledger.is_valid("abc") == {"sig": "abc", "isValid": False}
+
+    def test_injected_errors(self):
+        # GIVEN a simulator failing every request
+        config: SimulatorConfig = SimulatorConfig(error_rate=1, error_status=503, seed=1)
+
+        async def get() -> ResultResponse:
+            async with Simulator(config) as simulator:
+                with HttpTransport(retry_count=0) as transport:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        None, transport.get, simulator.url + APIPath.IS_VALID_VC + "?sig=abc"
+                    )
+
+        # WHEN call it in an event loop
+        result_response: ResultResponse = asyncio.run(get())
+
+        # THEN the injected error is returned
+        assert not result_response.status and result_response.result == "Injected error"
+
+    @pytest.mark.asyncio
+    async def test_credential_service(self, test_wallet_keys):
+        pytest.importorskip("didsdk")
+        from iconsdk.icon_service import IconService
+        from iconsdk.providers.http_provider import HTTPProvider
+        from iconsdk.wallet.wallet import KeyWallet
+
+        from myid.credential_service import CredentialService
+
+        # GIVEN a credential service on the node of a simulator producing a block every 0.1 seconds
+        async with Simulator(SimulatorConfig(block_time=0.1)) as simulator:
+            service: CredentialService = CredentialService(
+                IconService(HTTPProvider(simulator.url, 3)), network_id=2, score_address="cx" + "0" * 40
+            )
+            wallet: KeyWallet = KeyWallet.load(bytes.fromhex(test_wallet_keys["private"]))
+
+            # WHEN register a credential, polling its result until the block
+            tx_result: dict = await service.register(wallet, _register_jwt("abc"))
+
+            # THEN it is confirmed and valid
+            assert tx_result["status"] == 1
+            assert await asyncio.get_running_loop().run_in_executor(None, service.is_valid, "abc") == {
+                "sig": "abc",
+                "isValid": True,
+            }
+            service.close()
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from myid.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight:
+    def test_coalesce_threads(self):
+        # GIVEN a lookup that blocks until released
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        executions: List[str] = []
+
+        def lookup(did: str) -> str:
+            executions.append(did)
+            started.set()
+            release.wait(5)
+            return f"document of {did}"
+
+        # WHEN 8 threads look up the same DID while the first one is in flight
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = [executor.submit(flight.do, "did:icon:01", lookup, "did:icon:01")]
+            started.wait(5)
+            futures += [executor.submit(flight.do, "did:icon:01", lookup, "did:icon:01") for _ in range(7)]
+            while flight.stats.calls < 8:
+                threading.Event().wait(0.001)
+            release.set()
+            results = [future.result() for future in futures]
+
+        # THEN the lookup runs once and every caller gets its result
+        assert executions == ["did:icon:01"]
+        assert results == ["document of did:icon:01"] * 8
+        assert flight.stats.coalesced == 7
+        assert flight.stats.coalescing_ratio == 7 / 8
+
+        # WHEN the same DID is looked up after the flight completed
+        flight.do("did:icon:01", lookup, "did:icon:01")
+
+        # THEN it runs again, since nothing is kept
+        assert len(executions) == 2
+
+    @pytest.mark.asyncio
+    async def test_share_exception_async(self):
+        # GIVEN a lookup that fails
+        flight = SingleFlight()
+        executions: List[str] = []
+
+        async def lookup(did: str) -> str:
+            executions.append(did)
+            await asyncio.sleep(0.01)
+            raise ValueError(f"{did} not found")
+
+        # WHEN 5 coroutines look up the same DID concurrently, and another one a different DID
+        results = await asyncio.gather(
+            *[flight.do_async("did:icon:01", lookup, "did:icon:01") for _ in range(5)],
+            flight.do_async("did:icon:02", lookup, "did:icon:02"),
+            return_exceptions=True,
+        )
+
+        # THEN each DID is looked up once and its error is raised to every caller
+        assert executions == ["did:icon:01", "did:icon:02"]
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flight.stats.calls == 6 and flight.stats.executions == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_and_forget(self):
+        # GIVEN a lookup in flight with two callers
+        flight = SingleFlight()
+        executions: List[str] = []
+
+        async def lookup(did: str) -> str:
+            executions.append(did)
+            number: int = len(executions)
+            await asyncio.sleep(0.02)
+            return f"document {number}"
+
+        first = asyncio.ensure_future(flight.do_async("did", lookup, "did"))
+        second = asyncio.ensure_future(flight.do_async("did", lookup, "did"))
+        await asyncio.sleep(0)
+
+        # WHEN the first caller is cancelled, and the key is forgotten before a third call
+        first.cancel()
+        flight.forget("did")
+        third = await flight.do_async("did", lookup, "did")
+
+        # THEN the second caller still gets the result, and the third one ran its own lookup
+        assert await second == "document 1"
+        assert third == "document 2"
+        assert len(executions) == 2
+
+    def test_disabled(self):
+        # GIVEN a disabled single-flight group
+        flight = SingleFlight(enabled=False)
+
+        # WHEN call it
+        result = flight.do("key", lambda: "value")
+
+        # THEN the function runs, and every call is an execution
+        assert result == "value"
+        assert flight.stats.calls == flight.stats.executions == 1
@@ -0,0 +1,56 @@
+from typing import List
+
+from iconsdk.builder.transaction_builder import CallTransaction, Transaction
+from iconsdk.exception import JSONRPCException
+
+from myid.score.credential_info_score import CredentialInfoScore
+from myid.score.step_estimator import StepEstimator
+
+
+class _FakeIconService:
+    def __init__(self, step: int = None):
+        self.step: int = step
+        self.estimated: List[Transaction] = []
+
+    def estimate_step(self, transaction: Transaction) -> int:
+        self.estimated.append(transaction)
+        if self.step is None:
+            raise JSONRPCException("debug api is not enabled")
+        return self.step
+
+
+class TestStepEstimator:
+    def test_cache_per_method_and_bucket(self):
+        # GIVEN a score with a step estimator
+        icon_service = _FakeIconService(step=100_000)
+        score = CredentialInfoScore(
+            icon_service, 2, "cx" + "0" * 40, step_estimator=StepEstimator(icon_service, margin=1.5)
+        )
+
+        # WHEN build transactions of the same method and a similar size
+        first: CallTransaction = score.jwt_method("hx" + "0" * 40, jwt="a" * 1_100, method="register")
+        second: CallTransaction = score.jwt_method("hx" + "0" * 40, jwt="a" * 1_650, method="register")
+
+        # THEN the node is asked once and the estimate is scaled by the size and the margin
+        assert len(icon_service.estimated) == 1
+        assert first.step_limit == 150_000
+        assert second.step_limit == 225_000
+
+        # WHEN build a transaction of another method
+        score.jwt_method("hx" + "0" * 40, jwt="a" * 1_000, method="revoke")
+
+        # THEN it is estimated separately
+        assert len(icon_service.estimated) == 2
+
+    def test_fallback(self):
+        # GIVEN a node that can not estimate
+        icon_service = _FakeIconService()
+        estimator = StepEstimator(icon_service)
+        score = CredentialInfoScore(icon_service, 2, "cx" + "0" * 40, step_estimator=estimator)
+
+        # WHEN build transactions
+        transactions = [score.jwt_method("hx" + "0" * 40, jwt="a" * 100, method="register") for _ in range(3)]
+
+        # THEN the default step limit is used and the failure is not retried for every transaction
+        assert [transaction.step_limit for transaction in transactions] == [StepEstimator.DEFAULT_STEP_LIMIT] * 3
+        assert len(icon_service.estimated) == 1
@@ -0,0 +1,174 @@
+import asyncio
+from typing import Dict, List
+
+import pytest
+from iconsdk.exception import DataTypeException, JSONRPCException
+
+from myid.score.json_rpc_batch import CallResult
+from myid.score.transaction_poller import TransactionPoller
+
+
+class _FakeIconService:
+    """Confirms a transaction after it has been asked `rounds` times."""
+
+    def __init__(self, rounds: Dict[str, int]):
+        self.rounds: Dict[str, int] = rounds
+        self.calls: List[str] = []
+
+    def get_transaction_result(self, tx_hash: str) -> dict:
+        self.calls.append(tx_hash)
+        if tx_hash == "0xfail":
+            raise ValueError("invalid transaction")
+        if self.calls.count(tx_hash) < self.rounds.get(tx_hash, 1_000):
+            raise JSONRPCException("Pending transaction")
+        return {"txHash": tx_hash, "status": 1}
+
+
+class _FakeBatchClient:
+    """Answers `icx_getTransactionResult` batches, confirming a transaction after it has been asked `rounds` times."""
+
+    def __init__(self, rounds: Dict[str, int]):
+        self.rounds: Dict[str, int] = rounds
+        self.batches: List[List[str]] = []
+
+    def call_many(self, method: str, params_list: List[dict]) -> List[CallResult]:
+        assert method == "icx_getTransactionResult"
+        tx_hashes: List[str] = [params["txHash"] for params in params_list]
+        self.batches.append(tx_hashes)
+        asked: List[str] = [tx_hash for batch in self.batches for tx_hash in batch]
+        return [
+            (
+                CallResult(result={"txHash": tx_hash, "status": "0x1", "blockHeight": "0xa"})
+                if asked.count(tx_hash) >= self.rounds.get(tx_hash, 1_000)
+                else CallResult(error="{'code': -31002, 'message': 'Pending'}")
+            )
+            for tx_hash in tx_hashes
+        ]
+
+
+def _tx_hash(number: int) -> str:
+    return "0x" + f"{number:064x}"
+
+
+class TestTransactionPoller:
+    @pytest.mark.asyncio
+    async def test_wait_many(self):
+        # GIVEN transactions confirmed in the 1st, 2nd and 3rd round
+        icon_service = _FakeIconService({"0x1": 1, "0x2": 2, "0x3": 3})
+        poller = TransactionPoller(icon_service, interval=0.01, max_interval=0.01)
+
+        # WHEN wait for them concurrently
+        results = await asyncio.gather(*[poller.wait(tx_hash, timeout=5) for tx_hash in ["0x1", "0x2", "0x3"]])
+
+        # THEN every result is delivered and each round polls only the pending ones
+        assert [result["txHash"] for result in results] == ["0x1", "0x2", "0x3"]
+        assert sorted(icon_service.calls) == ["0x1", "0x2", "0x2", "0x3", "0x3", "0x3"]
+        assert poller.pending_count == 0
+        poller.close()
+
+    @pytest.mark.asyncio
+    async def test_wait_many_in_batches(self):
+        # GIVEN transactions confirmed in the 1st, 2nd and 3rd round, polled with batch requests
+        tx_hashes: List[str] = [_tx_hash(number) for number in range(1, 4)]
+        batch_client = _FakeBatchClient({tx_hash: rounds for rounds, tx_hash in enumerate(tx_hashes, start=1)})
+        poller = TransactionPoller(None, interval=0.01, max_interval=0.01, batch_client=batch_client)
+
+        # WHEN wait for them concurrently
+        results = await asyncio.gather(*[poller.wait(tx_hash, timeout=5) for tx_hash in tx_hashes])
+
+        # THEN each round asks every pending one in a single batch, and the results are converted
+        assert [result["txHash"] for result in results] == tx_hashes
+        assert [result["status"] for result in results] == [1, 1, 1]
+        assert [sorted(batch) for batch in batch_client.batches] == [tx_hashes, tx_hashes[1:], tx_hashes[2:]]
+        poller.close()
+
+    @pytest.mark.asyncio
+    async def test_unrecognized_hash_in_batches(self):
+        # GIVEN a poller with batch requests
+        batch_client = _FakeBatchClient({})
+        poller = TransactionPoller(None, interval=0.01, batch_client=batch_client)
+
+        # WHEN wait for a hash that is not well-formed
+        # THEN it fails at once without asking the node
+        with pytest.raises(DataTypeException):
+            await poller.wait("0xfail", timeout=1)
+        poller.close()
+        assert batch_client.batches == []
+        poller.close()
+
+    @pytest.mark.asyncio
+    async def test_close(self):
+        # GIVEN a transaction being polled
+        poller = TransactionPoller(_FakeIconService({}), interval=0.01)
+        waiter = asyncio.create_task(poller.wait("0xpending", timeout=5))
+        await asyncio.sleep(0.05)
+
+        # WHEN close the poller
+        poller.close()
+
+        # THEN the polling stops and the waiter is cancelled
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert poller.pending_count == 0
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        TransactionException = pytest.importorskip("didsdk.exceptions").TransactionException
+
+        # GIVEN a transaction that is never confirmed
+        poller = TransactionPoller(_FakeIconService({}), interval=0.01, max_interval=0.02)
+
+        # WHEN wait for it shorter than it takes
+        # THEN it raises a timeout
+        with pytest.raises(TransactionException):
+            await poller.wait("0xpending", timeout=0.1)
+        assert poller.pending_count == 0
+        poller.close()
+
+    def test_one_event_loop(self):
+        # GIVEN a transaction being polled on an event loop
+        poller = TransactionPoller(_FakeIconService({"0x1": 3, "0x2": 1}), interval=0.01, max_interval=0.01)
+        first_loop = asyncio.new_event_loop()
+        second_loop = asyncio.new_event_loop()
+        try:
+            waiter = first_loop.create_task(poller.wait("0x1", timeout=5))
+            first_loop.run_until_complete(asyncio.sleep(0))
+
+            # WHEN wait for another transaction on another event loop
+            # THEN it is refused, and the first waiter is still served
+            with pytest.raises(RuntimeError):
+                second_loop.run_until_complete(poller.wait("0x2", timeout=5))
+            assert first_loop.run_until_complete(waiter)["txHash"] == "0x1"
+
+            # WHEN the polling on the first event loop is over
+            # THEN another event loop can wait
+            assert second_loop.run_until_complete(poller.wait("0x2", timeout=5))["txHash"] == "0x2"
+        finally:
+            poller.close()
+            first_loop.close()
+            second_loop.close()
+
+    @pytest.mark.asyncio
+    async def test_error(self):
+        # GIVEN a transaction whose lookup fails
+        poller = TransactionPoller(_FakeIconService({}), interval=0.01)
+
+        # WHEN wait for it
+        # THEN the error is raised to the waiter
+        with pytest.raises(ValueError):
+            await poller.wait("0xfail", timeout=1)
+        poller.close()
+
+    @pytest.mark.asyncio
+    async def test_lookup(self):
+        # GIVEN a transaction confirmed on the second ask
+        poller = TransactionPoller(_FakeIconService({"0x1": 2}), interval=0.01)
+
+        # WHEN look it up twice
+        # THEN it is pending first, then its result is returned, without polling
+        assert await poller.lookup("0x1") is None
+        assert await poller.lookup("0x1") == {"txHash": "0x1", "status": 1}
+        assert poller.pending_count == 0
+        with pytest.raises(ValueError):
+            await poller.lookup("0xfail")
+        poller.close()
@@ -0,0 +1,58 @@
+from typing import List
+
+import pytest
+
+pytest.importorskip("didsdk")
+
+from coincurve import PrivateKey  # noqa: E402
+
+from myid.verifier_service import VerificationContext, VerifierService  # noqa: E402
+
+
+class _FakeKeyProperty:
+    def __init__(self, revoked: bool = False):
+        self.public_key = PrivateKey().public_key
+        self.revoked: bool = revoked
+
+    def is_revoked(self) -> bool:
+        return self.revoked
+
+
+class _FakeDocument:
+    def __init__(self, revoked: bool = False):
+        self.key_property: _FakeKeyProperty = _FakeKeyProperty(revoked)
+        self.lookups: List[str] = []
+
+    def get_public_key_property(self, key_id: str) -> _FakeKeyProperty:
+        self.lookups.append(key_id)
+        return self.key_property
+
+
+class TestVerificationContext:
+    @pytest.fixture
+    def verifier_service(self) -> VerifierService:
+        verifier_service = VerifierService.create(url="http://127.0.0.1:1")
+        yield verifier_service
+        verifier_service.close()
+
+    def test_cache_per_document(self, verifier_service: VerifierService):
+        # GIVEN a DID document of an issuer
+        document = _FakeDocument()
+
+        # WHEN get the context of a key several times
+        contexts: List[VerificationContext] = [
+            verifier_service._verification_context("did:icon:02:1", "key1", document) for _ in range(3)
+        ]
+
+        # THEN the document is walked once and the key is parsed once
+        assert document.lookups == ["key1"]
+        assert contexts[0] is contexts[2]
+        assert contexts[0].public_key_bytes == document.key_property.public_key.format()
+
+        # WHEN the DID document changes
+        revoked_document = _FakeDocument(revoked=True)
+        context: VerificationContext = verifier_service._verification_context("did:icon:02:1", "key1", revoked_document)
+
+        # THEN the context is built again from the new document
+        assert context.is_revoked
+        assert context.public_key is None
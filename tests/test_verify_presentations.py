@@ -0,0 +1,206 @@
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+pytest.importorskip("didsdk")
+
+from coincurve import PrivateKey  # noqa: E402
+
+from myid.config import settings  # noqa: E402
+from myid.service_result import ServiceResult  # noqa: E402
+from myid.verifier_service import VerifierService  # noqa: E402
+from myid.vo.result_response import ResultResponse  # noqa: E402
+
+HOLDER_DID = "did:icon:02:holder"
+
+
+class _FakeVerifyResult:
+    def __init__(self, success: bool):
+        self.success: bool = success
+        self.fail_message: Optional[str] = None if success else "The signature is not valid."
+
+
+class _FakeJwt:
+    def __init__(self, signature: str):
+        self.signature: str = signature
+
+    def verify(self, public_key) -> _FakeVerifyResult:
+        if self.signature.startswith("broken"):
+            raise ValueError(f"Can not verify {self.signature}.")
+        return _FakeVerifyResult(not self.signature.startswith("forged"))
+
+
+class _FakeCredential:
+    def __init__(self, signature: str, issuer_did: str):
+        self.did: str = issuer_did
+        self.key_id: str = "key1"
+        self.jwt: _FakeJwt = _FakeJwt(signature)
+        self.target_did: str = HOLDER_DID
+
+
+class _FakePresentation:
+    def __init__(self, token: str):
+        self.did: str = HOLDER_DID
+        self.token: str = token
+
+
+class _FakeKeyProperty:
+    def __init__(self):
+        self.public_key = PrivateKey().public_key
+
+    def is_revoked(self) -> bool:
+        return False
+
+
+class _FakeDocument:
+    def __init__(self):
+        self.key_property: _FakeKeyProperty = _FakeKeyProperty()
+
+    def get_public_key_property(self, key_id: str) -> _FakeKeyProperty:
+        return self.key_property
+
+
+class _FakeTransport:
+    """Answers `IS_VALID_VC` after a delay, not valid for a signature starting with `revoked`."""
+
+    def __init__(self, delay: float = 0):
+        self.delay: float = delay
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, url: str) -> ResultResponse:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+
+        signature: str = parse_qs(urlsplit(url).query)["sig"][0]
+        return ResultResponse(status=True, result={"sig": signature, "isValid": not signature.startswith("revoked")})
+
+    def close(self):
+        pass
+
+
+class TestVerifyPresentations:
+    @pytest.fixture
+    def transport(self) -> _FakeTransport:
+        return _FakeTransport()
+
+    @pytest.fixture
+    def resolved(self) -> Counter:
+        return Counter()
+
+    @pytest.fixture
+    def verifier_service(self, transport: _FakeTransport, resolved: Counter) -> VerifierService:
+        verifier_service = VerifierService.create(url="http://127.0.0.1:1", transport=transport)
+        documents = {"did:icon:02:issuer1": _FakeDocument(), "did:icon:02:issuer2": _FakeDocument()}
+
+        def get_did(did: str) -> Optional[_FakeDocument]:
+            resolved[did] += 1
+            if did == "did:icon:02:malformed":
+                raise ValueError("Can not deserialize the did document of did:icon:02:malformed")
+            return documents.get(did)
+
+        def decrypt_credentials(token: str) -> Tuple[_FakePresentation, List[_FakeCredential]]:
+            # a token is the issuer DIDs and the signatures of its credentials, e.g. `issuer1:sig-1,issuer2:sig-2`
+            if token == "undecryptable":
+                raise ValueError("Not exist ECDHKey kid(unknown)")
+            credentials: List[_FakeCredential] = []
+            for item in token.split(","):
+                issuer, signature = item.split(":")
+                credentials.append(_FakeCredential(signature, f"did:icon:02:{issuer}"))
+            return _FakePresentation(token), credentials
+
+        verifier_service.get_did = get_did
+        verifier_service._decrypt_credentials = decrypt_credentials
+        yield verifier_service
+        verifier_service.close()
+
+    def test_results_in_order(self, verifier_service: VerifierService):
+        # GIVEN presentations, one of them can not be decrypted
+        tokens: List[str] = ["issuer1:sig-1", "undecryptable", "issuer2:sig-2,issuer1:sig-3"]
+
+        # WHEN verify them at once
+        results: List[ServiceResult] = verifier_service.verify_presentations(tokens)
+
+        # THEN a result is returned per token, in order
+        assert [result.success for result in results] == [True, False, True]
+        assert results[0].result.token == tokens[0]
+        assert "Not exist ECDHKey" in results[1].fail_message
+        assert results[2].result.token == tokens[2]
+
+    def test_issuer_resolved_once(self, verifier_service: VerifierService, resolved: Counter):
+        # GIVEN presentations of credentials of two issuers
+        tokens: List[str] = [f"issuer1:sig-{i},issuer2:sig-{i}" for i in range(5)]
+
+        # WHEN verify them at once
+        results: List[ServiceResult] = verifier_service.verify_presentations(tokens)
+
+        # THEN each issuer DID is resolved once for the batch
+        assert all(result.success for result in results)
+        assert resolved == {"did:icon:02:issuer1": 1, "did:icon:02:issuer2": 1}
+
+    def test_failure_isolation(self, verifier_service: VerifierService):
+        # GIVEN presentations with a forged signature, a signature that can not be verified, an unknown issuer
+        # and a credential that the WAS answers is not valid
+        tokens: List[str] = [
+            "issuer1:sig-1",
+            "issuer1:forged-2",
+            "issuer1:broken-3",
+            "unknown:sig-4",
+            "issuer2:sig-5,issuer2:revoked-6",
+            "issuer2:sig-7",
+        ]
+
+        # WHEN verify them at once
+        results: List[ServiceResult] = verifier_service.verify_presentations(tokens)
+
+        # THEN only the presentations with a failure fail, each with its own reason
+        assert [result.success for result in results] == [True, False, False, False, False, True]
+        assert results[1].fail_message == "The signature is not valid."
+        assert "Can not verify broken-3" in results[2].fail_message
+        assert results[3].fail_message == "The Issuer's did document is not found."
+        assert results[4].fail_message == "The credential is not valid."
+
+    def test_issuer_document_isolation(self, verifier_service: VerifierService, resolved: Counter):
+        # GIVEN presentations of credentials of a few issuers, one of them with a malformed did document
+        tokens: List[str] = ["issuer1:sig-1", "malformed:sig-2", "issuer2:sig-3,malformed:sig-4", "issuer2:sig-5"]
+
+        # WHEN verify them at once
+        results: List[ServiceResult] = verifier_service.verify_presentations(tokens)
+
+        # THEN only the presentations with a credential of that issuer fail, with the resolution error
+        assert [result.success for result in results] == [True, False, False, True]
+        assert "Can not deserialize" in results[1].fail_message
+        assert "Can not deserialize" in results[2].fail_message
+        assert resolved["did:icon:02:malformed"] == 1
+
+    def test_concurrency_bound(self, verifier_service: VerifierService, transport: _FakeTransport):
+        # GIVEN a WAS that answers slowly
+        transport.delay = 0.05
+        tokens: List[str] = [f"issuer1:sig-{i}" for i in range(8)]
+
+        # WHEN verify the presentations with at most 2 concurrent calls
+        results: List[ServiceResult] = verifier_service.verify_presentations(tokens, max_concurrency=2)
+
+        # THEN the WAS calls overlap, but no more than 2 at once
+        assert all(result.success for result in results)
+        assert transport.max_in_flight == 2
+
+    def test_concurrency_from_settings(self, verifier_service: VerifierService, transport: _FakeTransport, monkeypatch):
+        # GIVEN MYIDSDK_VERIFY_CONCURRENCY of 3
+        monkeypatch.setattr(settings, "MYIDSDK_VERIFY_CONCURRENCY", 3)
+        transport.delay = 0.05
+
+        # WHEN verify the presentations without a bound
+        verifier_service.verify_presentations([f"issuer1:sig-{i}" for i in range(9)])
+
+        # THEN the setting bounds the WAS calls
+        assert transport.max_in_flight == 3
@@ -0,0 +1,46 @@
+import json
+from urllib.parse import parse_qs
+
+from myid.vo.codec import VOCodec
+from myid.vo.did_request import DIDRequest
+from myid.vo.issued_register_request import IssuedRegRequest
+from myid.vo.vc_request import VCRequest
+
+
+class TestVOCodec:
+    def test_encode_without_none(self):
+        # GIVEN a request with None fields
+        request: IssuedRegRequest = IssuedRegRequest(
+            vcSig="sig", issuerDid="did:icon:02:a", holderDid="did:icon:02:b", vcType=["A", "B"]
+        )
+
+        # WHEN encode it
+        encoded: bytes = VOCodec.encode(request)
+
+        # THEN the None fields are dropped and the rest round-trips
+        assert json.loads(encoded) == {
+            "vcSig": "sig",
+            "issuerDid": "did:icon:02:a",
+            "holderDid": "did:icon:02:b",
+            "vcType": ["A", "B"],
+        }
+        assert VOCodec.decode(IssuedRegRequest, encoded) == request
+
+    def test_decode_ignores_unknown_keys(self):
+        # WHEN decode a json with a key the VO does not have
+        request: DIDRequest = VOCodec.decode(DIDRequest, b'{"keyId":"key1","nid":"2","publicKey":"pk","extra":1}')
+
+        # THEN the key is ignored
+        assert request == DIDRequest(keyId="key1", nid="2", publicKey="pk")
+
+    def test_query_param_escaped(self):
+        # GIVEN a request whose values must be escaped, and a status of 0
+        request: VCRequest = VCRequest(sig="a+b/c=", nid="2", status=0)
+
+        # WHEN build the query param
+        query: str = request.to_query_param()
+
+        # THEN the values are url-encoded and the status is not quoted
+        assert query.startswith("?")
+        assert parse_qs(query[1:]) == {"nid": ["2"], "status": ["0"], "sig": ["a+b/c="]}
+        assert VCRequest().to_query_param() == ""
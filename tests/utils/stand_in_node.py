@@ -0,0 +1,61 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+
+class _StandInNodeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _answer(self, request: dict) -> dict:
+        data: dict = request["params"]["data"]
+        signature: str = data["params"].get("sig", "")
+        if signature.startswith("missing"):
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -30032, "message": "Not found"}}
+
+        result: str = json.dumps({"method": data["method"], "sig": signature})
+        return {"jsonrpc": "2.0", "id": request["id"], "result": result}
+
+    def do_POST(self):
+        content = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.batch_sizes.append(len(content) if isinstance(content, list) else 1)
+        answer = [self._answer(request) for request in content] if isinstance(content, list) else self._answer(content)
+        body: bytes = json.dumps(answer).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInNode:
+    """A local JSON-RPC server answering `icx_call` of the credentialInfo score, in batches or one by one.
+
+    A call returns the score method and the `sig` param as a json string, or an error if the `sig` starts with
+    `missing`.
+    """
+
+    def __init__(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInNodeHandler)
+        self._server.daemon_threads = True
+        self._server.batch_sizes = []
+
+    def __enter__(self) -> "StandInNode":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/api/v3"
+
+    @property
+    def batch_sizes(self) -> List[int]:
+        return self._server.batch_sizes
@@ -0,0 +1,67 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Set
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def _reply(self, status: int, result):
+        self.server.client_ports.add(self.client_address[1])
+        time.sleep(self.server.delay)
+        status = self.server.status or status
+        body: bytes = json.dumps({"result": result}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply(200 if self.path.startswith("/ok") else 400, self.path)
+
+    def do_POST(self):
+        self._reply(200, json.loads(self.rfile.read(int(self.headers["Content-Length"]))))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """A local HTTP server answering in the IV WAS response format.
+
+    GET echoes the path (status 200 only for paths starting with `/ok`), POST echoes the json body.
+    """
+
+    def __init__(self, delay: float = 0, status: int = None):
+        """Create the server.
+
+        :param delay: the time to wait before replying, in seconds
+        :param status: the status of every reply, e.g. 503 for an unavailable replica
+        """
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        self._server.daemon_threads = True
+        self._server.client_ports = set()
+        self._server.delay = delay
+        self._server.status = status
+        # a client that gave up on a delayed reply resets the connection
+        self._server.handle_error = lambda request, client_address: None
+
+    def __enter__(self) -> "StandInServer":
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def client_ports(self) -> Set[int]:
+        return self._server.client_ports